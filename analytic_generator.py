@@ -8,8 +8,17 @@ from docx.oxml import OxmlElement
 import datetime
 import os
 import difflib
+from collections.abc import Mapping
+from change_nodes import json_default
+from payload_diff import is_payload_diff, pointer_change_lines, pointer_change_sides
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT, WD_COLOR_INDEX
 from dependency_tracer import DependencyTracer
+from template_cache import load_template_document
+from template_variables import build_template_context, record_template_front_matter, substitute_in_elements, substitute_template_variables
+from streaming_writer import StreamingDocxWriter
+from summary import MATRIX_CATEGORIES, change_matrix, is_substantial_modification
+from section_renderer import render_sections, stitch_fragment
+from spec_source import spec_display_name
 
 # --- OXML Helpers (Safe Insertion) ---
 def get_or_add_child(parent, tag_name, order_list=None):
@@ -40,14 +49,27 @@ TC_PR_ORDER = ['w:cnfStyle', 'w:tcW', 'w:gridSpan', 'w:hMerge', 'w:vMerge', 'w:t
 P_PR_ORDER = ['w:pStyle', 'w:keepNext', 'w:keepLines', 'w:pageBreakBefore', 'w:framePr', 'w:widowControl', 'w:numPr', 'w:suppressLineNumbers', 'w:pBdr', 'w:shd', 'w:tabs', 'w:suppressAutoHyphens', 'w:kinsoku', 'w:wordWrap', 'w:overflowPunct', 'w:topLinePunct', 'w:autoSpaceDE', 'w:autoSpaceDN', 'w:bidi', 'w:adjustRightInd', 'w:snapToGrid', 'w:spacing', 'w:ind', 'w:contextualSpacing', 'w:mirrorIndents', 'w:suppressOverlap', 'w:jc', 'w:textDirection', 'w:textAlignment', 'w:textboxTightWrap', 'w:outlineLvl', 'w:divId', 'w:cnfStyle', 'w:rPr', 'w:sectPr', 'w:pPrChange']
 R_PR_ORDER = ['w:rStyle', 'w:rFonts', 'w:b', 'w:bCs', 'w:i', 'w:iCs', 'w:caps', 'w:smallCaps', 'w:strike', 'w:dstrike', 'w:outline', 'w:shadow', 'w:emboss', 'w:imprint', 'w:noProof', 'w:snapToGrid', 'w:vanish', 'w:webHidden', 'w:color', 'w:spacing', 'w:w', 'w:kern', 'w:position', 'w:sz', 'w:szCs', 'w:highlight', 'w:u', 'w:effect', 'w:bdr', 'w:shd', 'w:fitText', 'w:vertAlign', 'w:rtl', 'w:cs', 'w:em', 'w:lang', 'w:eastAsianLayout', 'w:specVanish', 'w:oMath']
 
+# Order of presentation
+COMPONENT_TYPES = ['schemas', 'parameters', 'responses', 'headers', 'securitySchemes', 'links', 'callbacks', 'examples']
+
 class AnalyticDocxGenerator:
-    def __init__(self, spec1, spec2, diff, old_path=None, new_path=None, variables=None, template_path=None):
+    def __init__(self, spec1, spec2, diff, old_path=None, new_path=None, variables=None, template_path=None, scan_full_body=False, section_workers=None, streaming=False, group_affected_endpoints=False, tracer=None):
         self.spec1 = spec1
         self.spec2 = spec2
         self.diff = diff
         self.old_path = old_path
         self.new_path = new_path
         self.variables = variables or {}
+        # Substitute placeholders in generated content too (slow on large reports)
+        self.scan_full_body = scan_full_body
+        # Render endpoints and component types in this many worker processes (None = in-process)
+        self.section_workers = section_workers
+        # Write the report section by section instead of holding it all until save
+        self.streaming = streaming
+        self._writer = None
+        # Render each distinct Affected Endpoints set once, in an appendix
+        self.group_affected_endpoints = group_affected_endpoints
+        self._endpoint_groups = None
         
         # Template Loading Logic
         # 1. Specific template passed in (e.g., template_analytic.docx)
@@ -62,24 +84,31 @@ class AnalyticDocxGenerator:
         elif os.path.exists("template.docx"):
             self.template_path = "template.docx"
             
-        if self.template_path:
-            self.doc = Document(self.template_path)
-            self.has_template = True
-        else:
-            self.doc = Document()
-            self.has_template = False
+        # Parsed and styled once per template, then cloned for this report
+        self.has_template = bool(self.template_path)
+        self.doc = load_template_document(self.template_path, self._prepare_template,
+                                          prepare_key=type(self)._setup_styles.__qualname__)
+
+        # Template-owned body content (cover, front-matter) is where placeholders live
+        self._template_front_matter = record_template_front_matter(self.doc)
             
         # Initialize Dependency Tracer with NEW spec to find where schemas are NOW used
-        self.tracer = DependencyTracer(spec2)
-        self.tracer.resolve_transitive_impact()
+        # (a resolved one can be passed in, e.g. IncrementalComparator.tracer())
+        self.tracer = tracer
+        if self.tracer is None:
+            self.tracer = DependencyTracer(spec2)
+            self.tracer.resolve_transitive_impact()
             
-        self._setup_styles()
-        
         # Only apply default layout/header if NO template is provided
         if not self.has_template:
             self._setup_page_layout()
             self._add_header_footer()
 
+    def _prepare_template(self, doc):
+        # Applied once to the cached template prototype (see template_cache)
+        self.doc = doc
+        self._setup_styles()
+
     def _setup_styles(self):
         # Serif Title (Georgia)
         if 'Title' in self.doc.styles:
@@ -198,7 +227,7 @@ class AnalyticDocxGenerator:
         def get_info(spec, path):
             info = spec.get('info', {})
             return {
-                'file': os.path.basename(path) if path else "N/A",
+                'file': spec_display_name(path),
                 'title': info.get('title', 'N/A'),
                 'version': info.get('version', 'N/A')
             }
@@ -427,6 +456,8 @@ class AnalyticDocxGenerator:
                 self._style_body_cell(cell)
 
     def generate(self, output_path):
+        self._begin_output(output_path)
+
         # Title
         self.doc.add_heading('OpenAPI Comparison - Analytical Report', 0)
         
@@ -434,127 +465,73 @@ class AnalyticDocxGenerator:
         
 
 
-        self._add_legend()
+        if self.section_workers and self.section_workers > 1:
+            # Big sections render in workers while the front sections are built here
+            sections = [('_add_general_info',), ('_add_endpoints',)] + [('_add_component_type', c_type) for c_type in COMPONENT_TYPES]
+            fragments = render_sections(self, sections, max_workers=self.section_workers)
+
+            self._add_legend()
+            self._add_dashboard()
+            self._flush_section()
+            stitch_fragment(self.doc, next(fragments))
+            self._flush_section()
+            stitch_fragment(self.doc, next(fragments))
+            self._flush_section()
+            self.doc.add_heading('Components', 1)
+            for fragment in fragments:
+                stitch_fragment(self.doc, fragment)
+                self._flush_section()
+        else:
+            self._add_legend()
+
+            self._add_dashboard()
+            self._flush_section()
+            self._add_general_info()
+            self._flush_section()
+            self._add_endpoints()
+            self._flush_section()
+            self._add_components()
 
-        self._add_dashboard()
-        self._add_general_info()
-        self._add_endpoints()
-        self._add_components()
+        self._add_affected_endpoints_appendix()
         
+        self._finish_output(output_path)
+        print(f"Analytic Report generated at {output_path}")
+
+    def _begin_output(self, output_path):
+        """
+        Opens the streaming writer when streaming is enabled.
+        Flushed content can no longer change, so placeholders are substituted up front
+        (and in each section before it is written when scan_full_body is set).
+        """
+        if not self.streaming:
+            return
+        self._process_template_variables()
+        before_write = None
+        if self.scan_full_body:
+            context = build_template_context(self.variables, self.old_path, self.new_path)
+            before_write = lambda elements: substitute_in_elements(self.doc, context, elements)
+        self._writer = StreamingDocxWriter(self.doc, output_path, before_write=before_write)
+
+    def _flush_section(self):
+        if self._writer:
+            self._writer.flush()
+
+    def _finish_output(self, output_path):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+            return
         # Variable Substitution (Final Step)
         self._process_template_variables()
-        
         self.doc.save(output_path)
-        print(f"Analytic Report generated at {output_path}")
 
     def _process_template_variables(self):
         """
-        Replaces {{ variable }} placeholders in the document with values.
-        Prioritizes:
-        1. Dynamic Variables (date, time, filenames)
-        2. User Static Variables (from Preferences)
+        Replaces {{ variable }} placeholders with values in the template-owned parts
+        (headers, footers, front-matter). Set scan_full_body to also scan generated content.
         """
-        import datetime
-        import getpass
-        import sys
-        
-        # 1. Prepare Variables
-        context = self.variables.copy()
-        
-        # Dynamic Defaults
-        now = datetime.datetime.now()
-        context['date'] = now.strftime('%Y-%m-%d')
-        context['time'] = now.strftime('%H:%M')
-        context['datetime'] = now.strftime('%Y-%m-%d %H:%M:%S')
-        context['original_spec'] = os.path.basename(self.old_path) if self.old_path else "N/A"
-        context['new_spec'] = os.path.basename(self.new_path) if self.new_path else "N/A"
-        
-        # Enriched Variables
-        try:
-            context['user'] = getpass.getuser()
-        except:
-            context['user'] = "Unknown"
-            
-        context['platform'] = sys.platform
-        context['tool_version'] = "1.0.0"
-        
-        def get_size(path):
-            if path and os.path.exists(path):
-                size_bytes = os.path.getsize(path)
-                if size_bytes < 1024: return f"{size_bytes} B"
-                elif size_bytes < 1024*1024: return f"{size_bytes/1024:.1f} KB"
-                else: return f"{size_bytes/(1024*1024):.1f} MB"
-            return "N/A"
-            
-        context['file_size_old'] = get_size(self.old_path)
-        context['file_size_new'] = get_size(self.new_path)
-        
-        # 2. Iterate and Replace
-        # Body Paragraphs
-        for p in self.doc.paragraphs:
-            self._replace_text_in_paragraph(p, context)
-            
-        # Tables
-        for table in self.doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for p in cell.paragraphs:
-                        self._replace_text_in_paragraph(p, context)
-                        
-        # Headers & Footers
-        for section in self.doc.sections:
-            # Header
-            for p in section.header.paragraphs:
-                self._replace_text_in_paragraph(p, context)
-            for table in section.header.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for p in cell.paragraphs:
-                            self._replace_text_in_paragraph(p, context)
-                            
-            # Footer
-            for p in section.footer.paragraphs:
-                self._replace_text_in_paragraph(p, context)
-            for table in section.footer.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for p in cell.paragraphs:
-                            self._replace_text_in_paragraph(p, context)
-
-    def _replace_text_in_paragraph(self, paragraph, context):
-        if '{{' not in paragraph.text:
-            return
-            
-        # Naive replacement (works for simple cases where {{var}} is in one run)
-        # For robust replacement across runs, we'd need a more complex parser.
-        # Assuming user inputs {{ var }} cleanly.
-        
-        text = paragraph.text
-        for key, value in context.items():
-            placeholder = f"{{{{ {key} }}}}"
-            placeholder_tight = f"{{{{{key}}}}}" # Handle {{key}} without spaces
-            
-            if placeholder in text or placeholder_tight in text:
-                text = text.replace(placeholder, str(value))
-                text = text.replace(placeholder_tight, str(value))
-        
-        # If text changed, update runs. 
-        # WARNING: This destroys formatting if runs were split.
-        # Better approach: Iterate runs and replace if full match found.
-        # But split runs (e.g. {{ var }}) are hard.
-        # Simple approach: If match found, clear p and add new run with text.
-        # Preserving style is hard.
-        
-        # Improved approach: Check each run.
-        for run in paragraph.runs:
-            for key, value in context.items():
-                placeholder = f"{{{{ {key} }}}}"
-                placeholder_tight = f"{{{{{key}}}}}"
-                
-                if placeholder in run.text:
-                    run.text = run.text.replace(placeholder, str(value))
-                if placeholder_tight in run.text:
-                    run.text = run.text.replace(placeholder_tight, str(value))
+        context = build_template_context(self.variables, self.old_path, self.new_path)
+        substitute_template_variables(self.doc, context, self._template_front_matter, scan_full_body=self.scan_full_body)
 
     def _add_dashboard(self):
         self.doc.add_heading('Change Matrix', 1)
@@ -569,48 +546,12 @@ class AnalyticDocxGenerator:
         
         # Data Rows
         # Logical Order: Core -> Data -> I/O -> Auth -> Meta -> Advanced
-        # Calculate Schema Metrics (Strict Partition)
-        s_new = len(self.diff.new_components.get('schemas', []))
-        s_rem = len(self.diff.removed_components.get('schemas', []))
-        
-        # Partition Modified vs Renamed
-        # Renamed = In renamed_components AND (NOT in modified OR !is_substantial)
-        # Modified = In modified_components AND is_substantial
-        
-        s_mod_count = 0
-        s_ren_count = 0
-        
-        mod_items = self.diff.modified_components.get('schemas', {})
-        ren_items = self.diff.renamed_components.get('schemas', {})
-        
-        # 1. Count Modified (Substantial)
-        for s_name, changes in mod_items.items():
-            if self._is_substantial_modification(s_name, changes, ren_items):
-                s_mod_count += 1
-        
-        # 2. Count Renamed (Pure + Ref-Only)
-        for old_name in ren_items:
-            # If it's NOT in modified, it's pure rename
-            if old_name not in mod_items:
-                s_ren_count += 1
-            else:
-                # If it IS in modified, check if substantial
-                if not self._is_substantial_modification(old_name, mod_items[old_name], ren_items):
-                    s_ren_count += 1
-
-        metrics = [
-            ("Endpoints", len(self.diff.new_paths), len(self.diff.removed_paths), len(self.diff.modified_paths), 0),
-            ("Schemas", s_new, s_rem, s_mod_count, s_ren_count),
-            ("Parameters", len(self.diff.new_components.get('parameters', [])), len(self.diff.removed_components.get('parameters', [])), len(self.diff.modified_components.get('parameters', {})), 0),
-            ("Responses", len(self.diff.new_components.get('responses', [])), len(self.diff.removed_components.get('responses', [])), len(self.diff.modified_components.get('responses', {})), 0),
-            ("Headers", len(self.diff.new_components.get('headers', [])), len(self.diff.removed_components.get('headers', [])), len(self.diff.modified_components.get('headers', {})), 0),
-            ("Security Schemes", len(self.diff.new_components.get('securitySchemes', [])), len(self.diff.removed_components.get('securitySchemes', [])), len(self.diff.modified_components.get('securitySchemes', {})), 0),
-            ("Tags", len(self.diff.tags_changes.get('new', [])), len(self.diff.tags_changes.get('removed', [])), len(self.diff.tags_changes.get('modified', {})), 0),
-            ("Servers", len(self.diff.servers_changes.get('new', [])), len(self.diff.servers_changes.get('removed', [])), len(self.diff.servers_changes.get('modified', {})), 0),
-            ("Links", len(self.diff.new_components.get('links', [])), len(self.diff.removed_components.get('links', [])), len(self.diff.modified_components.get('links', {})), 0),
-            ("Callbacks", len(self.diff.new_components.get('callbacks', [])), len(self.diff.removed_components.get('callbacks', [])), len(self.diff.modified_components.get('callbacks', {})), 0),
-            ("Examples", len(self.diff.new_components.get('examples', [])), len(self.diff.removed_components.get('examples', [])), len(self.diff.modified_components.get('examples', {})), 0)
-        ]
+        # Schemas are partitioned strictly: substantial changes are Modified, pure (or ref-only) renames Renamed
+        matrix = change_matrix(self.diff)
+        metrics = []
+        for name, _ in MATRIX_CATEGORIES:
+            counts = matrix[name]
+            metrics.append((name, counts['new'], counts['removed'], counts['modified'], counts['renamed']))
         
         for name, new_c, rem_c, mod_c, ren_c in metrics:
             # Skip row if all counts are zero
@@ -787,6 +728,8 @@ class AnalyticDocxGenerator:
                             self._add_request_body_changes(op_changes['requestBody'])
                         if 'responses' in op_changes:
                             self._add_response_changes(op_changes['responses'])
+                # Release each endpoint as soon as it is written (streaming only)
+                self._flush_section()
         else:
             self.doc.add_paragraph('No modified endpoints.')
 
@@ -811,7 +754,7 @@ class AnalyticDocxGenerator:
                 p.add_run(f" Param: {param}")
                 
                 # Split changes into attributes and schema
-                attr_changes = {k: v for k, v in changes.items() if k != 'schema' and isinstance(v, dict) and 'old' in v}
+                attr_changes = {k: v for k, v in changes.items() if k != 'schema' and isinstance(v, Mapping) and 'old' in v}
                 
                 if attr_changes:
                     # Render attribute changes in a table (Total 6.4 - 0.75 indent = 5.65)
@@ -873,7 +816,7 @@ class AnalyticDocxGenerator:
                          self._add_examples_changes_section(mt_changes['examples'], indent_level=1.1)
 
                     # Extensions and other attributes
-                    mt_attr = {k: v for k, v in mt_changes.items() if k not in ['schema', 'examples'] and (k.startswith('x-') or (isinstance(v, dict) and 'old' in v))}
+                    mt_attr = {k: v for k, v in mt_changes.items() if k not in ['schema', 'examples'] and (k.startswith('x-') or (isinstance(v, Mapping) and 'old' in v) or is_payload_diff(v))}
                     if mt_attr:
                          self._add_metadata_table(mt_attr, indent_level=1.1)
 
@@ -904,7 +847,7 @@ class AnalyticDocxGenerator:
                 
                 # Split changes into attributes and others (content, headers)
                 # Now including x- extensions in attr_changes
-                attr_changes = {k: v for k, v in changes.items() if k not in ['content', 'headers', 'examples'] and (k.startswith('x-') or (isinstance(v, dict) and 'old' in v))}
+                attr_changes = {k: v for k, v in changes.items() if k not in ['content', 'headers', 'examples'] and (k.startswith('x-') or (isinstance(v, Mapping) and 'old' in v))}
                 
                 if attr_changes:
                      # Calculate available width (Total 6.4 - 0.75 indent = 5.65)
@@ -926,8 +869,8 @@ class AnalyticDocxGenerator:
                          if k == 'description':
                              self._render_rich_diff(row.cells[1].paragraphs[0], row.cells[2].paragraphs[0], v.get('old'), v.get('new'))
                          else:
-                             row.cells[1].text = str(v.get('old') if isinstance(v, dict) else v)
-                             row.cells[2].text = str(v.get('new') if isinstance(v, dict) else v)
+                             row.cells[1].text = str(v.get('old') if isinstance(v, Mapping) else v)
+                             row.cells[2].text = str(v.get('new') if isinstance(v, Mapping) else v)
                          for cell in row.cells:
                              self._style_body_cell(cell)
                      self.doc.add_paragraph().paragraph_format.space_after = Pt(6)
@@ -968,7 +911,7 @@ class AnalyticDocxGenerator:
                                 self._add_examples_changes_section(mt_changes['examples'], indent_level=1.1)
 
                             # Other media type attributes (extensions, encoding, etc.)
-                            mt_attr = {k: v for k, v in mt_changes.items() if k not in ['schema', 'examples'] and (k.startswith('x-') or (isinstance(v, dict) and 'old' in v))}
+                            mt_attr = {k: v for k, v in mt_changes.items() if k not in ['schema', 'examples'] and (k.startswith('x-') or (isinstance(v, Mapping) and 'old' in v) or is_payload_diff(v))}
                             if mt_attr:
                                 self._add_metadata_table(mt_attr, indent_level=1.1, title="Media Type Metadata Changes:")
                                 
@@ -998,7 +941,7 @@ class AnalyticDocxGenerator:
                             self._add_pill_badge(p_hdr, "MODIFIED", "FFC107")
                             p_hdr.add_run(f" Header: {h_name}")
                             # Attributes (including x- extensions)
-                            h_attr = {k: v for k, v in h_changes.items() if k != 'schema' and (k.startswith('x-') or (isinstance(v, dict) and 'old' in v))}
+                            h_attr = {k: v for k, v in h_changes.items() if k != 'schema' and (k.startswith('x-') or (isinstance(v, Mapping) and 'old' in v))}
                             if h_attr:
                                 self._add_metadata_table(h_attr, indent_level=1.25)
                             if 'schema' in h_changes:
@@ -1027,9 +970,14 @@ class AnalyticDocxGenerator:
             row.cells[0].text = k
             if k == 'description':
                 self._render_rich_diff(row.cells[1].paragraphs[0], row.cells[2].paragraphs[0], v.get('old'), v.get('new'))
+            elif is_payload_diff(v):
+                # Only the changed pointers of the payload
+                old_lines, new_lines = pointer_change_sides(v)
+                row.cells[1].text = '\n'.join(old_lines)
+                row.cells[2].text = '\n'.join(new_lines)
             else:
-                row.cells[1].text = str(v.get('old') if isinstance(v, dict) else v)
-                row.cells[2].text = str(v.get('new') if isinstance(v, dict) else v)
+                row.cells[1].text = str(v.get('old') if isinstance(v, Mapping) else v)
+                row.cells[2].text = str(v.get('new') if isinstance(v, Mapping) else v)
             for c in row.cells: self._style_body_cell(c)
         self.doc.add_paragraph().paragraph_format.space_after = Pt(6)
 
@@ -1070,7 +1018,7 @@ class AnalyticDocxGenerator:
         # 2. Schema Constraint Changes (Metadata)
         # Exclude structural things handled elsewhere
         structural = ['properties', 'items', 'allOf', 'oneOf', 'anyOf', 'not', 'additionalProperties', '$ref']
-        attr_changes = {k: v for k, v in changes.items() if k not in structural and isinstance(v, dict) and 'old' in v}
+        attr_changes = {k: v for k, v in changes.items() if k not in structural and isinstance(v, Mapping) and 'old' in v}
         
         if attr_changes:
             # Calculate available width (Max 6.5" total - indent)
@@ -1127,27 +1075,29 @@ class AnalyticDocxGenerator:
                 p_new = cell_new.paragraphs[0]
                 
                 for k, v in p_diff.items():
-                    if k == 'description' and isinstance(v, dict) and 'old' in v:
+                    if k == 'description' and isinstance(v, Mapping) and 'old' in v:
                         p_old.add_run("description: ")
                         p_new.add_run("description: ")
                         self._render_rich_diff(p_old, p_new, v['old'], v['new'])
                         p_old.add_run("\n")
                         p_new.add_run("\n")
-                    elif isinstance(v, dict) and 'old' in v:
+                    elif isinstance(v, Mapping) and 'old' in v:
                         old_val = v['old']
                         new_val = v['new']
-                        if isinstance(old_val, (dict, list)):
+                        if isinstance(old_val, (Mapping, list)):
                             import json
                             old_val = json.dumps(old_val, indent=2)
-                        if isinstance(new_val, (dict, list)):
+                        if isinstance(new_val, (Mapping, list)):
                             import json
                             new_val = json.dumps(new_val, indent=2)
                         p_old.add_run(f"{k}: {old_val}\n")
                         p_new.add_run(f"{k}: {new_val}\n")
+                    elif isinstance(v, Mapping) and 'order_changed' in v:
+                        self._add_member_change_runs(p_old, p_new, k, v)
                     else:
                         import json
-                        p_old.add_run(f"{k}: {json.dumps(v, default=str)}\n")
-                        p_new.add_run(f"{k}: {json.dumps(v, default=str)}\n")
+                        p_old.add_run(f"{k}: {json.dumps(v, default=json_default)}\n")
+                        p_new.add_run(f"{k}: {json.dumps(v, default=json_default)}\n")
                 
                 for cell in row.cells:
                     self._style_body_cell(cell)
@@ -1181,22 +1131,24 @@ class AnalyticDocxGenerator:
             # Action badge
             action = "MODIFIED"
             color = "FFC107"
-            if isinstance(val, dict) and 'added' in val and not val.get('removed'): 
+            if isinstance(val, Mapping) and val.get('added') and not val.get('removed'):
                 action, color = "NEW", "28A745"
-            elif isinstance(val, dict) and 'removed' in val and not val.get('added'):
+            elif isinstance(val, Mapping) and val.get('removed') and not val.get('added'):
                 action, color = "REMOVED", "DC3545"
                 
             self._add_pill_badge(p, action, color)
             p.add_run(f" {key.upper()}: ")
             
-            if isinstance(val, dict) and ('added' in val or 'removed' in val):
+            if isinstance(val, Mapping) and ('added' in val or 'removed' in val):
+                 # enum / required changes list values; combinator changes list options
+                 noun = "values" if 'order_changed' in val else "options"
                  if 'added' in val and val['added']:
-                    p.add_run("Added options:")
+                    p.add_run(f"Added {noun}:")
                     for item in val['added']:
                         p_sub = self.doc.add_paragraph()
                         p_sub.paragraph_format.left_indent = Inches(indent_level + 0.25)
                         self._add_pill_badge(p_sub, "ADDED", "28A745")
-                        if isinstance(item, dict):
+                        if isinstance(item, Mapping):
                              p_sub.add_run(self._format_schema_summary(item))
                         else:
                              p_sub.add_run(str(item))
@@ -1205,19 +1157,25 @@ class AnalyticDocxGenerator:
                         p = self.doc.add_paragraph()
                         p.paragraph_format.left_indent = Inches(indent_level)
                         self._add_pill_badge(p, key.upper(), "17A2B8")
-                    p.add_run("Removed options:")
+                    p.add_run(f"Removed {noun}:")
                     for item in val['removed']:
                         p_sub = self.doc.add_paragraph()
                         p_sub.paragraph_format.left_indent = Inches(indent_level + 0.25)
                         self._add_pill_badge(p_sub, "REMOVED", "DC3545")
-                        if isinstance(item, dict):
+                        if isinstance(item, Mapping):
                              p_sub.add_run(self._format_schema_summary(item))
                         else:
                              p_sub.add_run(str(item))
+                 if val.get('order_changed'):
+                    if val.get('added') or val.get('removed'):
+                        p = self.doc.add_paragraph()
+                        p.paragraph_format.left_indent = Inches(indent_level)
+                        self._add_pill_badge(p, key.upper(), "17A2B8")
+                    p.add_run("Order of values changed")
 
-            elif isinstance(val, dict) and 'old' in val and 'new' in val:
+            elif isinstance(val, Mapping) and 'old' in val and 'new' in val:
                 p.add_run(f"Changed from '{val['old']}' to '{val['new']}'")
-            elif isinstance(val, dict) and 'old_count' in val:
+            elif isinstance(val, Mapping) and 'old_count' in val:
                 p.add_run(f"Count changed from {val['old_count']} to {val['new_count']}")
             else:
                 p.add_run(str(val))
@@ -1227,511 +1185,601 @@ class AnalyticDocxGenerator:
         Determines if a modification is 'substantial' or just a rename-induced ref change.
         Returns True if substantial, False otherwise.
         """
-        import copy
-        filtered_changes = copy.deepcopy(changes)
-        
-        if c_type == 'schemas' and 'properties' in filtered_changes and 'modified' in filtered_changes['properties']:
-            props_mod = filtered_changes['properties']['modified']
-            props_to_remove = []
-            
-            for prop, p_diff in props_mod.items():
-                # Check for $ref change
-                ref_change = None
-                if '$ref' in p_diff:
-                    ref_change = p_diff['$ref']
-                elif 'items' in p_diff and '$ref' in p_diff['items']: # Array of refs
-                        ref_change = p_diff['items']['$ref']
-                
-                if ref_change:
-                    old_ref = str(ref_change.get('old') or '')
-                    new_ref = str(ref_change.get('new') or '')
-                    old_simple = old_ref.split('/')[-1]
-                    new_simple = new_ref.split('/')[-1]
-                    
-                    # Check if this is a known rename
-                    if old_simple in renamed_map and renamed_map[old_simple] == new_simple:
-                        props_to_remove.append(prop)
-            
-            for p in props_to_remove:
-                del props_mod[p]
-            
-            if not props_mod:
-                del filtered_changes['properties']['modified']
-                if not filtered_changes['properties']:
-                    del filtered_changes['properties']
-        
-        # Check if anything else remains (ignoring __rename_info__)
-        keys = [k for k in filtered_changes.keys() if k != '__rename_info__']
-        return len(keys) > 0
+        return is_substantial_modification(changes, renamed_map, c_type)
 
     def _add_components(self):
         self.doc.add_heading('Components', 1)
         
-        # Order of presentation
-        comp_types = ['schemas', 'parameters', 'responses', 'headers', 'securitySchemes', 'links', 'callbacks', 'examples']
+        for c_type in COMPONENT_TYPES:
+            self._add_component_type(c_type)
+            self._flush_section()
+
+    def _add_component_type(self, c_type):
+        # Check if any changes exist for this type
+        new_items = self.diff.new_components.get(c_type, [])
+        rem_items = self.diff.removed_components.get(c_type, [])
+        mod_items = self.diff.modified_components.get(c_type, {})
         
-        for c_type in comp_types:
-            # Check if any changes exist for this type
-            new_items = self.diff.new_components.get(c_type, [])
-            rem_items = self.diff.removed_components.get(c_type, [])
-            mod_items = self.diff.modified_components.get(c_type, {})
+        # Renamed (Strict Partition)
+        if self.diff.renamed_components.get(c_type):
+            all_renames = self.diff.renamed_components[c_type]
             
-            # Renamed (Strict Partition)
-            if self.diff.renamed_components.get(c_type):
-                all_renames = self.diff.renamed_components[c_type]
-                
-                # Filter: Show here if NOT modified OR if modification is NOT substantial
-                items_to_show = {}
-                for old, new in all_renames.items():
-                    if old not in mod_items:
-                        items_to_show[old] = new
-                    elif not self._is_substantial_modification(old, mod_items[old], all_renames, c_type):
-                        items_to_show[old] = new
-                
-                if items_to_show:
-                    self.doc.add_heading(f"Renamed {c_type}", 3)
-                    for old_name in sorted(items_to_show.keys()):
-                        new_name = items_to_show[old_name]
-                        
-                        # Badge in separate paragraph
+            # Filter: Show here if NOT modified OR if modification is NOT substantial
+            items_to_show = {}
+            for old, new in all_renames.items():
+                if old not in mod_items:
+                    items_to_show[old] = new
+                elif not self._is_substantial_modification(old, mod_items[old], all_renames, c_type):
+                    items_to_show[old] = new
+            
+            if items_to_show:
+                self.doc.add_heading(f"Renamed {c_type}", 3)
+                for old_name in sorted(items_to_show.keys()):
+                    new_name = items_to_show[old_name]
+                    
+                    # Badge in separate paragraph
+                    p_badge = self.doc.add_paragraph()
+                    p_badge.paragraph_format.left_indent = Inches(0.25)
+                    p_badge.paragraph_format.space_after = Pt(0)
+                    self._add_pill_badge(p_badge, "RENAMED", "17A2B8")
+                    
+                    # Name in Heading 4 (for Nav Pane) but styled as text
+                    p = self.doc.add_heading('', level=4)
+                    p.paragraph_format.left_indent = Inches(0.25)
+                    p.paragraph_format.space_before = Pt(0)
+                    
+                    # Run 1: New Name (Bold)
+                    r1 = p.add_run(new_name)
+                    r1.font.color.rgb = RGBColor(0, 0, 0)
+                    r1.font.bold = True
+                    
+                    # Run 2: Old Name (Normal)
+                    r2 = p.add_run(f" (was {old_name})")
+                    r2.font.color.rgb = RGBColor(0, 0, 0)
+                    r2.font.bold = False
+                self.doc.add_paragraph().paragraph_format.space_after = Pt(12)
+
+        # New
+        if new_items:
+            self.doc.add_heading(f"New {c_type}", 3)
+            for item in sorted(new_items):
+                if c_type == 'schemas':
+                    p_badge = self.doc.add_paragraph()
+                    p_badge.paragraph_format.left_indent = Inches(0.25)
+                    p_badge.paragraph_format.space_after = Pt(0)
+                    self._add_pill_badge(p_badge, "NEW", "28A745")
+                    
+                    p = self.doc.add_heading(item, level=4)
+                    p.paragraph_format.left_indent = Inches(0.25)
+                    p.paragraph_format.space_before = Pt(0)
+                    for run in p.runs:
+                        run.font.color.rgb = RGBColor(0, 0, 0)
+                        run.font.bold = False
+                else:
+                    p = self.doc.add_paragraph()
+                    p.paragraph_format.left_indent = Inches(0.25)
+                    self._add_pill_badge(p, "NEW", "28A745")
+                    p.add_run(f" {c_type[:-1].capitalize()}: {item}")
+            self.doc.add_paragraph().paragraph_format.space_after = Pt(12)
+            
+        # Removed
+        if rem_items:
+            self.doc.add_heading(f"Removed {c_type}", 3)
+            for item in sorted(rem_items):
+                if c_type == 'schemas':
+                    p_badge = self.doc.add_paragraph()
+                    p_badge.paragraph_format.left_indent = Inches(0.25)
+                    p_badge.paragraph_format.space_after = Pt(0)
+                    self._add_pill_badge(p_badge, "REMOVED", "DC3545")
+                    
+                    p = self.doc.add_heading(item, level=4)
+                    p.paragraph_format.left_indent = Inches(0.25)
+                    p.paragraph_format.space_before = Pt(0)
+                    for run in p.runs:
+                        run.font.color.rgb = RGBColor(0, 0, 0)
+                        run.font.bold = False
+                else:
+                    p = self.doc.add_paragraph()
+                    p.paragraph_format.left_indent = Inches(0.25)
+                    self._add_pill_badge(p, "REMOVED", "DC3545")
+                    p.add_run(f" {c_type[:-1].capitalize()}: {item}")
+            self.doc.add_paragraph().paragraph_format.space_after = Pt(12)
+            
+        # Modified (Strict Partition)
+        if mod_items:
+            # Filter: Show here ONLY if substantial modification
+            filtered_mod_items = {}
+            renamed_map = self.diff.renamed_components.get(c_type, {})
+            
+            for item_name, changes in mod_items.items():
+                # Use the helper to check substantiality
+                if self._is_substantial_modification(item_name, changes, renamed_map, c_type):
+                    filtered_mod_items[item_name] = changes
+
+            if filtered_mod_items:
+                self.doc.add_heading(f"Modified {c_type}", 3)
+                for item_name in sorted(filtered_mod_items.keys()):
+                    changes = filtered_mod_items[item_name]
+                    # Check if this item was also renamed
+                    display_name = item_name
+                    rename_note = ""
+                    new_name = renamed_map.get(item_name)
+                    if new_name:
+                        display_name = new_name
+                        rename_note = f" (was {item_name})"
+
+                    # Use Pill Badge style instead of Heading 4 (but use Heading 4 for Nav Pane if Schema)
+                    if c_type == 'schemas':
                         p_badge = self.doc.add_paragraph()
+                        p_badge.paragraph_format.space_before = Pt(12)
                         p_badge.paragraph_format.left_indent = Inches(0.25)
                         p_badge.paragraph_format.space_after = Pt(0)
-                        self._add_pill_badge(p_badge, "RENAMED", "17A2B8")
                         
-                        # Name in Heading 4 (for Nav Pane) but styled as text
+                        if rename_note:
+                            self._add_pill_badge(p_badge, "RENAMED & MODIFIED", "FFC107")
+                        else:
+                            self._add_pill_badge(p_badge, "MODIFIED", "FFC107")
+                            
                         p = self.doc.add_heading('', level=4)
                         p.paragraph_format.left_indent = Inches(0.25)
                         p.paragraph_format.space_before = Pt(0)
                         
-                        # Run 1: New Name (Bold)
-                        r1 = p.add_run(new_name)
-                        r1.font.color.rgb = RGBColor(0, 0, 0)
+                        # Run 1: Display Name (Bold, Larger, Dark Blue)
+                        r1 = p.add_run(display_name)
+                        r1.font.color.rgb = RGBColor(0, 51, 102) # Dark Blue
+                        r1.font.size = Pt(12) # Larger
                         r1.font.bold = True
                         
-                        # Run 2: Old Name (Normal)
-                        r2 = p.add_run(f" (was {old_name})")
-                        r2.font.color.rgb = RGBColor(0, 0, 0)
-                        r2.font.bold = False
-                    self.doc.add_paragraph().paragraph_format.space_after = Pt(12)
-
-            # New
-            if new_items:
-                self.doc.add_heading(f"New {c_type}", 3)
-                for item in sorted(new_items):
-                    if c_type == 'schemas':
-                        p_badge = self.doc.add_paragraph()
-                        p_badge.paragraph_format.left_indent = Inches(0.25)
-                        p_badge.paragraph_format.space_after = Pt(0)
-                        self._add_pill_badge(p_badge, "NEW", "28A745")
-                        
-                        p = self.doc.add_heading(item, level=4)
-                        p.paragraph_format.left_indent = Inches(0.25)
-                        p.paragraph_format.space_before = Pt(0)
-                        for run in p.runs:
-                            run.font.color.rgb = RGBColor(0, 0, 0)
-                            run.font.bold = False
+                        # Run 2: Rename Note (Normal)
+                        if rename_note:
+                            r2 = p.add_run(rename_note)
+                            r2.font.color.rgb = RGBColor(0, 0, 0)
+                            r2.font.bold = False
+
                     else:
                         p = self.doc.add_paragraph()
+                        p.paragraph_format.space_before = Pt(12)
                         p.paragraph_format.left_indent = Inches(0.25)
-                        self._add_pill_badge(p, "NEW", "28A745")
-                        p.add_run(f" {c_type[:-1].capitalize()}: {item}")
-                self.doc.add_paragraph().paragraph_format.space_after = Pt(12)
-                
-            # Removed
-            if rem_items:
-                self.doc.add_heading(f"Removed {c_type}", 3)
-                for item in sorted(rem_items):
-                    if c_type == 'schemas':
-                        p_badge = self.doc.add_paragraph()
-                        p_badge.paragraph_format.left_indent = Inches(0.25)
-                        p_badge.paragraph_format.space_after = Pt(0)
-                        self._add_pill_badge(p_badge, "REMOVED", "DC3545")
                         
-                        p = self.doc.add_heading(item, level=4)
-                        p.paragraph_format.left_indent = Inches(0.25)
-                        p.paragraph_format.space_before = Pt(0)
-                        for run in p.runs:
-                            run.font.color.rgb = RGBColor(0, 0, 0)
-                            run.font.bold = False
-                    else:
-                        p = self.doc.add_paragraph()
-                        p.paragraph_format.left_indent = Inches(0.25)
-                        self._add_pill_badge(p, "REMOVED", "DC3545")
-                        p.add_run(f" {c_type[:-1].capitalize()}: {item}")
-                self.doc.add_paragraph().paragraph_format.space_after = Pt(12)
-                
-            # Modified (Strict Partition)
-            if mod_items:
-                # Filter: Show here ONLY if substantial modification
-                filtered_mod_items = {}
-                renamed_map = self.diff.renamed_components.get(c_type, {})
-                
-                for item_name, changes in mod_items.items():
-                    # Use the helper to check substantiality
-                    if self._is_substantial_modification(item_name, changes, renamed_map, c_type):
-                        filtered_mod_items[item_name] = changes
-
-                if filtered_mod_items:
-                    self.doc.add_heading(f"Modified {c_type}", 3)
-                    for item_name in sorted(filtered_mod_items.keys()):
-                        changes = filtered_mod_items[item_name]
-                        # Check if this item was also renamed
-                        display_name = item_name
-                        rename_note = ""
-                        new_name = renamed_map.get(item_name)
-                        if new_name:
-                            display_name = new_name
-                            rename_note = f" (was {item_name})"
-
-                        # Use Pill Badge style instead of Heading 4 (but use Heading 4 for Nav Pane if Schema)
-                        if c_type == 'schemas':
-                            p_badge = self.doc.add_paragraph()
-                            p_badge.paragraph_format.space_before = Pt(12)
-                            p_badge.paragraph_format.left_indent = Inches(0.25)
-                            p_badge.paragraph_format.space_after = Pt(0)
-                            
-                            if rename_note:
-                                self._add_pill_badge(p_badge, "RENAMED & MODIFIED", "FFC107")
-                            else:
-                                self._add_pill_badge(p_badge, "MODIFIED", "FFC107")
-                                
-                            p = self.doc.add_heading('', level=4)
-                            p.paragraph_format.left_indent = Inches(0.25)
-                            p.paragraph_format.space_before = Pt(0)
-                            
-                            # Run 1: Display Name (Bold, Larger, Dark Blue)
-                            r1 = p.add_run(display_name)
-                            r1.font.color.rgb = RGBColor(0, 51, 102) # Dark Blue
-                            r1.font.size = Pt(12) # Larger
-                            r1.font.bold = True
-                            
-                            # Run 2: Rename Note (Normal)
-                            if rename_note:
-                                r2 = p.add_run(rename_note)
-                                r2.font.color.rgb = RGBColor(0, 0, 0)
-                                r2.font.bold = False
-
+                        if rename_note:
+                            self._add_pill_badge(p, "RENAMED & MODIFIED", "FFC107")
                         else:
-                            p = self.doc.add_paragraph()
-                            p.paragraph_format.space_before = Pt(12)
-                            p.paragraph_format.left_indent = Inches(0.25)
-                            
-                            if rename_note:
-                                self._add_pill_badge(p, "RENAMED & MODIFIED", "FFC107")
-                            else:
-                                self._add_pill_badge(p, "MODIFIED", "FFC107")
-                            
-                            p.add_run(display_name + rename_note) # No Bold
+                            self._add_pill_badge(p, "MODIFIED", "FFC107")
+                        
+                        p.add_run(display_name + rename_note) # No Bold
+                    
+                    # Special handling for Schemas properties table
+                    if c_type == 'schemas' and 'properties' in changes and 'modified' in changes['properties']:
+                        p_prop = self.doc.add_paragraph('Property Changes:')
+                        p_prop.paragraph_format.left_indent = Inches(0.5) # Indent label
+                        p_prop.paragraph_format.space_before = Pt(12) # Standard separation
+                        p_prop.paragraph_format.space_after = Pt(4)
+                        
+                        # Calculate available width (Total 6.4 - 0.5 indent = 5.9)
+                        total_avail = 6.4 - 0.5
+                        col1 = 1.3
+                        col2 = 0.7
+                        col34 = (total_avail - col1 - col2) / 2
+                        widths = [Inches(col1), Inches(col2), Inches(col34), Inches(col34)]
+                        
+                        table = self._create_table(4, widths)
+                        tblPr = table._tblPr
+                        tblInd = get_or_add_child(tblPr, 'w:tblInd', TBL_PR_ORDER)
+                        tblInd.set(qn('w:w'), str(int(Inches(0.5).twips))) # Indent table
+                        tblInd.set(qn('w:type'), 'dxa')
+                        
+                        self._style_header_row(table.rows[0], ['Property', 'Change', 'Old', 'New'])
                         
-                        # Special handling for Schemas properties table
-                        if c_type == 'schemas' and 'properties' in changes and 'modified' in changes['properties']:
-                            p_prop = self.doc.add_paragraph('Property Changes:')
-                            p_prop.paragraph_format.left_indent = Inches(0.5) # Indent label
-                            p_prop.paragraph_format.space_before = Pt(12) # Standard separation
-                            p_prop.paragraph_format.space_after = Pt(4)
+                        for prop, p_diff in changes['properties']['modified'].items():
+                            row = table.add_row()
+                            row.cells[0].text = prop
+                            row.cells[1].text = 'Mod'
                             
-                            # Calculate available width (Total 6.4 - 0.5 indent = 5.9)
-                            total_avail = 6.4 - 0.5
-                            col1 = 1.3
-                            col2 = 0.7
-                            col34 = (total_avail - col1 - col2) / 2
-                            widths = [Inches(col1), Inches(col2), Inches(col34), Inches(col34)]
+                            cell_old = row.cells[2]
+                            cell_new = row.cells[3]
+                            p_old = cell_old.paragraphs[0]
+                            p_new = cell_new.paragraphs[0]
                             
-                            table = self._create_table(4, widths)
-                            tblPr = table._tblPr
-                            tblInd = get_or_add_child(tblPr, 'w:tblInd', TBL_PR_ORDER)
-                            tblInd.set(qn('w:w'), str(int(Inches(0.5).twips))) # Indent table
-                            tblInd.set(qn('w:type'), 'dxa')
+                            for k, v in p_diff.items():
+                                if k == 'description' and isinstance(v, Mapping) and 'old' in v:
+                                    p_old.add_run("description: ")
+                                    p_new.add_run("description: ")
+                                    self._render_rich_diff(p_old, p_new, v['old'], v['new'])
+                                    p_old.add_run("\n")
+                                    p_new.add_run("\n")
+                                elif isinstance(v, Mapping) and 'old' in v:
+                                    p_old.add_run(f"{k}: {v['old']}\n")
+                                    p_new.add_run(f"{k}: {v['new']}\n")
+                                elif isinstance(v, Mapping) and 'order_changed' in v:
+                                    self._add_member_change_runs(p_old, p_new, k, v)
+                                else:
+                                    p_old.add_run(f"{k}: (complex)\n")
+                                    p_new.add_run(f"{k}: (complex)\n")
                             
-                            self._style_header_row(table.rows[0], ['Property', 'Change', 'Old', 'New'])
+                            for cell in row.cells:
+                                self._style_body_cell(cell)
+                        self.doc.add_paragraph().paragraph_format.space_after = Pt(12)
+                
+                    # Track if we printed anything for this item
+                    content_printed = False
+
+                    if 'properties' in changes:
+                        if 'new' in changes['properties'] and changes['properties']['new']:
+                            p_new = self.doc.add_paragraph("New Properties:")
+                            p_new.paragraph_format.left_indent = Inches(0.5) # Indented under schema
+                            p_new.paragraph_format.space_before = Pt(12) # Standard separation
+                            p_new.paragraph_format.space_after = Pt(4)
                             
-                            for prop, p_diff in changes['properties']['modified'].items():
-                                row = table.add_row()
-                                row.cells[0].text = prop
-                                row.cells[1].text = 'Mod'
-                                
-                                cell_old = row.cells[2]
-                                cell_new = row.cells[3]
-                                p_old = cell_old.paragraphs[0]
-                                p_new = cell_new.paragraphs[0]
-                                
-                                for k, v in p_diff.items():
-                                    if k == 'description' and isinstance(v, dict) and 'old' in v:
-                                        p_old.add_run("description: ")
-                                        p_new.add_run("description: ")
-                                        self._render_rich_diff(p_old, p_new, v['old'], v['new'])
-                                        p_old.add_run("\n")
-                                        p_new.add_run("\n")
-                                    elif isinstance(v, dict) and 'old' in v:
-                                        p_old.add_run(f"{k}: {v['old']}\n")
-                                        p_new.add_run(f"{k}: {v['new']}\n")
-                                    else:
-                                        p_old.add_run(f"{k}: (complex)\n")
-                                        p_new.add_run(f"{k}: (complex)\n")
-                                
-                                for cell in row.cells:
-                                    self._style_body_cell(cell)
-                            self.doc.add_paragraph().paragraph_format.space_after = Pt(12)
+                            for prop in changes['properties']['new']:
+                                p = self.doc.add_paragraph()
+                                p.paragraph_format.left_indent = Inches(0.75) # Further indented
+                                p.paragraph_format.space_after = Pt(2)
+                                self._add_pill_badge(p, "NEW PROP", "28A745")
+                                p.add_run(prop)
+                            content_printed = True
+
+                        if 'removed' in changes['properties'] and changes['properties']['removed']:
+                            p_rem = self.doc.add_paragraph("Removed Properties:")
+                            p_rem.paragraph_format.left_indent = Inches(0.5) # Indented under schema
+                            p_rem.paragraph_format.space_before = Pt(12) # Standard separation
+                            p_rem.paragraph_format.space_after = Pt(4)
+                            
+                            for prop in changes['properties']['removed']:
+                                p = self.doc.add_paragraph()
+                                p.paragraph_format.left_indent = Inches(0.75) # Further indented
+                                p.paragraph_format.space_after = Pt(2)
+                                self._add_pill_badge(p, "REMOVED PROP", "DC3545")
+                                p.add_run(prop)
+                            content_printed = True
+                        
+                        if 'modified' in changes['properties']:
+                            content_printed = True # Table already added above
+
+                    # 5. Attribute Changes Table
+                    # Collect simple attribute changes (not properties, ref, or combinators)
+                    attr_changes = {}
+                    ignored_keys = ['properties', '$ref', 'oneOf', 'allOf', 'anyOf', '__rename_info__']
                     
-                        # Track if we printed anything for this item
-                        content_printed = False
-
-                        if 'properties' in changes:
-                            if 'new' in changes['properties'] and changes['properties']['new']:
-                                p_new = self.doc.add_paragraph("New Properties:")
-                                p_new.paragraph_format.left_indent = Inches(0.5) # Indented under schema
-                                p_new.paragraph_format.space_before = Pt(12) # Standard separation
-                                p_new.paragraph_format.space_after = Pt(4)
-                                
-                                for prop in changes['properties']['new']:
-                                    p = self.doc.add_paragraph()
-                                    p.paragraph_format.left_indent = Inches(0.75) # Further indented
-                                    p.paragraph_format.space_after = Pt(2)
-                                    self._add_pill_badge(p, "NEW PROP", "28A745")
-                                    p.add_run(prop)
-                                content_printed = True
-
-                            if 'removed' in changes['properties'] and changes['properties']['removed']:
-                                p_rem = self.doc.add_paragraph("Removed Properties:")
-                                p_rem.paragraph_format.left_indent = Inches(0.5) # Indented under schema
-                                p_rem.paragraph_format.space_before = Pt(12) # Standard separation
-                                p_rem.paragraph_format.space_after = Pt(4)
+                    for key, val in changes.items():
+                        if key in ignored_keys: continue
+                        if isinstance(val, Mapping) and 'old' in val and 'new' in val:
+                            attr_changes[key] = val
+                    
+                    if attr_changes:
+                        content_printed = True
+                        p_attr = self.doc.add_paragraph('Attribute Changes:')
+                        p_attr.paragraph_format.left_indent = Inches(0.5)
+                        p_attr.paragraph_format.space_before = Pt(12)
+                        p_attr.paragraph_format.space_after = Pt(4)
+                        
+                        # Calculate available width (7.0 - 0.5 indent = 6.5)
+                        widths = [Inches(1.5), Inches(0.8), Inches(2.1), Inches(2.1)]
+                        table = self._create_table(4, widths)
+                        tblPr = table._tblPr
+                        tblInd = get_or_add_child(tblPr, 'w:tblInd', TBL_PR_ORDER)
+                        tblInd.set(qn('w:w'), str(int(Inches(0.5).twips)))
+                        tblInd.set(qn('w:type'), 'dxa')
+                        
+                        self._style_header_row(table.rows[0], ['Attribute', 'Change', 'Old Value', 'New Value'])
+                        
+                        for attr, val in attr_changes.items():
+                            row = table.add_row()
+                            row.cells[0].text = attr
+                            row.cells[1].text = 'Mod'
+                            
+                            if attr == 'description':
+                                self._render_rich_diff(row.cells[2].paragraphs[0], row.cells[3].paragraphs[0], val['old'], val['new'])
+                            else:
+                                old_val = val['old']
+                                new_val = val['new']
+                                if isinstance(old_val, (Mapping, list)):
+                                    import json
+                                    old_val = json.dumps(old_val, indent=2)
+                                if isinstance(new_val, (Mapping, list)):
+                                    import json
+                                    new_val = json.dumps(new_val, indent=2)
                                 
-                                for prop in changes['properties']['removed']:
-                                    p = self.doc.add_paragraph()
-                                    p.paragraph_format.left_indent = Inches(0.75) # Further indented
-                                    p.paragraph_format.space_after = Pt(2)
-                                    self._add_pill_badge(p, "REMOVED PROP", "DC3545")
-                                    p.add_run(prop)
-                                content_printed = True
+                                row.cells[2].text = str(old_val)
+                                row.cells[3].text = str(new_val)
                             
-                            if 'modified' in changes['properties']:
-                                content_printed = True # Table already added above
+                            for cell in row.cells:
+                                self._style_body_cell(cell)
+                        
+                        self.doc.add_paragraph().paragraph_format.space_after = Pt(6)
 
-                        # 5. Attribute Changes Table
-                        # Collect simple attribute changes (not properties, ref, or combinators)
-                        attr_changes = {}
-                        ignored_keys = ['properties', '$ref', 'oneOf', 'allOf', 'anyOf', '__rename_info__']
+                    for key, val in changes.items():
+                        if key in ['properties', '__rename_info__']: continue
+                        # Skip if already handled in Attribute Changes table
+                        if key in attr_changes: continue
                         
-                        for key, val in changes.items():
-                            if key in ignored_keys: continue
-                            if isinstance(val, dict) and 'old' in val and 'new' in val:
-                                attr_changes[key] = val
+                        content_printed = True
+                        p = self.doc.add_paragraph()
+                        p.paragraph_format.left_indent = Inches(0.5)
                         
-                        if attr_changes:
-                            content_printed = True
-                            p_attr = self.doc.add_paragraph('Attribute Changes:')
-                            p_attr.paragraph_format.left_indent = Inches(0.5)
-                            p_attr.paragraph_format.space_before = Pt(12)
-                            p_attr.paragraph_format.space_after = Pt(4)
-                            
-                            # Calculate available width (7.0 - 0.5 indent = 6.5)
-                            widths = [Inches(1.5), Inches(0.8), Inches(2.1), Inches(2.1)]
-                            table = self._create_table(4, widths)
-                            tblPr = table._tblPr
-                            tblInd = get_or_add_child(tblPr, 'w:tblInd', TBL_PR_ORDER)
-                            tblInd.set(qn('w:w'), str(int(Inches(0.5).twips)))
-                            tblInd.set(qn('w:type'), 'dxa')
+                        if key in ['oneOf', 'allOf', 'anyOf']:
+                            # Keyword Style (Bold Monospace, Dark Blue)
+                            run = p.add_run(key)
+                            run.font.name = 'Consolas'
+                            run.font.bold = True
+                            run.font.color.rgb = RGBColor(0, 51, 102) # Dark Blue
+                            p.add_run(" ") # Spacer
+                        else:
+                            self._add_pill_badge(p, key.upper(), "17A2B8")
+                        if isinstance(val, Mapping) and ('added' in val or 'removed' in val):
+                            added_items = val.get('added', [])
+                            removed_items = val.get('removed', [])
+                            noun = "values" if 'order_changed' in val else "options"
                             
-                            self._style_header_row(table.rows[0], ['Attribute', 'Change', 'Old Value', 'New Value'])
+                            # Check for rename pairs in combinators
+                            renamed_pairs = []
+                            indices_added = []
+                            indices_removed = []
                             
-                            for attr, val in attr_changes.items():
-                                row = table.add_row()
-                                row.cells[0].text = attr
-                                row.cells[1].text = 'Mod'
-                                
-                                if attr == 'description':
-                                    self._render_rich_diff(row.cells[2].paragraphs[0], row.cells[3].paragraphs[0], val['old'], val['new'])
-                                else:
-                                    old_val = val['old']
-                                    new_val = val['new']
-                                    if isinstance(old_val, (dict, list)):
-                                        import json
-                                        old_val = json.dumps(old_val, indent=2)
-                                    if isinstance(new_val, (dict, list)):
-                                        import json
-                                        new_val = json.dumps(new_val, indent=2)
+                            if key in ['oneOf', 'allOf', 'anyOf'] and c_type == 'schemas':
+                                renamed_map = self.diff.renamed_components.get('schemas', {})
+                                for i_rem, rem_item in enumerate(removed_items):
+                                    rem_ref = None
+                                    if isinstance(rem_item, str): rem_ref = rem_item
+                                    elif isinstance(rem_item, Mapping) and '$ref' in rem_item: rem_ref = rem_item['$ref']
                                     
-                                    row.cells[2].text = str(old_val)
-                                    row.cells[3].text = str(new_val)
-                                
-                                for cell in row.cells:
-                                    self._style_body_cell(cell)
+                                    if rem_ref:
+                                        rem_simple = rem_ref.split('/')[-1]
+                                        if rem_simple in renamed_map:
+                                            new_simple = renamed_map[rem_simple]
+                                            for i_add, add_item in enumerate(added_items):
+                                                if i_add in indices_added: continue
+                                                add_ref = None
+                                                if isinstance(add_item, str): add_ref = add_item
+                                                elif isinstance(add_item, Mapping) and '$ref' in add_item: add_ref = add_item['$ref']
+                                                
+                                                if add_ref and add_ref.split('/')[-1] == new_simple:
+                                                    renamed_pairs.append((rem_ref, add_ref))
+                                                    indices_removed.append(i_rem)
+                                                    indices_added.append(i_add)
+                                                    break
                             
-                            self.doc.add_paragraph().paragraph_format.space_after = Pt(6)
+                            # Display Renamed Pairs
+                            if renamed_pairs:
+                                p.add_run("Ref changes:")
+                                for old_ref, new_ref in renamed_pairs:
+                                    p_sub = self.doc.add_paragraph()
+                                    p_sub.paragraph_format.left_indent = Inches(0.75)
+                                    self._add_pill_badge(p_sub, "REF RENAMED", "FFC107")
+                                    p_sub.add_run(f"'{old_ref}' \u2192 '{new_ref}'")
+
+                            # Display remaining Added
+                            remaining_added = [item for i, item in enumerate(added_items) if i not in indices_added]
+                            if remaining_added:
+                                if renamed_pairs: 
+                                    p_lbl = self.doc.add_paragraph()
+                                    p_lbl.paragraph_format.left_indent = Inches(0.5)
+                                    self._add_pill_badge(p_lbl, key.upper(), "17A2B8")
+                                p.add_run(f"Added {noun}:")
+                                for item in remaining_added:
+                                    p_sub = self.doc.add_paragraph()
+                                    p_sub.paragraph_format.left_indent = Inches(0.75)
+                                    self._add_pill_badge(p_sub, "ADDED", "28A745")
+                                    if c_type == 'schemas' and isinstance(item, Mapping):
+                                        p_sub.add_run(self._format_schema_summary(item))
+                                    else:
+                                        p_sub.add_run(str(item))
 
-                        for key, val in changes.items():
-                            if key in ['properties', '__rename_info__']: continue
-                            # Skip if already handled in Attribute Changes table
-                            if key in attr_changes: continue
-                            
-                            content_printed = True
-                            p = self.doc.add_paragraph()
-                            p.paragraph_format.left_indent = Inches(0.5)
-                            
-                            if key in ['oneOf', 'allOf', 'anyOf']:
-                                # Keyword Style (Bold Monospace, Dark Blue)
-                                run = p.add_run(key)
-                                run.font.name = 'Consolas'
-                                run.font.bold = True
-                                run.font.color.rgb = RGBColor(0, 51, 102) # Dark Blue
-                                p.add_run(" ") # Spacer
-                            else:
-                                self._add_pill_badge(p, key.upper(), "17A2B8")
-                            if isinstance(val, dict) and ('added' in val or 'removed' in val):
-                                added_items = val.get('added', [])
-                                removed_items = val.get('removed', [])
-                                
-                                # Check for rename pairs in combinators
-                                renamed_pairs = []
-                                indices_added = []
-                                indices_removed = []
-                                
-                                if key in ['oneOf', 'allOf', 'anyOf'] and c_type == 'schemas':
-                                    renamed_map = self.diff.renamed_components.get('schemas', {})
-                                    for i_rem, rem_item in enumerate(removed_items):
-                                        rem_ref = None
-                                        if isinstance(rem_item, str): rem_ref = rem_item
-                                        elif isinstance(rem_item, dict) and '$ref' in rem_item: rem_ref = rem_item['$ref']
-                                        
-                                        if rem_ref:
-                                            rem_simple = rem_ref.split('/')[-1]
-                                            if rem_simple in renamed_map:
-                                                new_simple = renamed_map[rem_simple]
-                                                for i_add, add_item in enumerate(added_items):
-                                                    if i_add in indices_added: continue
-                                                    add_ref = None
-                                                    if isinstance(add_item, str): add_ref = add_item
-                                                    elif isinstance(add_item, dict) and '$ref' in add_item: add_ref = add_item['$ref']
-                                                    
-                                                    if add_ref and add_ref.split('/')[-1] == new_simple:
-                                                        renamed_pairs.append((rem_ref, add_ref))
-                                                        indices_removed.append(i_rem)
-                                                        indices_added.append(i_add)
-                                                        break
-                                
-                                # Display Renamed Pairs
-                                if renamed_pairs:
-                                    p.add_run("Ref changes:")
-                                    for old_ref, new_ref in renamed_pairs:
-                                        p_sub = self.doc.add_paragraph()
-                                        p_sub.paragraph_format.left_indent = Inches(0.75)
-                                        self._add_pill_badge(p_sub, "REF RENAMED", "FFC107")
-                                        p_sub.add_run(f"'{old_ref}' \u2192 '{new_ref}'")
-
-                                # Display remaining Added
-                                remaining_added = [item for i, item in enumerate(added_items) if i not in indices_added]
-                                if remaining_added:
-                                    if renamed_pairs: 
-                                        p_lbl = self.doc.add_paragraph()
-                                        p_lbl.paragraph_format.left_indent = Inches(0.5)
-                                        self._add_pill_badge(p_lbl, key.upper(), "17A2B8")
-                                    p.add_run("Added options:")
-                                    for item in remaining_added:
-                                        p_sub = self.doc.add_paragraph()
-                                        p_sub.paragraph_format.left_indent = Inches(0.75)
-                                        self._add_pill_badge(p_sub, "ADDED", "28A745")
-                                        if c_type == 'schemas':
-                                            p_sub.add_run(self._format_schema_summary(item))
-                                        else:
-                                            p_sub.add_run(str(item))
-
-                                # Display remaining Removed
-                                remaining_removed = [item for i, item in enumerate(removed_items) if i not in indices_removed]
-                                if remaining_removed:
-                                    if remaining_added or renamed_pairs:
-                                        p = self.doc.add_paragraph()
-                                        p.paragraph_format.left_indent = Inches(0.5)
-                                        self._add_pill_badge(p, key.upper(), "17A2B8")
-                                    p.add_run("Removed options:")
-                                    for item in remaining_removed:
-                                        p_sub = self.doc.add_paragraph()
-                                        p_sub.paragraph_format.left_indent = Inches(0.75)
-                                        self._add_pill_badge(p_sub, "REMOVED", "DC3545")
-                                        if c_type == 'schemas':
-                                            p_sub.add_run(self._format_schema_summary(item))
-                                        else:
-                                            p_sub.add_run(str(item))
-
-                            elif isinstance(val, dict) and 'old' in val and 'new' in val:
-                                 p.add_run(f" - {key} changed:")
-                                 # Use table for generic value change
-                                 widths = [Inches(3.0), Inches(3.0)]
-                                 table = self._create_table(2, widths)
-                                 self._style_header_row(table.rows[0], ['Old Value', 'New Value'])
-                                 row = table.add_row()
+                            # Display remaining Removed
+                            remaining_removed = [item for i, item in enumerate(removed_items) if i not in indices_removed]
+                            if remaining_removed:
+                                if remaining_added or renamed_pairs:
+                                    p = self.doc.add_paragraph()
+                                    p.paragraph_format.left_indent = Inches(0.5)
+                                    self._add_pill_badge(p, key.upper(), "17A2B8")
+                                p.add_run(f"Removed {noun}:")
+                                for item in remaining_removed:
+                                    p_sub = self.doc.add_paragraph()
+                                    p_sub.paragraph_format.left_indent = Inches(0.75)
+                                    self._add_pill_badge(p_sub, "REMOVED", "DC3545")
+                                    if c_type == 'schemas' and isinstance(item, Mapping):
+                                        p_sub.add_run(self._format_schema_summary(item))
+                                    else:
+                                        p_sub.add_run(str(item))
+
+                            if val.get('order_changed'):
+                                if remaining_added or remaining_removed or renamed_pairs:
+                                    p = self.doc.add_paragraph()
+                                    p.paragraph_format.left_indent = Inches(0.5)
+                                    self._add_pill_badge(p, key.upper(), "17A2B8")
+                                p.add_run("Order of values changed")
+
+                        elif isinstance(val, Mapping) and 'old' in val and 'new' in val:
+                             p.add_run(f" - {key} changed:")
+                             # Use table for generic value change
+                             widths = [Inches(3.0), Inches(3.0)]
+                             table = self._create_table(2, widths)
+                             self._style_header_row(table.rows[0], ['Old Value', 'New Value'])
+                             row = table.add_row()
+                             
+                             # Format values
+                             old_val = val['old']
+                             new_val = val['new']
+                             if isinstance(old_val, (Mapping, list)):
+                                 import json
+                                 old_val = json.dumps(old_val, indent=2)
+                             if isinstance(new_val, (Mapping, list)):
+                                 import json
+                                 new_val = json.dumps(new_val, indent=2)
                                  
-                                 # Format values
-                                 old_val = val['old']
-                                 new_val = val['new']
-                                 if isinstance(old_val, (dict, list)):
-                                     import json
-                                     old_val = json.dumps(old_val, indent=2)
-                                 if isinstance(new_val, (dict, list)):
-                                     import json
-                                     new_val = json.dumps(new_val, indent=2)
-                                     
-                                 row.cells[0].text = str(old_val)
-                                 row.cells[1].text = str(new_val)
-                                 for cell in row.cells:
-                                     self._style_body_cell(cell)
-                                 self.doc.add_paragraph().paragraph_format.space_after = Pt(6)
-                            else:
-                                 # Fallback
-                                 p.add_run(str(val))
+                             row.cells[0].text = str(old_val)
+                             row.cells[1].text = str(new_val)
+                             for cell in row.cells:
+                                 self._style_body_cell(cell)
+                             self.doc.add_paragraph().paragraph_format.space_after = Pt(6)
+                        elif is_payload_diff(val):
+                             p.add_run(" - changed values:")
+                             for line in pointer_change_lines(val):
+                                 p_sub = self.doc.add_paragraph()
+                                 p_sub.paragraph_format.left_indent = Inches(0.75)
+                                 run = p_sub.add_run(line)
+                                 run.font.name = 'Consolas'
+                                 run.font.size = Pt(8)
+                        else:
+                             # Fallback
+                             p.add_run(str(val))
+                    
+                    if not content_printed:
+                        p = self.doc.add_paragraph()
+                        p.paragraph_format.left_indent = Inches(0.5)
+                        p.add_run("Metadata or internal structure modified.")
+                        p.font.italic = True
+                        # Debug info
+                        p.add_run(f" (Keys: {', '.join(changes.keys())})")
+
+                    # --- AFFECTED ENDPOINTS SECTION ---
+                    # Look up impacts using the NEW name (as that's what's in spec2)
+                    # We place this LAST as requested.
+                    if c_type == 'schemas':
+                        impact_name = item_name
+                        renamed_map = self.diff.renamed_components.get('schemas', {})
+                        if item_name in renamed_map:
+                            impact_name = renamed_map[item_name]
+                            
+                        impacts = self.tracer.get_impacted_endpoints(impact_name)
                         
-                        if not content_printed:
-                            p = self.doc.add_paragraph()
-                            p.paragraph_format.left_indent = Inches(0.5)
-                            p.add_run("Metadata or internal structure modified.")
-                            p.font.italic = True
-                            # Debug info
-                            p.add_run(f" (Keys: {', '.join(changes.keys())})")
-
-                        # --- AFFECTED ENDPOINTS SECTION ---
-                        # Look up impacts using the NEW name (as that's what's in spec2)
-                        # We place this LAST as requested.
-                        if c_type == 'schemas':
-                            impact_name = item_name
-                            renamed_map = self.diff.renamed_components.get('schemas', {})
-                            if item_name in renamed_map:
-                                impact_name = renamed_map[item_name]
-                                
-                            impacts = self.tracer.get_impacted_endpoints(impact_name)
+                        if impacts and self.group_affected_endpoints:
+                            # Identical endpoint sets are rendered once in the appendix
+                            group = self._affected_endpoint_groups()['by_schema'][item_name]
+                            p_impact = self.doc.add_paragraph('Affected Endpoints: ')
+                            p_impact.paragraph_format.left_indent = Inches(0.5)
+                            p_impact.paragraph_format.space_before = Pt(12)
+                            p_impact.paragraph_format.space_after = Pt(8)
+                            self._add_internal_link(p_impact, f"{group['title']} ({len(group['impacts'])} endpoints)", group['bookmark'])
+                        elif impacts:
+                            p_impact = self.doc.add_paragraph('Affected Endpoints:')
+                            p_impact.paragraph_format.left_indent = Inches(0.5)
+                            p_impact.paragraph_format.space_before = Pt(12) # Standard separation
+                            p_impact.paragraph_format.space_after = Pt(4)
                             
-                            if impacts:
-                                p_impact = self.doc.add_paragraph('Affected Endpoints:')
-                                p_impact.paragraph_format.left_indent = Inches(0.5)
-                                p_impact.paragraph_format.space_before = Pt(12) # Standard separation
-                                p_impact.paragraph_format.space_after = Pt(4)
-                                
-                                # Table for impacts
-                                # Widths: Method(0.8), Path(3.0), Context(2.7) -> Total 6.5
-                                widths = [Inches(0.8), Inches(3.0), Inches(2.7)]
-                                table = self._create_table(3, widths)
-                                tblPr = table._tblPr
-                                tblInd = get_or_add_child(tblPr, 'w:tblInd', TBL_PR_ORDER)
-                                tblInd.set(qn('w:w'), str(int(Inches(0.5).twips)))
-                                tblInd.set(qn('w:type'), 'dxa')
-                                
-                                self._style_header_row(table.rows[0], ['Method', 'Endpoint', 'Context'])
-                                
-                                sorted_impacts = sorted(impacts, key=lambda x: (x['path'], x['method']))
-                                for impact in sorted_impacts:
-                                    row = table.add_row()
-                                    row.cells[0].text = impact['method']
-                                    row.cells[1].text = impact['path']
-                                    row.cells[2].text = impact['context']
-                                    
-                                    # Style Method (Bold)
-                                    row.cells[0].paragraphs[0].runs[0].font.bold = True
-                                    
-                                    for cell in row.cells:
-                                        self._style_body_cell(cell)
-                                
-                                self.doc.add_paragraph().paragraph_format.space_after = Pt(8)
-                        # ----------------------------------
+                            self._add_affected_endpoints_table(impacts)
+                            self.doc.add_paragraph().paragraph_format.space_after = Pt(8)
+                    # ----------------------------------
+                    self._flush_section()
+
+    def _add_affected_endpoints_table(self, impacts):
+        # Table for impacts
+        # Widths: Method(0.8), Path(3.0), Context(2.7) -> Total 6.5
+        widths = [Inches(0.8), Inches(3.0), Inches(2.7)]
+        table = self._create_table(3, widths)
+        tblPr = table._tblPr
+        tblInd = get_or_add_child(tblPr, 'w:tblInd', TBL_PR_ORDER)
+        tblInd.set(qn('w:w'), str(int(Inches(0.5).twips)))
+        tblInd.set(qn('w:type'), 'dxa')
+        
+        self._style_header_row(table.rows[0], ['Method', 'Endpoint', 'Context'])
+        
+        sorted_impacts = sorted(impacts, key=lambda x: (x['path'], x['method']))
+        for impact in sorted_impacts:
+            row = table.add_row()
+            row.cells[0].text = impact['method']
+            row.cells[1].text = impact['path']
+            row.cells[2].text = impact['context']
+            
+            # Style Method (Bold)
+            row.cells[0].paragraphs[0].runs[0].font.bold = True
+            
+            for cell in row.cells:
+                self._style_body_cell(cell)
+
+    def _affected_endpoint_groups(self):
+        """
+        Groups the modified schemas shown in the report by their (transitive) set of affected endpoints.
+        Returns {'groups': [...], 'by_schema': {schema: group}}; each group has a title, a bookmark,
+        its impacts and the display names of the schemas that share it.
+        Derived only from the diff and the tracer, so every process computes the same groups.
+        """
+        if self._endpoint_groups is not None:
+            return self._endpoint_groups
+
+        mod_items = self.diff.modified_components.get('schemas', {})
+        renamed_map = self.diff.renamed_components.get('schemas', {})
+
+        groups_by_key = {}
+        by_schema = {}
+        for item_name in sorted(mod_items.keys()):
+            if not self._is_substantial_modification(item_name, mod_items[item_name], renamed_map, 'schemas'):
+                continue
+            impacts = self.tracer.get_impacted_endpoints(renamed_map.get(item_name, item_name))
+            if not impacts:
+                continue
+            key = frozenset((i['method'], i['path'], i['context']) for i in impacts)
+            group = groups_by_key.get(key)
+            if group is None:
+                group = {'impacts': impacts, 'schemas': []}
+                groups_by_key[key] = group
+            group['schemas'].append(renamed_map.get(item_name, item_name))
+            by_schema[item_name] = group
+
+        # Largest sets first, ties by first schema name
+        groups = sorted(groups_by_key.values(), key=lambda g: (-len(g['impacts']), g['schemas'][0]))
+        for i, group in enumerate(groups, 1):
+            group['title'] = f"Endpoint Set {i}"
+            group['bookmark'] = f"_AffectedEndpoints{i}"
+
+        self._endpoint_groups = {'groups': groups, 'by_schema': by_schema}
+        return self._endpoint_groups
+
+    def _add_affected_endpoints_appendix(self):
+        if not self.group_affected_endpoints:
+            return
+        groups = self._affected_endpoint_groups()['groups']
+        if not groups:
+            return
+
+        self.doc.add_heading('Appendix: Affected Endpoints', 1)
+        self.doc.add_paragraph('Modified schemas that affect the same set of endpoints share a single table below.')
+
+        for i, group in enumerate(groups, 1):
+            h = self.doc.add_heading(group['title'], 3)
+            self._add_bookmark(h, group['bookmark'], i)
+
+            p = self.doc.add_paragraph()
+            p.paragraph_format.left_indent = Inches(0.25)
+            p.add_run(f"{len(group['impacts'])} endpoints, used by: ").italic = True
+            p.add_run(', '.join(group['schemas'])).bold = True
+
+            self._add_affected_endpoints_table(group['impacts'])
+            self.doc.add_paragraph().paragraph_format.space_after = Pt(8)
+            self._flush_section()
+
+    def _add_bookmark(self, paragraph, name, bookmark_id):
+        start = OxmlElement('w:bookmarkStart')
+        start.set(qn('w:id'), str(bookmark_id))
+        start.set(qn('w:name'), name)
+        end = OxmlElement('w:bookmarkEnd')
+        end.set(qn('w:id'), str(bookmark_id))
+        # Wrap the paragraph content, after its properties
+        pPr = paragraph._p.pPr
+        if pPr is not None:
+            pPr.addnext(start)
+        else:
+            paragraph._p.insert(0, start)
+        paragraph._p.append(end)
+
+    def _add_internal_link(self, paragraph, text, anchor):
+        hyperlink = OxmlElement('w:hyperlink')
+        hyperlink.set(qn('w:anchor'), anchor)
+        hyperlink.set(qn('w:history'), '1')
+
+        run = OxmlElement('w:r')
+        rPr = OxmlElement('w:rPr')
+        color = OxmlElement('w:color')
+        color.set(qn('w:val'), '0563C1')
+        rPr.append(color)
+        u = OxmlElement('w:u')
+        u.set(qn('w:val'), 'single')
+        rPr.append(u)
+        run.append(rPr)
+        t = OxmlElement('w:t')
+        t.text = text
+        run.append(t)
+        hyperlink.append(run)
+        paragraph._p.append(hyperlink)
 
     def _render_rich_diff(self, p_old, p_new, text_old, text_new):
         """Renders character-level diff with shading (50% lighter colors) and robust opcode merging."""
@@ -1974,6 +2022,16 @@ class AnalyticDocxGenerator:
             elif tag == 'replace':
                 render_word_diff_inline(p, txt_o, txt_n)
 
+    def _add_member_change_runs(self, p_old, p_new, key, change):
+        # enum / required: the removed members go in the Old cell, the added ones in the New cell
+        import json
+        if change['removed']:
+            p_old.add_run(f"{key} removed: {json.dumps(change['removed'], default=json_default)}\n")
+        if change['added']:
+            p_new.add_run(f"{key} added: {json.dumps(change['added'], default=json_default)}\n")
+        if change['order_changed']:
+            p_new.add_run(f"{key}: order changed\n")
+
     def _format_schema_summary(self, schema):
         if '$ref' in schema:
             return schema['$ref']
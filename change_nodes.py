@@ -0,0 +1,173 @@
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any
+
+from comparator import DiffResult
+
+# getattr default for unset slots
+_MISSING = object()
+
+class ChangeNode(MutableMapping):
+    """
+    Base class of the compact change nodes: a fixed set of fields stored in slots,
+    exposed through the same mapping interface as the dicts the comparator builds
+    (node['old'], 'new' in node, node.get('modified'), ...), plus attribute access.
+
+    A field that was not in the source dict is absent from the mapping, exactly like
+    a missing dict key. Keys outside the fields still work and go to a side dict.
+    """
+    __slots__ = ('_extra',)
+    _fields = ()
+
+    def __init__(self, data=None, **kwargs):
+        # Absent fields are left unset, so attribute access raises AttributeError like a missing key
+        self._extra = None
+        if data:
+            for k, v in data.items():
+                self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._fields:
+            object.__setattr__(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._fields and hasattr(self, key):
+            object.__delattr__(self, key)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self._fields:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for field in self._fields:
+            if hasattr(self, field):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        # Rebuilt from its items: unset slots and the side dict need no special state
+        return (type(self), (dict(self.items()),))
+
+    def copy(self):
+        return type(self)(self)
+
+class ValueChange(ChangeNode):
+    """A scalar or subtree that changed: {'old': ..., 'new': ...}."""
+    __slots__ = ('old', 'new')
+    _fields = ('old', 'new')
+
+class CollectionChange(ChangeNode):
+    """Added, removed and modified members of a keyed collection (properties, parameters, responses...)."""
+    __slots__ = ('new', 'removed', 'modified')
+    _fields = ('new', 'removed', 'modified')
+
+class OperationsChange(ChangeNode):
+    """Operations added, removed and modified on a path."""
+    __slots__ = ('new_ops', 'removed_ops', 'modified_ops')
+    _fields = ('new_ops', 'removed_ops', 'modified_ops')
+
+class CombinatorChange(ChangeNode):
+    """Sub-schemas added to and removed from allOf/anyOf/oneOf."""
+    __slots__ = ('added', 'removed')
+    _fields = ('added', 'removed')
+
+class MemberChange(ChangeNode):
+    """Members added to and removed from an enum or required list, and whether the kept ones moved."""
+    __slots__ = ('added', 'removed', 'order_changed')
+    _fields = ('added', 'removed', 'order_changed')
+
+class PayloadChange(ChangeNode):
+    """JSON Pointer-level changes of an example payload or encoding map (payload_diff.diff_payload)."""
+    __slots__ = ('changes',)
+    _fields = ('changes',)
+
+class RenameInfo(ChangeNode):
+    """The '__rename_info__' annotation of a renamed component."""
+    __slots__ = ('new_name', 'status')
+    _fields = ('new_name', 'status')
+
+# Shapes tried in order; a dict becomes the first node whose fields cover its keys
+_NODE_TYPES = (
+    (ValueChange, frozenset(ValueChange._fields), 'old'),
+    (CombinatorChange, frozenset(CombinatorChange._fields), 'added'),
+    (MemberChange, frozenset(MemberChange._fields), 'order_changed'),
+    (PayloadChange, frozenset(PayloadChange._fields), 'changes'),
+    (RenameInfo, frozenset(RenameInfo._fields), 'new_name'),
+    (OperationsChange, frozenset(OperationsChange._fields), None),
+    (CollectionChange, frozenset(CollectionChange._fields), None),
+)
+
+def compact_diff(diff: DiffResult) -> DiffResult:
+    """
+    Returns a DiffResult whose change dicts are replaced by slotted ChangeNodes and whose
+    keys and name lists use interned strings. Values taken from the specs (old/new values,
+    added/removed members) are shared, not copied.
+    Consumers must test for collections.abc.Mapping rather than dict.
+    """
+    result = DiffResult()
+    for field in DiffResult.FIELDS:
+        setattr(result, field, _compact(getattr(diff, field)))
+    return result
+
+def _compact(value):
+    if isinstance(value, dict):
+        if value:
+            keys = value.keys()
+            for node_type, fields, required in _NODE_TYPES:
+                if keys <= fields and (required is None or required in keys):
+                    return _compact_node(node_type, value)
+        return {_intern(k): _compact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern(v) for v in value]
+    return value
+
+def _compact_node(node_type, value):
+    node = node_type()
+    for k, v in value.items():
+        if k in ('modified', 'modified_ops') and isinstance(v, dict):
+            # Keyed by member name, each value is itself a diff
+            v = {_intern(name): _compact(sub) for name, sub in v.items()}
+        elif node_type is ValueChange or node_type is CombinatorChange or node_type is PayloadChange:
+            pass # Spec values, shared as-is
+        elif isinstance(v, list):
+            v = [_intern(x) for x in v]
+        else:
+            v = _intern(v)
+        object.__setattr__(node, k, v)
+    return node
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+def json_default(value: Any):
+    """json.dumps default= hook that serializes ChangeNodes like the dicts they replace."""
+    if isinstance(value, Mapping):
+        return dict(value.items())
+    return str(value)
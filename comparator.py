@@ -1,7 +1,16 @@
 import yaml
-from typing import Any, Dict, List, Optional, Union
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from payload_diff import diff_payload
+from ref_index import ref_name, spec_ref_index
 
 class DiffResult:
+    FIELDS = ('info_changes', 'new_paths', 'removed_paths', 'modified_paths', 'new_components',
+              'removed_components', 'modified_components', 'renamed_components', 'tags_changes', 'servers_changes')
+
     def __init__(self):
         self.info_changes = {}
         self.new_paths = []
@@ -14,13 +23,53 @@ class DiffResult:
         self.tags_changes = {}
         self.servers_changes = {}
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DiffResult':
+        result = cls()
+        for field in cls.FIELDS:
+            if field in data:
+                setattr(result, field, data[field])
+        return result
+
 def load_yaml(file_path: str) -> Dict[str, Any]:
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    # JSON files take the JSON parsers' fast path (see spec_source.parse_document)
+    from spec_source import parse_document, read_file
+    return parse_document(read_file(file_path), file_path)
 
 import os
 
-def compare_specs(old_spec: Dict[str, Any], new_spec: Dict[str, Any], debug_mode: bool = False) -> DiffResult:
+def compare_specs(old_spec: Dict[str, Any], new_spec: Dict[str, Any], debug_mode: bool = False, compact: bool = False,
+                  lazy: bool = False, summary: bool = False, scope=None) -> Union[DiffResult, Dict[str, Any]]:
+    """
+    Compares two parsed specs. With compact=True the result uses slotted change nodes
+    (see change_nodes) instead of plain dicts, which takes much less memory on large diffs.
+    With lazy=True, modified_paths and modified_components[type] only diff an entry when it
+    is accessed (see lazy_diff); debug_mode is ignored then.
+    With summary=True, returns only the Change Matrix counts as a JSON-ready dict (see summary).
+    A scope (scope.ScopeFilter) restricts both specs before anything is compared; callers that
+    also render reports should apply scope.scope_specs themselves and pass the views to both.
+    old_spec can also be a manifest.SpecManifest, which loads the full old spec only when
+    entries differ (see manifest.compare_manifest).
+    """
+    if not isinstance(old_spec, dict):
+        from manifest import SpecManifest, compare_manifest
+        if isinstance(old_spec, SpecManifest):
+            if not scope and not debug_mode:
+                return compare_manifest(old_spec, new_spec, summary=summary, lazy=lazy, compact=compact)
+            old_spec = old_spec.load_spec()
+    if scope:
+        from scope import scope_specs
+        old_spec, new_spec = scope_specs(old_spec, new_spec, scope)
+    if summary:
+        from summary import summarize_specs
+        return summarize_specs(old_spec, new_spec)
+    if lazy:
+        from lazy_diff import lazy_compare_specs
+        return lazy_compare_specs(old_spec, new_spec, compact=compact)
+
     # DEBUG LOGGING
     if debug_mode:
         log_dir = "logs"
@@ -71,6 +120,137 @@ def compare_specs(old_spec: Dict[str, Any], new_spec: Dict[str, Any], debug_mode
             f.write(f"Removed Schemas: {len(result.removed_components.get('schemas', []))}\n")
             f.write(f"Renamed Schemas: {len(result.renamed_components.get('schemas', {}))}\n")
 
+    if compact:
+        from change_nodes import compact_diff
+        result = compact_diff(result)
+
+    return result
+
+@dataclass
+class ChangeEvent:
+    """
+    One change found by iter_changes.
+    pointer is the JSON pointer of the changed entry (e.g. /paths/~1users, /components/schemas/User).
+    kind is 'added', 'removed', 'modified' or 'renamed' (pointer is then the old name).
+    old/new are the entry's values in each spec; detail is its diff subtree, shaped like the
+    entries of DiffResult (e.g. modified_paths[path]).
+    """
+    pointer: str
+    kind: str
+    old: Any = None
+    new: Any = None
+    detail: Any = None
+
+def json_pointer(*segments) -> str:
+    return '/' + '/'.join(str(s).replace('~', '~0').replace('/', '~1') for s in segments)
+
+def split_json_pointer(pointer: str) -> List[str]:
+    return [s.replace('~1', '/').replace('~0', '~') for s in pointer.split('/')[1:]]
+
+def iter_changes(old_spec: Dict[str, Any], new_spec: Dict[str, Any]):
+    """
+    Yields ChangeEvents while walking the specs, instead of returning a whole DiffResult.
+    Info, tags, servers and paths are yielded as soon as each entry is compared.
+    Components are yielded per type once rename detection has run, since a rename
+    can only be told apart from a removal plus an addition after all of them are known.
+    assemble_diff(iter_changes(a, b)) holds the same changes as compare_specs(a, b).
+    """
+    old_info = old_spec.get('info', {})
+    new_info = new_spec.get('info', {})
+    for key in ['title', 'version', 'description', 'termsOfService', 'contact', 'license']:
+        old_val = old_info.get(key)
+        new_val = new_info.get(key)
+        if not _is_effectively_equal(old_val, new_val):
+            yield ChangeEvent(json_pointer('info', key), 'modified', old_val, new_val, {'old': old_val, 'new': new_val})
+
+    old_paths = old_spec.get('paths', {})
+    new_paths = new_spec.get('paths', {})
+    for path, item in old_paths.items():
+        if path not in new_paths:
+            yield ChangeEvent(json_pointer('paths', path), 'removed', old=item)
+    for path, item in new_paths.items():
+        if path not in old_paths:
+            yield ChangeEvent(json_pointer('paths', path), 'added', new=item)
+        else:
+            path_diff = _compare_path_item(old_paths[path], item)
+            if path_diff:
+                yield ChangeEvent(json_pointer('paths', path), 'modified', old_paths[path], item, path_diff)
+
+    for section, key in (('tags', 'name'), ('servers', 'url')):
+        old_t = {t[key]: t for t in old_spec.get(section, [])}
+        new_t = {t[key]: t for t in new_spec.get(section, [])}
+        for name, value in old_t.items():
+            if name not in new_t:
+                yield ChangeEvent(json_pointer(section, name), 'removed', old=value)
+        for name, value in new_t.items():
+            if name not in old_t:
+                yield ChangeEvent(json_pointer(section, name), 'added', new=value)
+            elif old_t[name] != value:
+                yield ChangeEvent(json_pointer(section, name), 'modified', old_t[name], value, {'old': old_t[name], 'new': value})
+
+    # Components need the whole picture for rename detection
+    result = DiffResult()
+    old_comps = old_spec.get('components', {})
+    new_comps = new_spec.get('components', {})
+    _compare_components(old_comps, new_comps, result)
+    _detect_renamed_components(result, old_spec, new_spec)
+
+    for comp_type in result.modified_components.keys() | result.new_components.keys() | result.removed_components.keys():
+        old_items = old_comps.get(comp_type, {})
+        new_items = new_comps.get(comp_type, {})
+        for name in result.removed_components.get(comp_type, []):
+            yield ChangeEvent(json_pointer('components', comp_type, name), 'removed', old=old_items.get(name))
+        for name in result.new_components.get(comp_type, []):
+            yield ChangeEvent(json_pointer('components', comp_type, name), 'added', new=new_items.get(name))
+        for name, item_diff in result.modified_components.get(comp_type, {}).items():
+            rename = item_diff.get('__rename_info__')
+            if rename:
+                yield ChangeEvent(json_pointer('components', comp_type, name), 'renamed',
+                                  old_items.get(name), new_items.get(rename['new_name']), item_diff)
+            else:
+                yield ChangeEvent(json_pointer('components', comp_type, name), 'modified',
+                                  old_items.get(name), new_items.get(name), item_diff)
+
+def assemble_diff(events, result: Optional[DiffResult] = None) -> DiffResult:
+    """Builds (or extends) a DiffResult from ChangeEvents, e.g. from iter_changes."""
+    if result is None:
+        result = DiffResult()
+    for event in events:
+        segments = split_json_pointer(event.pointer)
+        section = segments[0]
+        if section == 'info':
+            result.info_changes[segments[1]] = event.detail
+        elif section == 'paths':
+            path = segments[1]
+            if event.kind == 'added':
+                result.new_paths.append(path)
+            elif event.kind == 'removed':
+                result.removed_paths.append(path)
+            else:
+                result.modified_paths[path] = event.detail
+        elif section in ('tags', 'servers'):
+            changes = result.tags_changes if section == 'tags' else result.servers_changes
+            name = segments[1]
+            if event.kind == 'added':
+                changes.setdefault('new', []).append(name)
+            elif event.kind == 'removed':
+                changes.setdefault('removed', []).append(name)
+            else:
+                changes.setdefault('modified', {})[name] = event.detail
+        elif section == 'components':
+            comp_type, name = segments[1], segments[2]
+            # Same shape as _compare_components: a touched type has all three entries
+            new_list = result.new_components.setdefault(comp_type, [])
+            removed_list = result.removed_components.setdefault(comp_type, [])
+            modified = result.modified_components.setdefault(comp_type, {})
+            if event.kind == 'added':
+                new_list.append(name)
+            elif event.kind == 'removed':
+                removed_list.append(name)
+            else:
+                modified[name] = event.detail
+                if event.kind == 'renamed':
+                    result.renamed_components.setdefault(comp_type, {})[name] = event.detail['__rename_info__']['new_name']
     return result
 
 def _dump_debug_trees(result, old_spec, new_spec):
@@ -80,42 +260,21 @@ def _dump_debug_trees(result, old_spec, new_spec):
     """
     def build_parent_map(spec):
         parents = {} # child_name -> list of (parent_name, type)
-        
-        def register(child_ref, parent_name, parent_type):
-            if child_ref.startswith('#/components/schemas/'):
-                child = child_ref.split('/')[-1]
-                if child not in parents: parents[child] = []
-                parents[child].append((parent_name, parent_type))
-
-        def walk(data, context_name, context_type):
-            if isinstance(data, dict):
-                if '$ref' in data and isinstance(data['$ref'], str):
-                    register(data['$ref'], context_name, context_type)
-                
-                for k, v in data.items():
-                    new_name = context_name
-                    new_type = context_type
-                    
-                    if context_type == 'ROOT':
-                        if k == 'paths': 
-                            new_type = 'PATHS_ROOT'
-                        elif k == 'components': 
-                            new_type = 'COMPONENTS_ROOT'
-                    elif context_type == 'COMPONENTS_ROOT' and k == 'schemas':
-                        new_type = 'SCHEMAS_ROOT'
-                    elif context_type == 'SCHEMAS_ROOT':
-                        new_name = k
-                        new_type = 'SCHEMA'
-                    elif context_type == 'PATHS_ROOT':
-                        new_name = k
-                        new_type = 'PATH'
-                    
-                    walk(v, new_name, new_type)
-            elif isinstance(data, list):
-                for item in data:
-                    walk(item, context_name, context_type)
-
-        walk(spec, 'ROOT', 'ROOT')
+        for ref, pointers in spec_ref_index(spec).uses.items():
+            if not ref.startswith('#/components/schemas/'):
+                continue
+            entries = parents.setdefault(ref_name(ref), [])
+            for pointer in pointers:
+                # The path or schema holding the ref
+                segments = split_json_pointer(pointer)
+                if len(segments) >= 2 and segments[0] == 'paths':
+                    entries.append((segments[1], 'PATH'))
+                elif len(segments) >= 3 and segments[:2] == ['components', 'schemas']:
+                    entries.append((segments[2], 'SCHEMA'))
+                elif segments[:1] == ['components']:
+                    entries.append(('ROOT', 'COMPONENTS_ROOT'))
+                else:
+                    entries.append(('ROOT', 'ROOT'))
         return parents
 
     old_parents = build_parent_map(old_spec)
@@ -186,17 +345,31 @@ def _is_effectively_equal(v1: Any, v2: Any) -> bool:
     if v1 == v2:
         return True
     if isinstance(v1, str) and isinstance(v2, str):
-        # Aggressive normalization:
-        # 1. Normalize line endings to \n
-        # 2. Strip trailing whitespace from EACH line
-        # 3. Strip leading/trailing newlines/whitespace from the whole block
-        def normalize(s):
-            lines = s.replace('\r\n', '\n').split('\n')
-            return "\n".join([line.rstrip() for line in lines]).strip()
-            
-        return normalize(v1) == normalize(v2)
+        return _normalize_text(v1) == _normalize_text(v2)
     return False
 
+@lru_cache(maxsize=4096)
+def _normalize_text(s: str) -> str:
+    # Aggressive normalization:
+    # 1. Normalize line endings to \n
+    # 2. Strip trailing whitespace from EACH line
+    # 3. Strip leading/trailing newlines/whitespace from the whole block
+    lines = s.replace('\r\n', '\n').split('\n')
+    return "\n".join([line.rstrip() for line in lines]).strip()
+
+def _same_content(v1: Any, v2: Any) -> bool:
+    """
+    Fast check that two subtrees cannot differ: the same object, or equal under == (which
+    runs in C). Every comparator treats ==-equal values as unchanged, so callers can skip
+    diffing them. Structures too deep (or cyclic) for == count as possibly different.
+    """
+    if v1 is v2:
+        return True
+    try:
+        return v1 == v2
+    except RecursionError:
+        return False
+
 def _compare_extensions(old_data: Dict, new_data: Dict) -> Dict:
     """Finds changes in keys starting with x-"""
     diff = {}
@@ -226,6 +399,8 @@ def _compare_paths(old_paths: Dict, new_paths: Dict, result: DiffResult):
     result.removed_paths = list(old_keys - new_keys)
     
     for path in old_keys & new_keys:
+        if _same_content(old_paths[path], new_paths[path]):
+            continue
         path_diff = _compare_path_item(old_paths[path], new_paths[path])
         if path_diff:
             result.modified_paths[path] = path_diff
@@ -240,7 +415,7 @@ def _compare_path_item(old_item: Dict, new_item: Dict) -> Dict:
             diff.setdefault('removed_ops', []).append(op)
         elif op not in old_item and op in new_item:
             diff.setdefault('new_ops', []).append(op)
-        elif op in old_item and op in new_item:
+        elif op in old_item and op in new_item and not _same_content(old_item[op], new_item[op]):
             op_diff = _compare_operation(old_item[op], new_item[op])
             if op_diff:
                 diff.setdefault('modified_ops', {})[op] = op_diff
@@ -352,11 +527,11 @@ def _compare_media_type(old_mt: Dict, new_mt: Dict) -> Dict:
         diff['examples'] = exs_diff
     elif not _is_effectively_equal(old_mt.get('example'), new_mt.get('example')):
         # Fallback to single 'example' field
-        diff['example'] = {'old': old_mt.get('example'), 'new': new_mt.get('example')}
+        diff['example'] = diff_payload(old_mt.get('example'), new_mt.get('example'))
         
     # Compare Encoding
     if not _is_effectively_equal(old_mt.get('encoding'), new_mt.get('encoding')):
-        diff['encoding'] = {'old': old_mt.get('encoding'), 'new': new_mt.get('encoding')}
+        diff['encoding'] = diff_payload(old_mt.get('encoding'), new_mt.get('encoding'))
 
     # Custom Extensions
     ext_diff = _compare_extensions(old_mt, new_mt)
@@ -376,15 +551,17 @@ def _compare_dict_items(old_dict: Dict, new_dict: Dict, item_comparator) -> Dict
     if removed_items: diff['removed'] = removed_items
     
     for key in old_keys & new_keys:
+        if _same_content(old_dict[key], new_dict[key]):
+            continue
         item_diff = item_comparator(old_dict[key], new_dict[key])
         if item_diff:
             diff.setdefault('modified', {})[key] = item_diff
             
     return diff
 
-def _compare_components(old_comps: Dict, new_comps: Dict, result: DiffResult):
-    # Compare all component types
-    component_types = {
+def _component_comparators() -> Dict[str, Any]:
+    # Item comparator of every component type, in comparison order
+    return {
         'schemas': _compare_schema,
         'parameters': _compare_parameter,
         'responses': _compare_response,
@@ -396,7 +573,9 @@ def _compare_components(old_comps: Dict, new_comps: Dict, result: DiffResult):
         'examples': _compare_example
     }
 
-    for comp_type, comparator in component_types.items():
+def _compare_components(old_comps: Dict, new_comps: Dict, result: DiffResult):
+    # Compare all component types
+    for comp_type, comparator in _component_comparators().items():
         old_items = old_comps.get(comp_type, {})
         new_items = new_comps.get(comp_type, {})
         
@@ -406,33 +585,38 @@ def _compare_components(old_comps: Dict, new_comps: Dict, result: DiffResult):
             result.removed_components[comp_type] = diff.get('removed', [])
             result.modified_components[comp_type] = diff.get('modified', {})
 
+# Component types rename detection runs on, in order
+RENAME_COMPONENT_TYPES = ['schemas', 'parameters', 'responses', 'headers', 'securitySchemes', 'examples', 'links', 'callbacks']
+
 def _detect_renamed_components(result: DiffResult, old_spec: Dict, new_spec: Dict):
     """
     Generalized Rename Detection for all component types.
     """
-    comp_types = ['schemas', 'parameters', 'responses', 'headers', 'securitySchemes', 'examples', 'links', 'callbacks']
-    
-    for c_type in comp_types:
-        if c_type == 'schemas':
-            # Schemas use the complex iterative propagation logic
-            _detect_renamed_type_logic(result, old_spec, new_spec, c_type, _compare_schema, _is_deeply_identical, use_propagation=True)
-        elif c_type == 'examples':
-            # Examples use content-based matching (ignoring summary if it matches key)
-            def is_ex_identical(o, n):
-                # Ignore summary for "Rename" identification if everything else matches
-                for k in ['description', 'value', 'externalValue']:
-                    if not _is_effectively_equal(o.get(k), n.get(k)): return False
-                return True
-            _detect_renamed_type_logic(result, old_spec, new_spec, c_type, _compare_example, is_ex_identical, use_propagation=False)
-        else:
-            # Generic matching for others
-            # The comparator function for a type 'X' is typically '_compare_X'.
-            # For 'parameters', it's '_compare_parameter'. For 'responses', '_compare_response', etc.
-            # The component type names are plural, so we need to remove the 's' for the function name.
-            # Special case for 'requestBodies' -> '_compare_request_body'
-            comparator_name = f'_compare_{c_type[:-1]}' if c_type != 'requestBodies' else '_compare_request_body'
-            comparator = globals().get(comparator_name, lambda o,n: {})
-            _detect_renamed_type_logic(result, old_spec, new_spec, c_type, comparator, lambda o,n: o == n, use_propagation=False)
+    for c_type in RENAME_COMPONENT_TYPES:
+        _detect_renamed_type(result, old_spec, new_spec, c_type)
+
+def _detect_renamed_type(result: DiffResult, old_spec: Dict, new_spec: Dict, c_type: str):
+    if c_type == 'schemas':
+        # Schemas use the complex iterative propagation logic
+        is_identical = lambda o, n: _is_deeply_identical(o, n, old_spec, new_spec)
+        _detect_renamed_type_logic(result, old_spec, new_spec, c_type, _compare_schema, is_identical, use_propagation=True)
+    elif c_type == 'examples':
+        # Examples use content-based matching (ignoring summary if it matches key)
+        def is_ex_identical(o, n):
+            # Ignore summary for "Rename" identification if everything else matches
+            for k in ['description', 'value', 'externalValue']:
+                if not _is_effectively_equal(o.get(k), n.get(k)): return False
+            return True
+        _detect_renamed_type_logic(result, old_spec, new_spec, c_type, _compare_example, is_ex_identical, use_propagation=False)
+    else:
+        # Generic matching for others
+        # The comparator function for a type 'X' is typically '_compare_X'.
+        # For 'parameters', it's '_compare_parameter'. For 'responses', '_compare_response', etc.
+        # The component type names are plural, so we need to remove the 's' for the function name.
+        # Special case for 'requestBodies' -> '_compare_request_body'
+        comparator_name = f'_compare_{c_type[:-1]}' if c_type != 'requestBodies' else '_compare_request_body'
+        comparator = globals().get(comparator_name, lambda o,n: {})
+        _detect_renamed_type_logic(result, old_spec, new_spec, c_type, comparator, lambda o,n: o == n, use_propagation=False)
 
 def _detect_renamed_type_logic(result: DiffResult, old_spec: Dict, new_spec: Dict, comp_type: str, item_comparator, content_matcher, use_propagation=False):
     removed = set(result.removed_components.get(comp_type, []))
@@ -445,6 +629,7 @@ def _detect_renamed_type_logic(result: DiffResult, old_spec: Dict, new_spec: Dic
         return spec.get('components', {}).get(comp_type, {}).get(name)
 
     candidates = {} # old_name -> {new_name: count/score}
+    votes_collected = not use_propagation
 
     if use_propagation:
         # Propagation Phase (Schemas specific)
@@ -452,18 +637,19 @@ def _detect_renamed_type_logic(result: DiffResult, old_spec: Dict, new_spec: Dic
             if old_ref and new_ref and isinstance(old_ref, str) and isinstance(new_ref, str):
                 prefix = f'#/components/{comp_type}/'
                 if old_ref.startswith(prefix) and new_ref.startswith(prefix):
-                    old_name = old_ref.split('/')[-1]
-                    new_name = new_ref.split('/')[-1]
+                    old_name = ref_name(old_ref)
+                    new_name = ref_name(new_ref)
                     if old_name in removed and new_name in new:
-                        candidates.setdefault(old_name, {})[new_name] = candidates[old_name].get(new_name, 0) + 1
+                        votes = candidates.setdefault(old_name, {})
+                        votes[new_name] = votes.get(new_name, 0) + 1
 
         # Seed from endpoints/other modified components
         def _scan_refs(data, visited=None):
             if visited is None: visited = set()
             if id(data) in visited: return
             visited.add(id(data))
-            if isinstance(data, dict):
-                if '$ref' in data and isinstance(data['$ref'], dict) and 'old' in data['$ref'] and 'new' in data['$ref']:
+            if isinstance(data, Mapping):
+                if '$ref' in data and isinstance(data['$ref'], Mapping) and 'old' in data['$ref'] and 'new' in data['$ref']:
                     _register_candidate(data['$ref']['old'], data['$ref']['new'])
                 
                 # Check for 1-to-1 replacement in added/removed lists (e.g. allOf/oneOf changes)
@@ -483,8 +669,11 @@ def _detect_renamed_type_logic(result: DiffResult, old_spec: Dict, new_spec: Dic
             elif isinstance(data, list):
                 for i in data: _scan_refs(i, visited)
         
-        _scan_refs(result.modified_paths)
-        _scan_refs(result.modified_components)
+        def _collect_votes():
+            # Votes only break ties below, and the scan walks every modified entry
+            # (which a lazy diff would otherwise compute just for this)
+            _scan_refs(result.modified_paths)
+            _scan_refs(result.modified_components)
     else:
         # Content-Based Candidate Generation (Greedy matching for non-propagating types)
         for o_name in removed:
@@ -513,6 +702,9 @@ def _detect_renamed_type_logic(result: DiffResult, old_spec: Dict, new_spec: Dic
             final_renames[o_name] = (identical_targets[0], "Rename")
         elif len(identical_targets) > 1:
             # Ambiguous - use candidates (votes) or lexicographical
+            if not votes_collected:
+                _collect_votes()
+                votes_collected = True
             best_match = None
             max_votes = -1
             for t in identical_targets:
@@ -575,94 +767,82 @@ def _detect_renamed_type_logic(result: DiffResult, old_spec: Dict, new_spec: Dic
         result.new_components[comp_type] = result_new_list
         result.removed_components[comp_type] = result_removed_list
 
-def _is_deeply_identical(old_s, new_s, visited=None, debug=False):
-    old_s = _unwrap_schema(old_s)
-    new_s = _unwrap_schema(new_s)
-    
-    if visited is None: visited = set()
-    
-    pair_id = (id(old_s), id(new_s))
-    if pair_id in visited:
-        return True
-    visited.add(pair_id)
-
-    # 1. Compare Constraints
-    constraints = ['type', 'format', 'minLength', 'maxLength', 'pattern', 'enum', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum', 'minItems', 'maxItems', 'uniqueItems', 'minProperties', 'maxProperties', 'required', 'nullable', 'readOnly', 'writeOnly', 'deprecated']
-    for c in constraints:
-        if not _is_effectively_equal(old_s.get(c), new_s.get(c)):
-            if debug: print(f"    Diff in constraint '{c}': {old_s.get(c)} != {new_s.get(c)}")
-            return False
-
-    # 2. Compare Properties
-    old_props = old_s.get('properties', {})
-    new_props = new_s.get('properties', {})
-    if set(old_props.keys()) != set(new_props.keys()):
-        if debug: print(f"    Diff in properties keys: {set(old_props.keys())} != {set(new_props.keys())}")
-        return False
-    for k in old_props:
-        if not _is_deeply_identical(old_props[k], new_props[k], visited, debug):
-            if debug: print(f"    Diff in property '{k}'")
-            return False
+def _is_deeply_identical(old_s, new_s, old_spec=None, new_spec=None, debug=False):
+    """
+    True when two schemas match in everything but descriptions and extensions, following
+    $refs that differ into old_spec / new_spec (the check behind schema rename detection).
+    Walks the schemas with an explicit work stack; a pair already checked (or being checked)
+    is not checked again, which also ends cycles.
+    """
+    stack = [(old_s, new_s)]
+    visited = set()
+    while stack:
+        old_s, new_s = stack.pop()
+        old_s = _unwrap_schema(old_s)
+        new_s = _unwrap_schema(new_s)
+
+        pair_id = (id(old_s), id(new_s))
+        if pair_id in visited or old_s is new_s:
+            continue
+        visited.add(pair_id)
+
+        # 1. Compare Constraints
+        for c in SCHEMA_CONSTRAINTS:
+            if c != 'description' and not _is_effectively_equal(old_s.get(c), new_s.get(c)):
+                if debug: print(f"    Diff in constraint '{c}': {old_s.get(c)} != {new_s.get(c)}")
+                return False
 
-    # 3. Compare Items
-    if 'items' in old_s or 'items' in new_s:
-        if 'items' not in old_s or 'items' not in new_s:
-            if debug: print("    Diff in items existence")
-            return False
-        if not _is_deeply_identical(old_s['items'], new_s['items'], visited, debug):
-            if debug: print("    Diff in items content")
+        # 2. Compare Properties
+        old_props = old_s.get('properties', {})
+        new_props = new_s.get('properties', {})
+        if set(old_props.keys()) != set(new_props.keys()):
+            if debug: print(f"    Diff in properties keys: {set(old_props.keys())} != {set(new_props.keys())}")
             return False
+        stack.extend((old_props[k], new_props[k]) for k in old_props)
 
-    # 4. Compare Combinators
-    for k in ['allOf', 'anyOf', 'oneOf']:
-        if k in old_s or k in new_s:
-            if k not in old_s or k not in new_s:
-                if debug: print(f"    Diff in combinator '{k}' existence")
+        # 3. Compare Items
+        if 'items' in old_s or 'items' in new_s:
+            if 'items' not in old_s or 'items' not in new_s:
+                if debug: print("    Diff in items existence")
                 return False
-            ol = old_s[k]
-            nl = new_s[k]
-            if len(ol) != len(nl):
-                if debug: print(f"    Diff in combinator '{k}' length")
-                return False
-            for i in range(len(ol)):
-                if not _is_deeply_identical(ol[i], nl[i], visited, debug):
-                    if debug: print(f"    Diff in combinator '{k}' item {i}")
-                    return False
-
-    # 5. Compare $ref
-    old_ref = old_s.get('$ref')
-    new_ref = new_s.get('$ref')
-    
-    if old_ref and new_ref:
-        if old_ref == new_ref:
-            return True
-        
-        # This part needs to be generalized to _get_comp for the specific comp_type
-        # For schemas, it would be:
-        if old_ref.startswith('#/components/schemas/'):
-            old_target_name = old_ref.split('/')[-1]
-            old_target = old_spec.get('components', {}).get('schemas', {}).get(old_target_name)
-        else:
-            old_target = None
-            
-        if new_ref.startswith('#/components/schemas/'):
-            new_target_name = new_ref.split('/')[-1]
-            new_target = new_spec.get('components', {}).get('schemas', {}).get(new_target_name)
-        else:
-            new_target = None
+            stack.append((old_s['items'], new_s['items']))
 
-        if old_target and new_target:
-            if debug: print(f"    Recursing into ref: {old_ref} -> {new_ref}")
-            return _is_deeply_identical(old_target, new_target, visited, debug)
-        else:
-            if debug: print(f"    Ref resolution failed: {old_ref} vs {new_ref}")
-            return old_ref == new_ref
-    elif old_ref or new_ref:
-        if debug: print(f"    Diff in ref existence: {old_ref} vs {new_ref}")
-        return False
+        # 4. Compare Combinators
+        for k in SCHEMA_COMBINATORS:
+            if k in old_s or k in new_s:
+                if k not in old_s or k not in new_s:
+                    if debug: print(f"    Diff in combinator '{k}' existence")
+                    return False
+                if len(old_s[k]) != len(new_s[k]):
+                    if debug: print(f"    Diff in combinator '{k}' length")
+                    return False
+                stack.extend(zip(old_s[k], new_s[k]))
+
+        # 5. Compare $ref
+        old_ref = old_s.get('$ref')
+        new_ref = new_s.get('$ref')
+        if old_ref and new_ref:
+            if old_ref == new_ref:
+                continue
+            old_target = _ref_target(old_spec, old_ref)
+            new_target = _ref_target(new_spec, new_ref)
+            if old_target and new_target:
+                if debug: print(f"    Following ref: {old_ref} -> {new_ref}")
+                stack.append((old_target, new_target))
+            else:
+                if debug: print(f"    Ref resolution failed: {old_ref} vs {new_ref}")
+                return False
+        elif old_ref or new_ref:
+            if debug: print(f"    Diff in ref existence: {old_ref} vs {new_ref}")
+            return False
 
     return True
 
+def _ref_target(spec, ref):
+    if spec is None or not isinstance(ref, str) or not ref.startswith('#/components/schemas/'):
+        return None
+    return spec_ref_index(spec).resolve(ref)
+
 def _compare_header(old_h, new_h):
     # Headers are similar to parameters (minus 'in' and 'name')
     diff = {}
@@ -699,7 +879,10 @@ def _compare_example(old_e: Dict, new_e: Dict) -> Dict:
     diff = {}
     for key in ['summary', 'description', 'value', 'externalValue']:
         if not _is_effectively_equal(old_e.get(key), new_e.get(key)):
-            diff[key] = {'old': old_e.get(key), 'new': new_e.get(key)}
+            if key == 'value':
+                diff[key] = diff_payload(old_e.get(key), new_e.get(key))
+            else:
+                diff[key] = {'old': old_e.get(key), 'new': new_e.get(key)}
     
     # Custom Extensions
     ext_diff = _compare_extensions(old_e, new_e)
@@ -730,93 +913,163 @@ def _unwrap_schema(schema: Any) -> Any:
                 return _unwrap_schema(val[0])
     return schema
 
-def _compare_schema(old_schema: Dict, new_schema: Dict) -> Dict:
-    old_schema = _unwrap_schema(old_schema)
-    new_schema = _unwrap_schema(new_schema)
-    
-    diff = {}
-    # Check constraints
-    constraints = ['type', 'format', 'description', 'minLength', 'maxLength', 'pattern', 'enum', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum', 'minItems', 'maxItems', 'uniqueItems', 'minProperties', 'maxProperties', 'required', 'nullable', 'readOnly', 'writeOnly', 'deprecated']
-    
-    for c in constraints:
-        # Handle list comparison for enum and required by converting to set if order doesn't matter? 
-        # For now, strict equality
-        if not _is_effectively_equal(old_schema.get(c), new_schema.get(c)):
-             diff[c] = {'old': old_schema.get(c), 'new': new_schema.get(c)}
-
-    # Custom Extensions
-    ext_diff = _compare_extensions(old_schema, new_schema)
-    if ext_diff: diff.update(ext_diff)
-             
-    # Check $ref
-    if not _is_effectively_equal(old_schema.get('$ref'), new_schema.get('$ref')): # Changed from old_schema.get('$ref') != new_schema.get('$ref')
-        diff['$ref'] = {'old': old_schema.get('$ref'), 'new': new_schema.get('$ref')}
-        
-    # Check properties recursively
-    if 'properties' in old_schema or 'properties' in new_schema:
-        props_diff = _compare_properties(old_schema.get('properties', {}), new_schema.get('properties', {}))
-        if props_diff:
-            diff['properties'] = props_diff
-            
-    # Check items (for arrays)
-    if 'items' in old_schema or 'items' in new_schema:
-        items_diff = _compare_schema(old_schema.get('items', {}), new_schema.get('items', {}))
-        if items_diff:
-            diff['items'] = items_diff
-
-    # Check allOf, anyOf, oneOf
-    for combinator in ['allOf', 'anyOf', 'oneOf']:
-        if combinator in old_schema or combinator in new_schema:
-            old_comb = old_schema.get(combinator, [])
-            new_comb = new_schema.get(combinator, [])
-            
-            added = []
-            removed = []
-            
-            # Find added items
-            for new_item in new_comb:
-                is_new = True
-                for old_item in old_comb:
-                    # If compare returns empty dict, they are effectively equal
-                    if not _compare_schema(old_item, new_item):
-                        is_new = False
-                        break
-                if is_new:
-                    added.append(new_item)
-            
-            # Find removed items
-            for old_item in old_comb:
-                is_removed = True
-                for new_item in new_comb:
-                    if not _compare_schema(old_item, new_item):
-                        is_removed = False
-                        break
-                if is_removed:
-                    removed.append(old_item)
-            
-            if added or removed:
-                diff[combinator] = {'added': added, 'removed': removed}
-            
-            # If no adds/removes but lengths match, check for modifications in place?
-            # The set logic above handles modifications as "remove old + add new" which is technically correct for a list of options.
-            # So we don't need the index-based comparison anymore.
+SCHEMA_CONSTRAINTS = ['type', 'format', 'description', 'minLength', 'maxLength', 'pattern', 'enum', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum', 'minItems', 'maxItems', 'uniqueItems', 'minProperties', 'maxProperties', 'required', 'nullable', 'readOnly', 'writeOnly', 'deprecated']
+SCHEMA_COMBINATORS = ['allOf', 'anyOf', 'oneOf']
+# Constraints whose list values are sets of members, diffed by _compare_members
+SET_CONSTRAINTS = ('enum', 'required')
 
-    return diff
-
-def _compare_properties(old_props: Dict, new_props: Dict) -> Dict:
-    diff = {}
-    old_keys = set(old_props.keys())
-    new_keys = set(new_props.keys())
-    
-    diff['new'] = list(new_keys - old_keys)
-    diff['removed'] = list(old_keys - new_keys)
-    
-    for prop in old_keys & new_keys:
-        prop_diff = _compare_schema(old_props[prop], new_props[prop])
-        if prop_diff:
-            diff.setdefault('modified', {})[prop] = prop_diff
-            
-    if not diff['new'] and not diff['removed'] and 'modified' not in diff:
+def _compare_schema(old_schema: Dict, new_schema: Dict) -> Dict:
+    """
+    Diffs two schemas: constraints, extensions and $ref, then properties
+    ({'new', 'removed', 'modified'}), items and allOf/anyOf/oneOf ({'added', 'removed'}).
+
+    Subschemas are walked with an explicit work stack instead of recursion, so the nesting
+    depth is not bounded by the interpreter's recursion limit. Each pair gets its diff dict
+    inserted into its parent before it is visited (keeping the key order of a recursive walk)
+    and removed again when it finishes empty. A pair met again below itself (a cyclic
+    document, e.g. built with YAML aliases) compares as equal.
+    """
+    slots = {'root': {}}
+    stack = [(old_schema, new_schema, slots['root'], slots, 'root')]
+    active = set() # pairs being compared: the ancestors of the next visit
+    check_equal = True
+    while stack:
+        task = stack.pop()
+        if len(task) == 6:
+            _finish_schema_pair(task)
+            active.discard(task[5])
+            continue
+
+        old, new, diff, container, key = task
+        old = _unwrap_schema(old)
+        new = _unwrap_schema(new)
+        pair = (id(old), id(new))
+        if pair in active:
+            del container[key]
+            continue
+        if check_equal:
+            try:
+                if old is new or old == new:
+                    del container[key] # Nothing to find below
+                    continue
+            except RecursionError:
+                # Too deep (or cyclic) for ==, which would fail again at every level below
+                check_equal = False
+
+        for c in SCHEMA_CONSTRAINTS:
+            old_value = old.get(c)
+            new_value = new.get(c)
+            if old_value != new_value and not _is_effectively_equal(old_value, new_value):
+                if c in SET_CONSTRAINTS:
+                    members_diff = _compare_members(c, old_value, new_value)
+                    if members_diff:
+                        diff[c] = members_diff
+                else:
+                    diff[c] = {'old': old_value, 'new': new_value}
+
+        # Custom Extensions
+        ext_diff = _compare_extensions(old, new)
+        if ext_diff: diff.update(ext_diff)
+
+        if not _is_effectively_equal(old.get('$ref'), new.get('$ref')):
+            diff['$ref'] = {'old': old.get('$ref'), 'new': new.get('$ref')}
+
+        children = []
+        props_diff = None
+        if 'properties' in old or 'properties' in new:
+            old_props = old.get('properties', {})
+            new_props = new.get('properties', {})
+            old_keys = set(old_props.keys())
+            new_keys = set(new_props.keys())
+            modified = {}
+            props_diff = diff['properties'] = {'new': list(new_keys - old_keys), 'removed': list(old_keys - new_keys), 'modified': modified}
+            for prop in old_keys & new_keys:
+                modified[prop] = {}
+                children.append((old_props[prop], new_props[prop], modified[prop], modified, prop))
+
+        if 'items' in old or 'items' in new:
+            diff['items'] = {}
+            children.append((old.get('items', {}), new.get('items', {}), diff['items'], diff, 'items'))
+
+        # Combinator options match when their diff is empty: every old/new pair is compared
+        combinators = []
+        for combinator in SCHEMA_COMBINATORS:
+            if combinator in old or combinator in new:
+                old_comb = old.get(combinator, [])
+                new_comb = new.get(combinator, [])
+                pair_diffs = {} # (old index, new index) -> diff, removed when empty
+                for i, old_item in enumerate(old_comb):
+                    for j, new_item in enumerate(new_comb):
+                        pair_diffs[i, j] = {}
+                        children.append((old_item, new_item, pair_diffs[i, j], pair_diffs, (i, j)))
+                combinators.append((combinator, old_comb, new_comb, pair_diffs))
+
+        if props_diff is None and not children and not combinators:
+            if not diff: del container[key] # leaf: nothing to wait for
+            continue
+        active.add(pair)
+        stack.append((diff, container, key, props_diff, combinators, pair))
+        stack.extend(children)
+
+    return slots.get('root', {})
+
+def _compare_members(keyword: str, old_value: Any, new_value: Any) -> Dict:
+    """
+    Diff of a set-valued constraint (enum, required): {'added': [...], 'removed': [...],
+    'order_changed': bool} with only the members that changed, in spec order, rather than
+    both whole lists. order_changed is set when the members both lists keep appear in a
+    different order (or with different repetitions).
+    A missing 'required' counts as an empty list. A missing enum (any value allowed),
+    values that are not lists and unhashable members keep the {'old', 'new'} form.
+    """
+    old_list = old_value
+    new_list = new_value
+    if keyword == 'required':
+        old_list = [] if old_value is None else old_value
+        new_list = [] if new_value is None else new_value
+    if not isinstance(old_list, list) or not isinstance(new_list, list):
+        return {'old': old_value, 'new': new_value}
+    try:
+        old_set = set(old_list)
+        new_set = set(new_list)
+    except TypeError:
+        return {'old': old_value, 'new': new_value}
+
+    added = list(dict.fromkeys(m for m in new_list if m not in old_set))
+    removed = list(dict.fromkeys(m for m in old_list if m not in new_set))
+    order_changed = [m for m in old_list if m in new_set] != [m for m in new_list if m in old_set]
+    if not added and not removed and not order_changed:
         return {}
-        
-    return diff
+    return {'added': added, 'removed': removed, 'order_changed': order_changed}
+
+def member_changes(change: Any) -> Tuple[List, List]:
+    """(added, removed) members of an enum/required change, in either of its diff forms."""
+    if not isinstance(change, Mapping):
+        return [], []
+    if 'order_changed' in change:
+        return list(change.get('added') or []), list(change.get('removed') or [])
+    old_list = change.get('old') if isinstance(change.get('old'), list) else []
+    new_list = change.get('new') if isinstance(change.get('new'), list) else []
+    return [m for m in new_list if m not in old_list], [m for m in old_list if m not in new_list]
+
+def _finish_schema_pair(task):
+    # Runs once every child of the pair has finished
+    diff, container, key, props_diff, combinators, _ = task
+    if props_diff is not None:
+        if not props_diff['modified']:
+            del props_diff['modified']
+            if not props_diff['new'] and not props_diff['removed']:
+                del diff['properties']
+
+    for combinator, old_comb, new_comb, pair_diffs in combinators:
+        # Set semantics: an option is added (removed) when it matches none of the other side's,
+        # so a modified option shows as removed old + added new
+        added = [new_item for j, new_item in enumerate(new_comb)
+                 if all((i, j) in pair_diffs for i in range(len(old_comb)))]
+        removed = [old_item for i, old_item in enumerate(old_comb)
+                   if all((i, j) in pair_diffs for j in range(len(new_comb)))]
+        if added or removed:
+            diff[combinator] = {'added': added, 'removed': removed}
+
+    if not diff:
+        del container[key]
@@ -1,4 +1,9 @@
-from typing import Dict, List, Any, Set, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from ref_index import RefIndex, ref_name, spec_ref_index
+
+# Components a path item's $refs are followed into when tracing
+DEREFERENCED_COMPONENT_TYPES = ('requestBodies', 'responses', 'parameters')
 
 class DependencyTracer:
     """
@@ -26,33 +31,45 @@ class DependencyTracer:
 
     def _build_index(self):
         paths = self.spec.get('paths', {})
+        refs = spec_ref_index(self.spec)
         for path, path_item in paths.items():
-            for method, operation in path_item.items():
-                if method not in ['get', 'post', 'put', 'delete', 'patch', 'options', 'head', 'trace']:
-                    continue
-                
-                context_base = {'method': method.upper(), 'path': path}
-                
-                # 1. Trace Request Body
-                if 'requestBody' in operation:
-                    self._trace_content(operation['requestBody'].get('content', {}), 
-                                      {**context_base, 'context': 'Request Body'})
-
-                # 2. Trace Responses
-                responses = operation.get('responses', {})
-                for status_code, response in responses.items():
-                    self._trace_content(response.get('content', {}), 
-                                      {**context_base, 'context': f'Response {status_code}'})
-
-                # 3. Trace Parameters
-                parameters = operation.get('parameters', [])
-                # Also include path-level parameters
-                parameters.extend(path_item.get('parameters', []))
-                
-                for param in parameters:
-                    if 'schema' in param:
-                        self._trace_schema(param['schema'], 
-                                         {**context_base, 'context': f"Param '{param.get('name', '?')}'"})
+            self._index_path(path, path_item, refs)
+
+    def _index_path(self, path: str, path_item: Dict[str, Any], refs: Optional[RefIndex] = None):
+        # refs resolves request bodies, responses and parameters given as $refs to components
+        deref = (lambda obj: _deref(obj, refs)) if refs else (lambda obj: obj)
+        for method, operation in path_item.items():
+            if method not in ['get', 'post', 'put', 'delete', 'patch', 'options', 'head', 'trace']:
+                continue
+            
+            context_base = {'method': method.upper(), 'path': path}
+            
+            # 1. Trace Request Body
+            if 'requestBody' in operation:
+                self._trace_content(deref(operation['requestBody']).get('content', {}), 
+                                  {**context_base, 'context': 'Request Body'})
+
+            # 2. Trace Responses
+            responses = operation.get('responses', {})
+            for status_code, response in responses.items():
+                self._trace_content(deref(response).get('content', {}), 
+                                  {**context_base, 'context': f'Response {status_code}'})
+
+            # 3. Trace Parameters
+            # Also include path-level parameters (without extending the spec's own list)
+            parameters = operation.get('parameters', []) + path_item.get('parameters', [])
+            
+            for param in map(deref, parameters):
+                if 'schema' in param:
+                    self._trace_schema(param['schema'], 
+                                     {**context_base, 'context': f"Param '{param.get('name', '?')}'"})
+
+    @classmethod
+    def path_usages(cls, path: str, path_item: Dict[str, Any]) -> Dict[str, List[Dict[str, str]]]:
+        """Direct schema usages of a single path item (what _build_index records for it)."""
+        tracer = cls({})
+        tracer._index_path(path, path_item)
+        return tracer.usage_map
 
     def _trace_content(self, content: Dict, context: Dict):
         for media_type, media_obj in content.items():
@@ -67,8 +84,7 @@ class DependencyTracer:
 
         # Direct Reference
         if '$ref' in schema:
-            ref_name = schema['$ref'].split('/')[-1]
-            self._register_usage(ref_name, context)
+            self._register_usage(ref_name(schema['$ref']), context)
             # We don't recurse into the definition here because we assume
             # the definition itself is analyzed separately if we wanted full graph.
             # But for "Impact Analysis", we just want to know "Who points to me?".
@@ -134,23 +150,11 @@ class DependencyTracer:
         
         components = self.spec.get('components', {}).get('schemas', {})
         
-        def find_refs(schema, parent_name):
-            if not schema: return
-            if '$ref' in schema:
-                child = schema['$ref'].split('/')[-1]
-                if child not in schema_parents: schema_parents[child] = []
-                if parent_name not in schema_parents[child]:
-                    schema_parents[child].append(parent_name)
-            
-            if 'items' in schema: find_refs(schema['items'], parent_name)
-            if 'properties' in schema:
-                for p in schema['properties'].values(): find_refs(p, parent_name)
-            for k in ['allOf', 'anyOf', 'oneOf']:
-                if k in schema:
-                    for s in schema[k]: find_refs(s, parent_name)
-
         for name, definition in components.items():
-            find_refs(definition, name)
+            for child in schema_children(definition):
+                if child not in schema_parents: schema_parents[child] = []
+                if name not in schema_parents[child]:
+                    schema_parents[child].append(name)
             
         # Now propagate usages
         # If I am 'Address' (Child), my usages include my direct usages + usages of 'Customer' (Parent)
@@ -172,3 +176,31 @@ class DependencyTracer:
                             changed = True
                             
                 self.usage_map[child] = child_usages
+
+def schema_children(schema: Dict[str, Any]) -> List[str]:
+    """Names of the schemas a schema definition refers to (through items, properties and combinators), in order."""
+    children = []
+    def find_refs(schema):
+        if not schema: return
+        if '$ref' in schema:
+            children.append(ref_name(schema['$ref']))
+        
+        if 'items' in schema: find_refs(schema['items'])
+        if 'properties' in schema:
+            for p in schema['properties'].values(): find_refs(p)
+        for k in ['allOf', 'anyOf', 'oneOf']:
+            if k in schema:
+                for s in schema[k]: find_refs(s)
+
+    find_refs(schema)
+    return children
+
+def _deref(obj: Any, refs: RefIndex) -> Any:
+    # The component a request body / response / parameter $ref points to (through chains of refs)
+    for _ in range(8):
+        ref = obj.get('$ref') if isinstance(obj, dict) else None
+        target = refs.resolve(ref) if isinstance(ref, str) else None
+        if not isinstance(target, dict):
+            break
+        obj = target
+    return obj
@@ -0,0 +1,133 @@
+import datetime
+import gzip
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from comparator import DiffResult
+from dependency_tracer import DEREFERENCED_COMPONENT_TYPES
+
+# Bump when the layout changes; older files stay readable as long as the loader knows their version
+DIFF_FORMAT = "openapi-diff"
+DIFF_FORMAT_VERSION = 2
+# Version 1 excerpts kept only components.schemas, so refs from paths into other components do not trace
+_READABLE_VERSIONS = (1, 2)
+
+# Tags for values JSON cannot represent natively (single-key objects)
+_MAP_TAG = "~map"      # dict with non-string keys: [[key, value], ...]
+_DATE_TAG = "~date"    # datetime.date (YAML parses unquoted dates)
+_DATETIME_TAG = "~datetime"
+_SET_TAG = "~set"
+_TAGS = (_MAP_TAG, _DATE_TAG, _DATETIME_TAG, _SET_TAG)
+
+@dataclass
+class SavedDiff:
+    diff: DiffResult
+    spec1: Dict[str, Any] # Excerpt of the old spec (see spec_excerpt)
+    spec2: Dict[str, Any] # Excerpt of the new spec
+    old_path: Optional[str] = None
+    new_path: Optional[str] = None
+    created: Optional[str] = None
+
+def spec_excerpt(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The parts of a spec the report generators read besides the diff:
+    info (metadata table), paths (endpoint order, dependency tracing),
+    components.schemas (transitive impact) and the components path items $ref
+    that the dependency tracer follows (request bodies, responses, parameters).
+    """
+    excerpt = {}
+    for key in ('openapi', 'swagger', 'info', 'paths'):
+        if key in spec:
+            excerpt[key] = spec[key]
+    components = spec.get('components') or {}
+    kept = {t: components[t] for t in ('schemas',) + DEREFERENCED_COMPONENT_TYPES if components.get(t) is not None}
+    if kept:
+        excerpt['components'] = kept
+    return excerpt
+
+def save_diff(path: str, diff: DiffResult, old_spec: Dict[str, Any], new_spec: Dict[str, Any],
+              old_path: Optional[str] = None, new_path: Optional[str] = None):
+    """
+    Writes the diff and the spec excerpts the generators need as compact JSON.
+    A path ending in .gz is gzip-compressed.
+    """
+    document = {
+        'format': DIFF_FORMAT,
+        'version': DIFF_FORMAT_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'source': {'old_path': old_path, 'new_path': new_path},
+        'specs': {'old': _encode(spec_excerpt(old_spec)), 'new': _encode(spec_excerpt(new_spec))},
+        'diff': _encode(diff.to_dict()),
+    }
+    data = json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if path.endswith('.gz'):
+        with gzip.open(path, 'wb') as f:
+            f.write(data)
+    else:
+        with open(path, 'wb') as f:
+            f.write(data)
+
+def load_diff(path: str) -> SavedDiff:
+    """Reads a diff written by save_diff (gzip is detected from the content)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    document = json.loads(data.decode('utf-8'))
+
+    if not isinstance(document, dict) or document.get('format') != DIFF_FORMAT:
+        raise ValueError(f"{path} is not a saved OpenAPI diff")
+    version = document.get('version')
+    if version not in _READABLE_VERSIONS:
+        raise ValueError(f"Unsupported diff format version {version} in {path} (expected {DIFF_FORMAT_VERSION})")
+
+    source = document.get('source', {})
+    return SavedDiff(
+        diff=DiffResult.from_dict(_decode(document['diff'])),
+        spec1=_decode(document['specs']['old']),
+        spec2=_decode(document['specs']['new']),
+        old_path=source.get('old_path'),
+        new_path=source.get('new_path'),
+        created=document.get('created'),
+    )
+
+def _encode(value):
+    if isinstance(value, Mapping):
+        if all(isinstance(k, str) for k in value) and not (len(value) == 1 and next(iter(value)) in _TAGS):
+            return {k: _encode(v) for k, v in value.items()}
+        # Keeps int response codes (and other YAML scalars) as keys, in order
+        return {_MAP_TAG: [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, datetime.datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {_DATE_TAG: value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {_SET_TAG: [_encode(v) for v in value]}
+    return value
+
+def _decode(value):
+    if isinstance(value, dict):
+        if len(value) == 1:
+            tag, payload = next(iter(value.items()))
+            if tag == _MAP_TAG:
+                return {_hashable(_decode(k)): _decode(v) for k, v in payload}
+            if tag == _DATE_TAG:
+                return datetime.date.fromisoformat(payload)
+            if tag == _DATETIME_TAG:
+                return datetime.datetime.fromisoformat(payload)
+            if tag == _SET_TAG:
+                return {_hashable(_decode(v)) for v in payload}
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+def _hashable(value):
+    # Tuple keys come back from JSON as lists
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    return value
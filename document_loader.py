@@ -0,0 +1,210 @@
+import os
+import posixpath
+import re
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import unquote
+
+from comparator import split_json_pointer
+from spec_source import load_document, resolve_source, split_git_ref, uncompressed_name
+
+# Component types a $ref can be hoisted into (the slot kinds below that name them)
+COMPONENT_TYPES = ('schemas', 'responses', 'parameters', 'examples', 'requestBodies', 'headers',
+                   'securitySchemes', 'links', 'callbacks')
+
+# Operation / path item / response keys whose values are maps (or lists) of components
+_COMPONENT_MAPS = {'parameters': 'parameters', 'responses': 'responses', 'headers': 'headers',
+                   'examples': 'examples', 'links': 'links', 'callbacks': 'callbacks'}
+
+_REMOTE_REF = re.compile(r'^[A-Za-z][\w+.-]*://')
+
+# Inlined $refs that only point at other $refs, followed before giving up on a cycle
+MAX_REF_HOPS = 64
+
+class DocumentLoader:
+    """
+    Loads a spec split across files into one document with only local refs.
+
+    A $ref into another file ('./schemas/pet.yaml', 'common.yaml#/components/responses/Error')
+    is resolved relative to the file containing it, and its target is added to the root's
+    components under the target's own name (or file name), so the comparator, the dependency
+    tracer and the reports see '#/components/<type>/<name>' refs as for a single-file spec.
+    A root component that is only a $ref into another file takes the target's content under
+    its own name. Path items, and refs in places no component type fits, are inlined.
+    Refs to URLs are left as they are.
+
+    Each file is loaded once per loader (and parsed once per process, through
+    spec_source.SPEC_CACHE); ref_index maps every resolved ref, as '<file>#<pointer>',
+    to the local ref that replaced it.
+    """
+    def __init__(self):
+        self.documents: Dict[str, Any] = {}
+        self.ref_index: Dict[str, str] = {}
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._root = None
+
+    def load(self, source: str, document: Any = None) -> Dict[str, Any]:
+        """The bundled spec of the root file source (document: its parsed content, if already loaded)."""
+        self._root = resolve_source(source, _base_name(source))
+        root = self.documents[self._root] = document if document is not None else load_document(source)
+        if not isinstance(root, dict):
+            return root
+
+        # Keys are created up front, in document order, and filled in as the walk reaches them
+        bundled = dict.fromkeys(root)
+        stack = []
+        for key, value in root.items():
+            if key != 'components':
+                stack.append((value, self._root, _ROOT_KINDS.get(key, 'other'), bundled, key, 0))
+        components = root.get('components')
+        if isinstance(components, dict):
+            self._components = dict.fromkeys(components)
+            stack.extend(self._root_components(components))
+        self._walk(stack)
+        if self._components:
+            bundled['components'] = self._components
+        return bundled
+
+    def _root_components(self, components):
+        # Root entries that only point into another file take over the target, under their own name
+        entries = []
+        for comp_type, items in components.items():
+            if not isinstance(items, dict):
+                self._components[comp_type] = items
+                continue
+            kind = _member_kind(comp_type)
+            copies = self._components[comp_type] = dict.fromkeys(items)
+            for name, item in items.items():
+                ref = item.get('$ref') if isinstance(item, dict) and len(item) == 1 else None
+                if isinstance(ref, str) and not ref.startswith('#') and not _REMOTE_REF.match(ref):
+                    target_source, pointer = self._locate(ref, self._root)
+                    self.ref_index.setdefault(f"{target_source}#{pointer}", f"#/components/{comp_type}/{name}")
+                    item = self._resolve(target_source, pointer, ref, self._root)
+                    entries.append((item, target_source, kind, copies, name, 0))
+                else:
+                    entries.append((item, self._root, kind, copies, name, 0))
+        return entries
+
+    def _walk(self, stack):
+        # Copies each value into parent[key], rewriting the refs it holds; shares nothing with the documents
+        while stack:
+            node, source, kind, parent, key, hops = stack.pop()
+            if isinstance(node, dict):
+                ref = node.get('$ref')
+                if isinstance(ref, str) and (source != self._root or not ref.startswith('#')) and not _REMOTE_REF.match(ref):
+                    target_source, pointer = self._locate(ref, source)
+                    comp_type = _component_type(kind, pointer)
+                    if comp_type is None:
+                        if hops >= MAX_REF_HOPS:
+                            raise ValueError(f"$ref cycle through '{ref}' in {source}")
+                        target = self._resolve(target_source, pointer, ref, source)
+                        stack.append((target, target_source, kind, parent, key, hops + 1))
+                        continue
+                    copy = parent[key] = dict.fromkeys(node)
+                    for k, v in node.items():
+                        if k == '$ref':
+                            copy[k] = self._hoist(target_source, pointer, comp_type, ref, source, stack)
+                        else:
+                            stack.append((v, source, _child_kind(kind, k), copy, k, 0))
+                    continue
+                copy = parent[key] = dict.fromkeys(node)
+                for k, v in node.items():
+                    stack.append((v, source, _child_kind(kind, k), copy, k, 0))
+            elif isinstance(node, list):
+                copy = parent[key] = [None] * len(node)
+                item_kind = _member_kind(kind)
+                for i, v in enumerate(node):
+                    stack.append((v, source, item_kind, copy, i, 0))
+            else:
+                parent[key] = node
+
+    def _hoist(self, target_source, pointer, comp_type, ref, source, stack) -> str:
+        index_key = f"{target_source}#{pointer}"
+        local = self.ref_index.get(index_key)
+        if local is not None:
+            return local
+        segments = split_json_pointer(pointer) if pointer else []
+        in_components = len(segments) == 3 and segments[0] == 'components'
+        if target_source == self._root and in_components:
+            local = self.ref_index[index_key] = '#' + pointer
+            return local
+
+        target = self._resolve(target_source, pointer, ref, source)
+        if in_components:
+            comp_type, name = segments[1], segments[2]
+        else:
+            name = segments[-1] if segments else _file_name(target_source)
+        items = self._components.get(comp_type)
+        if not isinstance(items, dict):
+            items = self._components[comp_type] = {}
+        name = _unique_name(re.sub(r'[^A-Za-z0-9._-]+', '_', name) or comp_type, items)
+        local = self.ref_index[index_key] = f"#/components/{comp_type}/{name}"
+        items[name] = None
+        stack.append((target, target_source, _member_kind('map:' + comp_type), items, name, 0))
+        return local
+
+    def _locate(self, ref: str, source: str) -> Tuple[str, str]:
+        # (file, JSON pointer) a ref names, relative to the file it appears in
+        path, _, fragment = ref.partition('#')
+        pointer = unquote(fragment)
+        if pointer and not pointer.startswith('/'):
+            raise ValueError(f"Unsupported $ref '{ref}' in {source}: only JSON Pointer fragments are resolved")
+        return (resolve_source(source, unquote(path)) if path else source), pointer
+
+    def _resolve(self, target_source, pointer, ref, source) -> Any:
+        document = self.documents.get(target_source)
+        if document is None:
+            document = self.documents[target_source] = load_document(target_source)
+        node = document
+        for segment in split_json_pointer(pointer) if pointer else []:
+            if isinstance(node, dict) and segment in node:
+                node = node[segment]
+            elif isinstance(node, list) and segment.isdigit() and int(segment) < len(node):
+                node = node[int(segment)]
+            else:
+                raise ValueError(f"Cannot resolve $ref '{ref}' in {source}: no '{pointer}' in {target_source}")
+        return node
+
+# Kinds of values, by the key they sit under: the component type a $ref found there is hoisted into
+_ROOT_KINDS = {'paths': 'paths', 'webhooks': 'paths'}
+
+def _child_kind(kind: str, key: Any) -> str:
+    if kind == 'schemas':
+        return 'schemas'
+    if kind in ('paths', 'callbacks'):
+        return 'path_item'
+    if kind.startswith('map:'):
+        return _member_kind(kind)
+    if key == 'schema':
+        return 'schemas'
+    if key == 'requestBody':
+        return 'requestBodies'
+    if key in _COMPONENT_MAPS:
+        return 'map:' + _COMPONENT_MAPS[key]
+    return 'other'
+
+def _member_kind(kind: str) -> str:
+    # Members of a map / list of components
+    return kind[4:] if kind.startswith('map:') else kind
+
+def _component_type(kind: str, pointer: str) -> Optional[str]:
+    segments = split_json_pointer(pointer) if pointer else []
+    if kind in COMPONENT_TYPES:
+        if len(segments) == 3 and segments[0] == 'components' and segments[1] in COMPONENT_TYPES:
+            return segments[1]
+        return kind
+    return None
+
+def _unique_name(name: str, taken: Dict[str, Any]) -> str:
+    if name not in taken:
+        return name
+    i = 2
+    while f"{name}_{i}" in taken:
+        i += 1
+    return f"{name}_{i}"
+
+def _base_name(source: str) -> str:
+    ref = split_git_ref(source)
+    return posixpath.basename(ref[1]) if ref else os.path.basename(source)
+
+def _file_name(source: str) -> str:
+    return os.path.splitext(uncompressed_name(_base_name(source)))[0]
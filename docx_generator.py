@@ -3,6 +3,7 @@ from docx.shared import Pt, RGBColor, Inches, Cm
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
+from collections.abc import Mapping
 import datetime
 
 # --- OXML Helpers (Safe Insertion) ---
@@ -360,7 +361,7 @@ class DocxReportGenerator:
                 # Other simple changes
                 for key, val in changes.items():
                     if key == 'schema': continue
-                    if isinstance(val, dict) and 'old' in val and 'new' in val:
+                    if isinstance(val, Mapping) and 'old' in val and 'new' in val:
                         p.add_run(f", {key} changed from '{val['old']}' to '{val['new']}'")
 
     def _add_request_body_changes(self, rb_diff):
@@ -446,8 +447,11 @@ class DocxReportGenerator:
                 old_lines = []
                 new_lines = []
                 for k, v in p_diff.items():
-                    old_lines.append(f"{k}: {v['old']}")
-                    new_lines.append(f"{k}: {v['new']}")
+                    old_line, new_line = self._format_change_lines(k, v)
+                    if old_line is not None:
+                        old_lines.append(old_line)
+                    if new_line is not None:
+                        new_lines.append(new_line)
                 
                 row.cells[2].text = '\n'.join(old_lines)
                 row.cells[3].text = '\n'.join(new_lines)
@@ -477,9 +481,10 @@ class DocxReportGenerator:
             p = self.doc.add_paragraph(style='List Bullet 4')
             self._add_badge(p, key.upper(), "17A2B8", "FFFFFF")
             
-            if isinstance(val, dict) and ('added' in val or 'removed' in val):
+            if isinstance(val, Mapping) and ('added' in val or 'removed' in val):
+                 noun = "values" if 'order_changed' in val else "options"
                  if 'added' in val and val['added']:
-                    p.add_run("Added options:")
+                    p.add_run(f"Added {noun}:")
                     for item in val['added']:
                         p_sub = self.doc.add_paragraph(style='List Bullet 5')
                         self._add_badge(p_sub, "ADDED", "28A745", "FFFFFF")
@@ -488,15 +493,20 @@ class DocxReportGenerator:
                     if 'added' in val and val['added']:
                         p = self.doc.add_paragraph(style='List Bullet 4')
                         self._add_badge(p, key.upper(), "17A2B8", "FFFFFF")
-                    p.add_run("Removed options:")
+                    p.add_run(f"Removed {noun}:")
                     for item in val['removed']:
                         p_sub = self.doc.add_paragraph(style='List Bullet 5')
                         self._add_badge(p_sub, "REMOVED", "DC3545", "FFFFFF")
                         p_sub.add_run(self._format_schema_summary(item))
+                 if val.get('order_changed'):
+                    if val.get('added') or val.get('removed'):
+                        p = self.doc.add_paragraph(style='List Bullet 4')
+                        self._add_badge(p, key.upper(), "17A2B8", "FFFFFF")
+                    p.add_run("Order of values changed")
 
-            elif isinstance(val, dict) and 'old' in val and 'new' in val:
+            elif isinstance(val, Mapping) and 'old' in val and 'new' in val:
                 p.add_run(f"Changed from '{val['old']}' to '{val['new']}'")
-            elif isinstance(val, dict) and 'old_count' in val:
+            elif isinstance(val, Mapping) and 'old_count' in val:
                 p.add_run(f"Count changed from {val['old_count']} to {val['new_count']}")
             else:
                 p.add_run(str(val))
@@ -538,8 +548,11 @@ class DocxReportGenerator:
                         old_lines = []
                         new_lines = []
                         for k, v in p_diff.items():
-                            old_lines.append(f"{k}: {v['old']}")
-                            new_lines.append(f"{k}: {v['new']}")
+                            old_line, new_line = self._format_change_lines(k, v)
+                            if old_line is not None:
+                                old_lines.append(old_line)
+                            if new_line is not None:
+                                new_lines.append(new_line)
                         
                         row.cells[2].text = '\n'.join(old_lines)
                         row.cells[3].text = '\n'.join(new_lines)
@@ -570,10 +583,11 @@ class DocxReportGenerator:
                     p = self.doc.add_paragraph(style='List Bullet')
                     self._add_badge(p, key.upper(), "17A2B8", "FFFFFF") # Cyan badge for structural changes
                     
-                    if isinstance(val, dict) and ('added' in val or 'removed' in val):
-                        # Handle detailed combinator changes
+                    if isinstance(val, Mapping) and ('added' in val or 'removed' in val):
+                        # Handle detailed combinator (and enum / required) changes
+                        noun = "values" if 'order_changed' in val else "options"
                         if 'added' in val and val['added']:
-                            p.add_run("Added options:")
+                            p.add_run(f"Added {noun}:")
                             for item in val['added']:
                                 p_sub = self.doc.add_paragraph(style='List Bullet 2')
                                 self._add_badge(p_sub, "ADDED", "28A745", "FFFFFF")
@@ -585,22 +599,43 @@ class DocxReportGenerator:
                                 p = self.doc.add_paragraph(style='List Bullet')
                                 self._add_badge(p, key.upper(), "17A2B8", "FFFFFF")
                                 
-                            p.add_run("Removed options:")
+                            p.add_run(f"Removed {noun}:")
                             for item in val['removed']:
                                 p_sub = self.doc.add_paragraph(style='List Bullet 2')
                                 self._add_badge(p_sub, "REMOVED", "DC3545", "FFFFFF")
                                 p_sub.add_run(self._format_schema_summary(item))
 
-                    elif isinstance(val, dict) and 'old' in val and 'new' in val:
+                        if val.get('order_changed'):
+                            if val.get('added') or val.get('removed'):
+                                p = self.doc.add_paragraph(style='List Bullet')
+                                self._add_badge(p, key.upper(), "17A2B8", "FFFFFF")
+                            p.add_run("Order of values changed")
+
+                    elif isinstance(val, Mapping) and 'old' in val and 'new' in val:
                         p.add_run(f"Changed from '{val['old']}' to '{val['new']}'")
-                    elif isinstance(val, dict) and 'old_count' in val:
+                    elif isinstance(val, Mapping) and 'old_count' in val:
                         p.add_run(f"Count changed from {val['old_count']} to {val['new_count']}")
                     else:
                         p.add_run(str(val))
         else:
             self.doc.add_paragraph('No modified schemas.')
 
+    def _format_change_lines(self, key, change):
+        # Old / New cell lines for one changed keyword of a property
+        if isinstance(change, Mapping) and 'old' in change:
+            return f"{key}: {change['old']}", f"{key}: {change.get('new')}"
+        if isinstance(change, Mapping) and 'order_changed' in change:
+            # Members sets: only the sides that changed (None for an empty side)
+            old_line = f"{key} removed: {', '.join(map(str, change['removed']))}" if change['removed'] else None
+            new_line = f"{key} added: {', '.join(map(str, change['added']))}" if change['added'] else None
+            if change['order_changed']:
+                new_line = f"{new_line} (order changed)" if new_line else f"{key}: order changed"
+            return old_line, new_line
+        return f"{key}: {change}", f"{key}: {change}"
+
     def _format_schema_summary(self, schema):
+        if not isinstance(schema, Mapping):
+            return str(schema)
         if '$ref' in schema:
             return schema['$ref']
         elif 'type' in schema:
@@ -0,0 +1,55 @@
+import hashlib
+import marshal
+from dataclasses import dataclass, field
+from typing import Any, Dict, Set, Tuple
+
+@dataclass
+class SpecFingerprints:
+    """
+    Content hashes of the parts of a spec the comparator diffs independently:
+    one per path item and one per component, plus info, tags and servers as a whole.
+    Equal fingerprints mean equal content; the reverse is not guaranteed
+    (a reordered mapping hashes differently), so a mismatch only means "compare it".
+    """
+    info: bytes = b''
+    tags: bytes = b''
+    servers: bytes = b''
+    paths: Dict[str, bytes] = field(default_factory=dict)
+    components: Dict[str, Dict[str, bytes]] = field(default_factory=dict)
+
+def fingerprint(value: Any) -> bytes:
+    # marshal is lossless (int and str keys stay apart) and about twice as fast as repr;
+    # version 2 has no back-references, so the bytes depend only on the content.
+    # YAML dates and other non-marshallable values fall back to repr.
+    try:
+        data = b'm' + marshal.dumps(value, 2)
+    except ValueError:
+        data = b'r' + repr(value).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def spec_fingerprints(spec: Dict[str, Any]) -> SpecFingerprints:
+    fps = SpecFingerprints(
+        info=fingerprint(spec.get('info', {})),
+        tags=fingerprint(spec.get('tags', [])),
+        servers=fingerprint(spec.get('servers', [])),
+    )
+    for path, item in (spec.get('paths') or {}).items():
+        fps.paths[path] = fingerprint(item)
+    for comp_type, items in (spec.get('components') or {}).items():
+        if isinstance(items, dict):
+            fps.components[comp_type] = {name: fingerprint(item) for name, item in items.items()}
+    return fps
+
+def changed_keys(old: Dict[Any, bytes], new: Dict[Any, bytes]) -> Set[Any]:
+    """Keys added, removed or with a different fingerprint between two fingerprint maps."""
+    changed = old.keys() ^ new.keys()
+    changed.update(k for k in old.keys() & new.keys() if old[k] != new[k])
+    return changed
+
+def changed_components(old: SpecFingerprints, new: SpecFingerprints) -> Set[Tuple[str, str]]:
+    """(component type, name) pairs that differ between two fingerprint sets."""
+    changed = set()
+    for comp_type in old.components.keys() | new.components.keys():
+        for name in changed_keys(old.components.get(comp_type, {}), new.components.get(comp_type, {})):
+            changed.add((comp_type, name))
+    return changed
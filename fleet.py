@@ -0,0 +1,116 @@
+import os
+import pickle
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from dependency_tracer import DependencyTracer
+from fingerprints import spec_fingerprints
+from history import SpecPair, SpecVersion, compare_versions
+from scope import ScopeFilter, scope_specs
+from spec_source import load_spec
+from summary import change_matrix, summarize_specs, summary_document
+
+@dataclass
+class FleetResult:
+    index: int # Position of the service in the paths given
+    path: str
+    ok: bool
+    elapsed: float = 0.0
+    summary: Optional[Dict[str, Any]] = None # summary_document of baseline -> service
+    output: Any = None # What the render callback returned
+    error: Optional[str] = None # Formatted traceback when ok is False
+
+# Per-process baseline and options, unpickled once by the pool initializer
+_WORKER_STATE: Optional[Dict[str, Any]] = None
+
+def _init_worker(payload: bytes):
+    global _WORKER_STATE
+    _WORKER_STATE = pickle.loads(payload)
+
+def compare_fleet(baseline: SpecVersion, paths: List[str], render: Optional[Callable[[SpecPair], Any]] = None,
+                  scope: Optional[ScopeFilter] = None, with_tracers: bool = False, max_workers: Optional[int] = None,
+                  on_progress: Optional[Callable[[FleetResult], None]] = None) -> List[FleetResult]:
+    """
+    Compares one baseline (loaded and fingerprinted once, see history.load_version) with each
+    service spec in paths, in a process pool.
+
+    Each worker unpickles the baseline once. Services are submitted largest file first, so the
+    long comparisons start early and the short ones fill the pool at the end.
+    Without render, each result's summary holds the counts of summarize_specs.
+    With render(pair), the full diff is computed, the summary holds its exact Change Matrix
+    counts, and render runs in the worker (e.g. to write the service's reports); with_tracers
+    then gives each service spec a resolved DependencyTracer for it.
+    A scope restricts both specs before each comparison, as in compare_specs.
+
+    on_progress(result) is called in the calling process as each service finishes.
+    A failing service never prevents the others from completing. Results are returned in
+    the order of paths.
+    """
+    payload = pickle.dumps({'baseline': baseline, 'render': render, 'scope': scope, 'with_tracers': with_tracers},
+                           protocol=pickle.HIGHEST_PROTOCOL)
+    order = sorted(range(len(paths)), key=lambda i: _file_size(paths[i]), reverse=True)
+    results: Dict[int, FleetResult] = {}
+
+    if max_workers is None:
+        max_workers = min(len(paths), os.cpu_count() or 1)
+
+    if len(paths) <= 1 or max_workers <= 1:
+        _init_worker(payload)
+        for i in order:
+            results[i] = _compare_service(i, paths[i])
+            if on_progress:
+                on_progress(results[i])
+        return [results[i] for i in range(len(paths))]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(payload,)) as pool:
+        futures = {pool.submit(_compare_service, i, paths[i]): i for i in order}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # Worker crashed or the result could not be transferred
+                result = FleetResult(i, paths[i], False, 0.0, error=traceback.format_exc())
+            results[i] = result
+            if on_progress:
+                on_progress(result)
+
+    return [results[i] for i in range(len(paths))]
+
+def _compare_service(index: int, path: str) -> FleetResult:
+    start = time.perf_counter()
+    state = _WORKER_STATE
+    baseline, scope, render = state['baseline'], state['scope'], state['render']
+    try:
+        spec = load_spec(path)
+        if scope:
+            old_view, spec = scope_specs(baseline.spec, spec, scope)
+            # Component scopes keep the path items as they are, so the baseline fingerprints still
+            # hold for the view; its tracer was built from the unscoped paths, so the reports rebuild it
+            fps = spec_fingerprints(old_view) if scope.has_endpoint_filters() else baseline.fingerprints
+            baseline = SpecVersion(baseline.path, old_view, fps)
+
+        if render is None:
+            summary = summarize_specs(baseline.spec, spec)
+            return FleetResult(index, path, True, time.perf_counter() - start, summary=summary)
+
+        tracer = None
+        if state['with_tracers']:
+            tracer = DependencyTracer(spec)
+            tracer.resolve_transitive_impact()
+        service = SpecVersion(path, spec, spec_fingerprints(spec), tracer)
+        pair = SpecPair(index, baseline, service, compare_versions(baseline, service))
+        summary = summary_document(change_matrix(pair.diff), baseline.spec, spec, info_changed=bool(pair.diff.info_changes))
+        output = render(pair)
+        return FleetResult(index, path, True, time.perf_counter() - start, summary=summary, output=output)
+    except Exception:
+        return FleetResult(index, path, False, time.perf_counter() - start, error=traceback.format_exc())
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import threading
+import multiprocessing
 import os
 import sys
 import ctypes
@@ -14,12 +15,12 @@ except Exception:
 # Add current directory to path to ensure imports work
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from comparator import load_yaml, compare_specs
+from comparator import compare_specs
 from report_generator import ReportGenerator
-from impact_generator import ImpactDocxGenerator
-from analytic_generator import AnalyticDocxGenerator
-from synthetic_generator import SyntheticDocxGenerator
+from report_scheduler import ReportJob, render_reports
 from config_manager import ConfigManager
+from scope import ScopeFilter, parse_patterns, scope_specs
+from spec_source import load_spec
 from dependency_tracer import DependencyTracer
 
 def resource_path(relative_path):
@@ -233,7 +234,7 @@ class OpenAPIDiffGUI:
     def __init__(self, root):
         self.root = root
         self.root.title(f"OpenAPI Diff Tool v{VERSION}")
-        self.root.geometry("600x600")
+        self.root.geometry("600x740")
         
         # Set AppUserModelID (Critical for Windows Taskbar Icon)
         try:
@@ -268,6 +269,12 @@ class OpenAPIDiffGUI:
         self.gen_markdown = tk.BooleanVar(value=True)
         self.gen_impact = tk.BooleanVar(value=True)
         self.gen_analytic = tk.BooleanVar(value=True)
+
+        # Scope filters (comma-separated patterns, empty = everything)
+        self.scope_paths = tk.StringVar()
+        self.scope_tags = tk.StringVar()
+        self.scope_operation_ids = tk.StringVar()
+        self.scope_components = tk.StringVar()
         
         self._init_menu()
         self._init_ui()
@@ -324,7 +331,22 @@ class OpenAPIDiffGUI:
         ttk.Button(frame_out, text="Browse...", command=self._browse_out).grid(row=0, column=2)
         ttk.Button(frame_out, text="Open Folder", command=self._open_output_folder).grid(row=0, column=3, padx=5)
 
-        # 3. Report Types
+        # 3. Scope (optional)
+        frame_scope = tk.LabelFrame(self.root, text="Scope (optional, comma-separated patterns)", padx=10, pady=10)
+        frame_scope.pack(fill="x", **pad_opts)
+        frame_scope.columnconfigure(1, weight=1)
+
+        scope_fields = [
+            ("Paths:", self.scope_paths),               # e.g. /payments/**
+            ("Tags:", self.scope_tags),
+            ("Operation IDs:", self.scope_operation_ids),
+            ("Components:", self.scope_components),     # e.g. Payment*, schemas/Payment*
+        ]
+        for row, (label, var) in enumerate(scope_fields):
+            tk.Label(frame_scope, text=label).grid(row=row, column=0, sticky="w")
+            ttk.Entry(frame_scope, textvariable=var).grid(row=row, column=1, padx=5, pady=1, sticky="ew")
+
+        # 4. Report Types
         frame_types = tk.LabelFrame(self.root, text="Report Types", padx=10, pady=10)
         frame_types.pack(fill="x", **pad_opts)
         
@@ -349,23 +371,23 @@ class OpenAPIDiffGUI:
         self.btn_open_imp = ttk.Button(frame_imp, text="Open", state="disabled", command=lambda: self._open_report("report_impact.docx"))
         self.btn_open_imp.pack(side="right", padx=5)
 
-        # 4. Action (Preferences moved to Menu)
+        # 5. Action (Preferences moved to Menu)
         frame_actions = tk.Frame(self.root)
         frame_actions.pack(fill="x", padx=20, pady=10)
         
         self.btn_generate = ttk.Button(frame_actions, text="GENERATE REPORTS", command=self._start_generation)
         self.btn_generate.pack(fill="x", expand=True)
         
-        # 5. Log Area
+        # 6. Log Area
         self.log_area = scrolledtext.ScrolledText(self.root, height=10, state='disabled')
         self.log_area.pack(fill="both", expand=True, padx=10, pady=5)
 
     def _browse_old(self):
-        f = filedialog.askopenfilename(filetypes=[("YAML Files", "*.yaml *.yml")])
+        f = filedialog.askopenfilename(filetypes=[("OpenAPI Specs", "*.yaml *.yml *.json *.gz *.bz2 *.xz"), ("All Files", "*")])
         if f: self.old_spec_path.set(f)
 
     def _browse_new(self):
-        f = filedialog.askopenfilename(filetypes=[("YAML Files", "*.yaml *.yml")])
+        f = filedialog.askopenfilename(filetypes=[("OpenAPI Specs", "*.yaml *.yml *.json *.gz *.bz2 *.xz"), ("All Files", "*")])
         if f: self.new_spec_path.set(f)
 
     def _browse_out(self):
@@ -424,8 +446,19 @@ class OpenAPIDiffGUI:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             
             self._log("Loading specs...")
-            spec1 = load_yaml(self.old_spec_path.get())
-            spec2 = load_yaml(self.new_spec_path.get())
+            spec1 = load_spec(self.old_spec_path.get())
+            spec2 = load_spec(self.new_spec_path.get())
+
+            scope = ScopeFilter(
+                paths=parse_patterns(self.scope_paths.get()),
+                tags=parse_patterns(self.scope_tags.get()),
+                operation_ids=parse_patterns(self.scope_operation_ids.get()),
+                components=parse_patterns(self.scope_components.get()),
+            )
+            if scope:
+                # Reports see the same restricted specs as the comparison
+                self._log("Applying scope filters...")
+                spec1, spec2 = scope_specs(spec1, spec2, scope)
             
             self._log("Comparing specs...")
             debug_mode = self.config_manager.get_debug_mode()
@@ -438,60 +471,51 @@ class OpenAPIDiffGUI:
             # Load Variables
             variables = self.config_manager.get_variables()
             
-            # Synthesis DOCX
+            # All selected reports render concurrently from the same diff
+            jobs = []
+            open_buttons = {}
             if self.gen_markdown.get():
-                self._log("Generating Synthesis Report (DOCX)...")
-                filename = f"report_synthesis_{timestamp}.docx"
-                out_path = os.path.join(out_dir, filename)
-                
-                gen = SyntheticDocxGenerator(
-                    spec1=spec1, 
-                    spec2=spec2, 
-                    diff=diff, 
-                    old_path=self.old_spec_path.get(), 
-                    new_path=self.new_spec_path.get(), 
-                    variables=variables,
-                    template_path=os.path.join("templates", "template_synthesis.docx")
-                )
-                gen.generate(out_path)
-                self._log(f" -> Created: {filename}")
-                self.root.after(0, lambda p=out_path: self._configure_open_btn(self.btn_open_md, p))
-
-            # Analytic DOCX
+                jobs.append(ReportJob('synthesis', os.path.join(out_dir, f"report_synthesis_{timestamp}.docx")))
+                open_buttons['synthesis'] = self.btn_open_md
             if self.gen_analytic.get():
-                self._log("Generating Analytical Report (DOCX)...")
-                filename = f"report_analytical_{timestamp}.docx"
-                out_path = os.path.join(out_dir, filename)
-                gen = AnalyticDocxGenerator(
-                    spec1=spec1, 
-                    spec2=spec2, 
-                    diff=diff, 
-                    old_path=self.old_spec_path.get(), 
-                    new_path=self.new_spec_path.get(), 
-                    variables=variables,
-                    template_path=os.path.join("templates", "template_analytical.docx")
-                )
-                gen.generate(out_path)
-                self._log(f" -> Created: {filename}")
-                self.root.after(0, lambda p=out_path: self._configure_open_btn(self.btn_open_ana, p))
-
-            # Impact DOCX
+                jobs.append(ReportJob('analytical', os.path.join(out_dir, f"report_analytical_{timestamp}.docx")))
+                open_buttons['analytical'] = self.btn_open_ana
             if self.gen_impact.get():
-                self._log("Generating Impact Report (DOCX)...")
-                filename = f"report_impact_{timestamp}.docx"
-                out_path = os.path.join(out_dir, filename)
-                gen = ImpactDocxGenerator(
-                    old_spec=spec1, 
-                    new_spec=spec2, 
-                    diff=diff, 
-                    old_path=self.old_spec_path.get(), 
-                    new_path=self.new_spec_path.get(), 
-                    variables=variables,
-                    template_path=os.path.join("templates", "template_impact.docx")
-                )
-                gen.generate(out_path)
-                self._log(f" -> Created: {filename}")
-                self.root.after(0, lambda p=out_path: self._configure_open_btn(self.btn_open_imp, p))
+                jobs.append(ReportJob('impact', os.path.join(out_dir, f"report_impact_{timestamp}.docx")))
+                open_buttons['impact'] = self.btn_open_imp
+
+            labels = {'synthesis': "Synthesis", 'analytical': "Analytical", 'impact': "Impact"}
+
+            def on_progress(name, status, result):
+                if status == 'started':
+                    self._log(f"Generating {labels[name]} Report (DOCX)...")
+                elif status == 'done':
+                    self._log(f" -> Created: {os.path.basename(result.output_path)} ({result.elapsed:.1f}s)")
+                    self.root.after(0, lambda b=open_buttons[name], p=result.output_path: self._configure_open_btn(b, p))
+                else:
+                    self._log(f" -> {labels[name]} Report FAILED:\n{result.error}")
+
+            results = render_reports(
+                spec1, spec2, diff, jobs,
+                old_path=self.old_spec_path.get(),
+                new_path=self.new_spec_path.get(),
+                variables=variables,
+                on_progress=on_progress
+            )
+
+            failed = [r for r in results if not r.ok]
+            if failed:
+                error_msg = "\n\n".join(f"{labels[r.name]} Report:\n{r.error}" for r in failed)
+                if self.config_manager.get_debug_mode():
+                    log_dir = "logs"
+                    if not os.path.exists(log_dir):
+                        os.makedirs(log_dir)
+                    with open(os.path.join(log_dir, "gui_debug.log"), "w", encoding="utf-8") as f:
+                        f.write(error_msg)
+                names = ", ".join(labels[r.name] for r in failed)
+                self._log(f"\nDone with errors. Failed: {names}")
+                messagebox.showerror("Error", f"Some reports could not be generated: {names}\n\nSee the log for details.")
+                return
 
             self._log("\nSUCCESS! All reports generated.")
             messagebox.showinfo("Success", "Reports generated successfully!")
@@ -517,6 +541,8 @@ class OpenAPIDiffGUI:
         btn.config(state='normal', command=lambda: self._open_report(path))
 
 if __name__ == "__main__":
+    # Required for the report worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = OpenAPIDiffGUI(root)
     root.mainloop()
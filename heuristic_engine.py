@@ -2,6 +2,8 @@ from typing import List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from comparator import member_changes
+
 class Severity(Enum):
     CRITICAL = "CRITICAL"
     HIGH = "HIGH"
@@ -34,6 +36,19 @@ class HeuristicEngine:
         self._analyze_removed_components() # NEW: Detect full component removals
         return self.insights
 
+    def feed(self, event) -> List[Insight]:
+        """
+        Incremental mode: analyzes a single comparator.ChangeEvent (see iter_changes) and
+        returns the insights it produced; they are also added to self.insights.
+        Every rule looks at one endpoint or component at a time, so feeding all events
+        finds the same insights as run() on the assembled diff.
+        """
+        from comparator import assemble_diff
+        engine = HeuristicEngine(assemble_diff([event]))
+        found = engine.run()
+        self.insights.extend(found)
+        return found
+
     def _analyze_removed_components(self):
         """
         Detects when entire shared components are removed.
@@ -273,11 +288,12 @@ class HeuristicEngine:
                                 ))
                             
                             # P10: Enum Removed
-                            if 'enum' in s_diff and 'removed' in s_diff['enum']:
+                            removed_values = member_changes(s_diff.get('enum'))[1]
+                            if removed_values:
                                 self.insights.append(Insight(
                                     rule_id="P10",
                                     title="Enum Values Removed",
-                                    description=f"Valid values removed: {s_diff['enum']['removed']}.",
+                                    description=f"Valid values removed: {removed_values}.",
                                     severity=Severity.CRITICAL,
                                     category="PARAMETER",
                                     context=p_context
@@ -295,11 +311,7 @@ class HeuristicEngine:
 
             # S02: Required Property Added
             if 'required' in s_changes:
-                new_val = s_changes['required'].get('new')
-                old_val = s_changes['required'].get('old')
-                new_req = set(new_val if new_val is not None else [])
-                old_req = set(old_val if old_val is not None else [])
-                added = new_req - old_req
+                added = member_changes(s_changes['required'])[0]
                 if added:
                     self.insights.append(Insight(
                         rule_id="S02",
@@ -0,0 +1,121 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from comparator import DiffResult
+from dependency_tracer import DependencyTracer
+from fingerprints import SpecFingerprints, spec_fingerprints
+from lazy_diff import lazy_compare_specs
+from spec_source import load_spec
+
+@dataclass
+class SpecVersion:
+    """A spec parsed once, with what every comparison it takes part in reuses."""
+    path: str
+    spec: Dict[str, Any]
+    fingerprints: SpecFingerprints
+    tracer: Optional[DependencyTracer] = None # With transitive impact, when requested
+
+@dataclass
+class SpecPair:
+    """
+    Two loaded specs being compared: consecutive versions of a history (index 0 compares
+    the first two), or the baseline and the index-th service of a fleet.
+    """
+    index: int
+    old: SpecVersion
+    new: SpecVersion
+    diff: Optional[DiffResult] = None
+
+    # Same interface as IncrementalComparator, so report writers reuse the versions' tracers
+    def tracer(self) -> Optional[DependencyTracer]:
+        return self.new.tracer
+
+    def old_tracer(self) -> Optional[DependencyTracer]:
+        return self.old.tracer
+
+@dataclass
+class HistoryResult:
+    index: int
+    old_path: str
+    new_path: str
+    ok: bool
+    elapsed: float = 0.0
+    diff: Optional[DiffResult] = None # Left out when a render callback consumed it
+    output: Any = None # What the render callback returned
+    error: Optional[str] = None # Formatted traceback when ok is False
+
+def load_version(path: str, with_tracer: bool = False) -> SpecVersion:
+    spec = load_spec(path)
+    tracer = None
+    if with_tracer:
+        tracer = DependencyTracer(spec)
+        tracer.resolve_transitive_impact()
+    return SpecVersion(path, spec, spec_fingerprints(spec), tracer)
+
+def compare_versions(old: SpecVersion, new: SpecVersion) -> DiffResult:
+    """compare_specs for two loaded versions: only entries whose fingerprints differ are diffed."""
+    result = lazy_compare_specs(old.spec, new.spec, old_fps=old.fingerprints, new_fps=new.fingerprints)
+    result.modified_paths = dict(result.modified_paths)
+    result.modified_components = {c_type: dict(items) for c_type, items in result.modified_components.items()}
+    return result
+
+def compare_history(paths: List[str], render: Optional[Callable[[SpecPair], Any]] = None,
+                    with_tracers: bool = False, max_workers: Optional[int] = None,
+                    on_progress: Optional[Callable[[HistoryResult], None]] = None) -> List[HistoryResult]:
+    """
+    Diffs each consecutive pair of an ordered list of spec files (oldest first).
+
+    Every file is parsed and fingerprinted once (and, with with_tracers, gets its resolved
+    DependencyTracer once), in a process pool; the pairs are then diffed in the same pool.
+    Each version serves as the new side of one comparison and the old side of the next.
+    render(pair), if given, runs in the worker right after the step's diff (e.g. to write
+    its reports) with a SpecPair, and its return value is kept instead of the diff.
+
+    on_progress(result) is called in the calling process as each step finishes.
+    A failing step never prevents the others from completing. Results are returned in
+    step order. A file that cannot be loaded raises before any step runs.
+    """
+    if len(paths) < 2:
+        raise ValueError("A history needs at least two specs")
+    if max_workers is None:
+        max_workers = min(len(paths), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        versions = [load_version(path, with_tracers) for path in paths]
+        results = []
+        for i in range(len(versions) - 1):
+            results.append(_run_step(i, versions[i], versions[i + 1], render))
+            if on_progress:
+                on_progress(results[-1])
+        return results
+
+    results: Dict[int, HistoryResult] = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        versions = list(pool.map(load_version, paths, [with_tracers] * len(paths)))
+        futures = {pool.submit(_run_step, i, versions[i], versions[i + 1], render): i for i in range(len(versions) - 1)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # Worker crashed or the result could not be transferred
+                result = HistoryResult(i, paths[i], paths[i + 1], False, 0.0, error=traceback.format_exc())
+            results[i] = result
+            if on_progress:
+                on_progress(result)
+    return [results[i] for i in range(len(paths) - 1)]
+
+def _run_step(index: int, old: SpecVersion, new: SpecVersion, render) -> HistoryResult:
+    start = time.perf_counter()
+    try:
+        pair = SpecPair(index, old, new, compare_versions(old, new))
+        if render is None:
+            return HistoryResult(index, old.path, new.path, True, time.perf_counter() - start, diff=pair.diff)
+        output = render(pair)
+        return HistoryResult(index, old.path, new.path, True, time.perf_counter() - start, output=output)
+    except Exception:
+        return HistoryResult(index, old.path, new.path, False, time.perf_counter() - start, error=traceback.format_exc())
@@ -8,7 +8,14 @@ from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 import difflib
+from collections.abc import Mapping
+from comparator import member_changes
 from dependency_tracer import DependencyTracer
+from payload_diff import is_payload_diff, pointer_change_lines
+from spec_source import spec_display_name
+from template_cache import load_template_document
+from template_variables import build_template_context, record_template_front_matter, substitute_in_elements, substitute_template_variables
+from streaming_writer import StreamingDocxWriter
 
 # OXML Helpers
 def get_or_add_child(parent, tag_name, ordering=None):
@@ -36,13 +43,18 @@ TBL_PR_ORDER = ['w:tblStyle', 'w:tblpPr', 'w:tblOverlap', 'w:bidiVisual', 'w:tbl
 TC_PR_ORDER = ['w:tcW', 'w:gridSpan', 'w:hMerge', 'w:vMerge', 'w:tcBorders', 'w:shd', 'w:noWrap', 'w:tcMar', 'w:textDirection', 'w:tcFitText', 'w:vAlign', 'w:hideMark']
 
 class ImpactDocxGenerator:
-    def __init__(self, old_spec, new_spec, diff, old_path=None, new_path=None, variables=None, template_path=None):
+    def __init__(self, old_spec, new_spec, diff, old_path=None, new_path=None, variables=None, template_path=None, scan_full_body=False, streaming=False, tracer=None, old_tracer=None):
         self.old_spec = old_spec
         self.new_spec = new_spec
         self.diff = diff
         self.old_path = old_path
         self.new_path = new_path
         self.variables = variables or {}
+        # Substitute placeholders in generated content too (slow on large reports)
+        self.scan_full_body = scan_full_body
+        # Write the report section by section instead of holding it all until save
+        self.streaming = streaming
+        self._writer = None
         
         # Template Loading Logic
         # 1. Specific template passed in (e.g., template_impact.docx)
@@ -57,14 +69,13 @@ class ImpactDocxGenerator:
         elif os.path.exists("template.docx"):
             self.template_path = "template.docx"
             
-        if self.template_path:
-            self.doc = Document(self.template_path)
-            self.has_template = True
-        else:
-            self.doc = Document()
-            self.has_template = False
-            
-        self._setup_styles()
+        # Parsed and styled once per template, then cloned for this report
+        self.has_template = bool(self.template_path)
+        self.doc = load_template_document(self.template_path, self._prepare_template,
+                                          prepare_key=type(self)._setup_styles.__qualname__)
+
+        # Template-owned body content (cover, front-matter) is where placeholders live
+        self._template_front_matter = record_template_front_matter(self.doc)
         
         if not self.has_template:
             self._setup_page_layout()
@@ -72,119 +83,75 @@ class ImpactDocxGenerator:
         self.analysis_insights = []
         self.checklist_items = []
         
-        # Initialize Dependency Tracers
-        self.tracer = DependencyTracer(new_spec)
-        self.tracer.resolve_transitive_impact()
+        # Initialize Dependency Tracers (resolved ones can be passed in, e.g. from IncrementalComparator)
+        self.tracer = tracer
+        if self.tracer is None:
+            self.tracer = DependencyTracer(new_spec)
+            self.tracer.resolve_transitive_impact()
         
-        self.old_tracer = DependencyTracer(old_spec)
-        self.old_tracer.resolve_transitive_impact()
+        self.old_tracer = old_tracer
+        if self.old_tracer is None:
+            self.old_tracer = DependencyTracer(old_spec)
+            self.old_tracer.resolve_transitive_impact()
             
         self._run_smart_analysis()
 
     def generate(self, output_path):
+        self._begin_output(output_path)
         self.doc.add_heading('OpenAPI Comparison - Impact Report', 0)
         self._add_spec_metadata()
         self._add_migration_notice()
+        self._flush_section()
         self._add_endpoint_impact_matrix()
+        self._flush_section()
         self._add_detailed_component_analysis()
+        self._flush_section()
         self._add_technical_deep_dive()
+        self._flush_section()
         self._add_implementation_checklist()
         
+        self._finish_output(output_path)
+        print(f"Impact Report generated at {output_path}")
+
+    def _begin_output(self, output_path):
+        """
+        Opens the streaming writer when streaming is enabled.
+        Placeholders are substituted before anything is flushed.
+        """
+        if not self.streaming:
+            return
+        self._process_template_variables()
+        before_write = None
+        if self.scan_full_body:
+            context = build_template_context(self.variables, self.old_path, self.new_path)
+            before_write = lambda elements: substitute_in_elements(self.doc, context, elements)
+        self._writer = StreamingDocxWriter(self.doc, output_path, before_write=before_write)
+
+    def _flush_section(self):
+        if self._writer:
+            self._writer.flush()
+
+    def _finish_output(self, output_path):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+            return
         # Variable Substitution (Final Step)
         self._process_template_variables()
-        
         self.doc.save(output_path)
-        print(f"Impact Report generated at {output_path}")
 
     def _process_template_variables(self):
         """
-        Replaces {{ variable }} placeholders in the document with values.
-        Prioritizes:
-        1. Dynamic Variables (date, time, filenames)
-        2. User Static Variables (from Preferences)
+        Replaces {{ variable }} placeholders with values in the template-owned parts
+        (headers, footers, front-matter). Set scan_full_body to also scan generated content.
         """
-        import datetime
-        import getpass
-        import sys
-        
-        # 1. Prepare Variables
-        context = self.variables.copy()
-        
-        # Dynamic Defaults
-        now = datetime.datetime.now()
-        context['date'] = now.strftime('%Y-%m-%d')
-        context['time'] = now.strftime('%H:%M')
-        context['datetime'] = now.strftime('%Y-%m-%d %H:%M:%S')
-        context['original_spec'] = os.path.basename(self.old_path) if self.old_path else "N/A"
-        context['new_spec'] = os.path.basename(self.new_path) if self.new_path else "N/A"
-        
-        # Enriched Variables
-        try:
-            context['user'] = getpass.getuser()
-        except:
-            context['user'] = "Unknown"
-            
-        context['platform'] = sys.platform
-        context['tool_version'] = "1.0.0"
-        
-        def get_size(path):
-            if path and os.path.exists(path):
-                size_bytes = os.path.getsize(path)
-                if size_bytes < 1024: return f"{size_bytes} B"
-                elif size_bytes < 1024*1024: return f"{size_bytes/1024:.1f} KB"
-                else: return f"{size_bytes/(1024*1024):.1f} MB"
-            return "N/A"
-            
-        context['file_size_old'] = get_size(self.old_path)
-        context['file_size_new'] = get_size(self.new_path)
-        
-        # 2. Iterate and Replace
-        # Body Paragraphs
-        for p in self.doc.paragraphs:
-            self._replace_text_in_paragraph(p, context)
-            
-        # Tables
-        for table in self.doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for p in cell.paragraphs:
-                        self._replace_text_in_paragraph(p, context)
-                        
-        # Headers & Footers
-        for section in self.doc.sections:
-            # Header
-            for p in section.header.paragraphs:
-                self._replace_text_in_paragraph(p, context)
-            for table in section.header.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for p in cell.paragraphs:
-                            self._replace_text_in_paragraph(p, context)
-                            
-            # Footer
-            for p in section.footer.paragraphs:
-                self._replace_text_in_paragraph(p, context)
-            for table in section.footer.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for p in cell.paragraphs:
-                            self._replace_text_in_paragraph(p, context)
-
-    def _replace_text_in_paragraph(self, paragraph, context):
-        if '{{' not in paragraph.text:
-            return
-            
-        # Improved approach: Check each run.
-        for run in paragraph.runs:
-            for key, value in context.items():
-                placeholder = f"{{{{ {key} }}}}"
-                placeholder_tight = f"{{{{{key}}}}}"
-                
-                if placeholder in run.text:
-                    run.text = run.text.replace(placeholder, str(value))
-                if placeholder_tight in run.text:
-                    run.text = run.text.replace(placeholder_tight, str(value))
+        context = build_template_context(self.variables, self.old_path, self.new_path)
+        substitute_template_variables(self.doc, context, self._template_front_matter, scan_full_body=self.scan_full_body)
 
+    def _prepare_template(self, doc):
+        # Applied once to the cached template prototype (see template_cache)
+        self.doc = doc
+        self._setup_styles()
 
     def _setup_styles(self):
         # Serif Title
@@ -272,7 +239,7 @@ class ImpactDocxGenerator:
         def get_info(spec, path):
             info = spec.get('info', {})
             return {
-                'file': os.path.basename(path) if path else "N/A",
+                'file': spec_display_name(path),
                 'title': info.get('title', 'N/A'),
                 'version': info.get('version', 'N/A')
             }
@@ -677,7 +644,7 @@ class ImpactDocxGenerator:
         Recursively extracts removed items from a diff structure.
         """
         found = []
-        if not isinstance(diff_node, dict): return found
+        if not isinstance(diff_node, Mapping): return found
 
         # 1. Handle Removed Parameters
         if 'parameters' in diff_node and diff_node['parameters'].get('removed'):
@@ -691,8 +658,9 @@ class ImpactDocxGenerator:
             found.append(f"Property Removed{loc}: {p_list}")
 
         # 3. Handle Enum removals
-        if 'enum' in diff_node and diff_node['enum'].get('removed'):
-             e_list = ", ".join(map(str, diff_node['enum']['removed']))
+        removed_values = member_changes(diff_node.get('enum'))[1]
+        if removed_values:
+             e_list = ", ".join(map(str, removed_values))
              found.append(f"Enum Values Removed: {e_list}")
 
         # 4. Handle Specific Logic (Body/Responses/Items)
@@ -877,7 +845,7 @@ class ImpactDocxGenerator:
         first = True
         for key, val in changes.items():
             if key == '__rename_info__': continue
-            if isinstance(val, dict) and 'old' in val and 'new' in val:
+            if isinstance(val, Mapping) and 'old' in val and 'new' in val:
                 if not first:
                     p.add_run("\n")
                 first = False
@@ -897,6 +865,13 @@ class ImpactDocxGenerator:
                     if len(old_v) > 50: old_v = old_v[:47] + "..."
                     if len(new_v) > 50: new_v = new_v[:47] + "..."
                     p.add_run(f"'{old_v}' \u2192 '{new_v}'")
+            elif is_payload_diff(val):
+                if not first:
+                    p.add_run("\n")
+                first = False
+                run = p.add_run(f"{key}: ")
+                run.font.bold = True
+                p.add_run("; ".join(pointer_change_lines(val, limit=3)))
 
     def _render_schema_diff_details(self, p, changes):
         # 1. Properties
@@ -918,12 +893,7 @@ class ImpactDocxGenerator:
 
         # 2. Required
         if 'required' in changes:
-            old_val = changes['required'].get('old')
-            new_val = changes['required'].get('new')
-            old_req = set(old_val if old_val is not None else [])
-            new_req = set(new_val if new_val is not None else [])
-            added = new_req - old_req
-            removed = old_req - new_req
+            added, removed = member_changes(changes['required'])
             
             for item in added:
                 self._add_symbol_run(p, "!", "DC3545") # Red (Breaking)
@@ -936,7 +906,7 @@ class ImpactDocxGenerator:
         for comb in ['oneOf', 'anyOf', 'allOf']:
             if comb in changes:
                 c_diff = changes[comb]
-                if isinstance(c_diff, dict) and 'added' in c_diff:
+                if isinstance(c_diff, Mapping) and 'added' in c_diff:
                         for item in c_diff['added']:
                             ref = item.get('$ref', 'Inline Schema')
                             self._add_symbol_run(p, "+", "17A2B8") # Cyan
@@ -0,0 +1,201 @@
+from typing import Any, Dict, Optional, Set, Tuple
+
+from comparator import (DiffResult, RENAME_COMPONENT_TYPES, _compare_info, _compare_path_item,
+                        _compare_servers, _compare_tags, _component_comparators, _detect_renamed_type)
+from dependency_tracer import DEREFERENCED_COMPONENT_TYPES, DependencyTracer, schema_children
+
+class IncrementalComparator:
+    """
+    Re-diffs successive versions of a "new" spec against a fixed old spec.
+
+    Keeps the previous new spec and the per-entry diffs of the previous run: compare() only
+    re-diffs the paths and components that are not equal (==) to the previous version's,
+    reruns rename detection only for the component types that depend on them, and keeps the
+    transitive dependency index (tracer()) until a change touches the refs it is built from.
+    Each compare() returns a new DiffResult holding the same changes as compare_specs.
+    A spec passed to compare() must not be modified afterwards: the next run diffs against it.
+    """
+    def __init__(self, old_spec: Dict[str, Any]):
+        self.old_spec = old_spec
+        self.new_spec = None
+        self.result: Optional[DiffResult] = None
+        # What the last compare() recomputed: ('info',), ('tags',), ('servers',), ('paths', path), ('components', type, name)
+        self.changed = set()
+
+        self._info_changes = {}
+        self._tags_changes = {}
+        self._servers_changes = {}
+        self._path_diffs = {}       # path -> diff, for paths in both specs that differ
+        self._component_diffs = {}  # comp_type -> {name: diff}, before rename detection
+        self._renames = {}          # comp_type -> {old name: diff annotated with __rename_info__}
+        self._ref_signatures = {}   # ('paths', path) / ('schemas', name) -> refs the tracer reads there
+        self._tracer = None
+        self._old_tracer = None
+
+    def compare(self, new_spec: Dict[str, Any]) -> DiffResult:
+        first_run = self.new_spec is None
+        prev = self.new_spec or {}
+        old_spec = self.old_spec
+        changed = set()
+
+        if first_run or prev.get('info', {}) != new_spec.get('info', {}):
+            result = DiffResult()
+            _compare_info(old_spec.get('info', {}), new_spec.get('info', {}), result)
+            self._info_changes = result.info_changes
+            changed.add(('info',))
+        if first_run or prev.get('tags', []) != new_spec.get('tags', []):
+            result = DiffResult()
+            _compare_tags(old_spec.get('tags', []), new_spec.get('tags', []), result)
+            self._tags_changes = result.tags_changes
+            changed.add(('tags',))
+        if first_run or prev.get('servers', []) != new_spec.get('servers', []):
+            result = DiffResult()
+            _compare_servers(old_spec.get('servers', []), new_spec.get('servers', []), result)
+            self._servers_changes = result.servers_changes
+            changed.add(('servers',))
+
+        changed_paths = _changed_keys(prev.get('paths') or {}, new_spec.get('paths') or {})
+        changed_comps = _changed_components(prev.get('components') or {}, new_spec.get('components') or {})
+        self._update_paths(new_spec, changed_paths)
+        self._update_components(new_spec, changed_comps)
+        self._update_ref_signatures(new_spec, changed_paths, changed_comps)
+
+        result = DiffResult()
+        result.info_changes = self._info_changes
+        result.tags_changes = self._tags_changes
+        result.servers_changes = self._servers_changes
+
+        old_paths = old_spec.get('paths', {})
+        new_paths = new_spec.get('paths', {})
+        result.new_paths = [p for p in new_paths if p not in old_paths]
+        result.removed_paths = [p for p in old_paths if p not in new_paths]
+        result.modified_paths = {p: self._path_diffs[p] for p in new_paths if p in self._path_diffs}
+
+        old_comps = old_spec.get('components', {})
+        new_comps = new_spec.get('components', {})
+        for comp_type in _component_comparators():
+            old_items = old_comps.get(comp_type, {})
+            new_items = new_comps.get(comp_type, {})
+            diffs = self._component_diffs.get(comp_type, {})
+            new_list = [n for n in new_items if n not in old_items]
+            removed_list = [n for n in old_items if n not in new_items]
+            modified = {n: diffs[n] for n in new_items if n in diffs}
+            # Same shape as _compare_components: a touched type has all three entries
+            if new_list or removed_list or modified:
+                result.new_components[comp_type] = new_list
+                result.removed_components[comp_type] = removed_list
+                result.modified_components[comp_type] = modified
+
+        # Renames depend on the whole type; schema renames also on refs in modified paths and components
+        touched_types = {comp_type for comp_type, _ in changed_comps}
+        for c_type in RENAME_COMPONENT_TYPES:
+            rerun = first_run or c_type in touched_types
+            if c_type == 'schemas':
+                rerun = rerun or bool(changed_paths) or bool(changed_comps)
+            if rerun:
+                _detect_renamed_type(result, old_spec, new_spec, c_type)
+                renamed = result.renamed_components.get(c_type, {})
+                self._renames[c_type] = {old: result.modified_components[c_type][old] for old in renamed}
+            else:
+                self._apply_renames(result, c_type)
+
+        self.new_spec = new_spec
+        changed.update(('paths', p) for p in changed_paths)
+        changed.update(('components',) + c for c in changed_comps)
+        self.changed = changed
+        self.result = result
+        return result
+
+    def _update_paths(self, new_spec, changed_paths):
+        old_paths = self.old_spec.get('paths', {})
+        new_paths = new_spec.get('paths', {})
+        for path in changed_paths:
+            self._path_diffs.pop(path, None)
+            if path in old_paths and path in new_paths and old_paths[path] != new_paths[path]:
+                path_diff = _compare_path_item(old_paths[path], new_paths[path])
+                if path_diff:
+                    self._path_diffs[path] = path_diff
+
+    def _update_components(self, new_spec, changed_comps):
+        comparators = _component_comparators()
+        old_comps = self.old_spec.get('components', {})
+        new_comps = new_spec.get('components', {})
+        for comp_type, name in changed_comps:
+            comparator = comparators.get(comp_type)
+            if comparator is None:
+                continue
+            diffs = self._component_diffs.setdefault(comp_type, {})
+            diffs.pop(name, None)
+            old_items = old_comps.get(comp_type, {})
+            new_items = new_comps.get(comp_type, {})
+            if name in old_items and name in new_items and old_items[name] != new_items[name]:
+                item_diff = comparator(old_items[name], new_items[name])
+                if item_diff:
+                    diffs[name] = item_diff
+
+    def _apply_renames(self, result: DiffResult, c_type: str):
+        renames = self._renames.get(c_type)
+        if not renames:
+            return
+        for old, diff in renames.items():
+            new_name = diff['__rename_info__']['new_name']
+            result.removed_components[c_type].remove(old)
+            result.new_components[c_type].remove(new_name)
+            result.modified_components[c_type][old] = diff
+            result.renamed_components.setdefault(c_type, {})[old] = new_name
+
+    def _update_ref_signatures(self, new_spec, changed_paths, changed_comps):
+        # The tracer reads schema refs in path items and between component schemas, and follows
+        # path items' refs into the request bodies, responses and parameters components
+        if any(c[0] in DEREFERENCED_COMPONENT_TYPES for c in changed_comps):
+            self._tracer = None
+        new_paths = new_spec.get('paths', {})
+        new_schemas = new_spec.get('components', {}).get('schemas', {})
+        keys = [('paths', p) for p in changed_paths] + [c for c in changed_comps if c[0] == 'schemas']
+        for key in keys:
+            kind, name = key
+            if kind == 'paths':
+                item = new_paths.get(name)
+                signature = DependencyTracer.path_usages(name, item) if item is not None else {}
+            else:
+                definition = new_schemas.get(name)
+                signature = schema_children(definition) if definition is not None else []
+            if signature != self._ref_signatures.get(key, type(signature)()):
+                self._tracer = None
+            if signature:
+                self._ref_signatures[key] = signature
+            else:
+                self._ref_signatures.pop(key, None)
+
+    def tracer(self) -> DependencyTracer:
+        """DependencyTracer (with transitive impact) of the current new spec, rebuilt only when refs changed."""
+        if self._tracer is None:
+            self._tracer = DependencyTracer(self.new_spec)
+            self._tracer.resolve_transitive_impact()
+        self._tracer.spec = self.new_spec
+        return self._tracer
+
+    def old_tracer(self) -> DependencyTracer:
+        """DependencyTracer (with transitive impact) of the old spec, built once."""
+        if self._old_tracer is None:
+            self._old_tracer = DependencyTracer(self.old_spec)
+            self._old_tracer.resolve_transitive_impact()
+        return self._old_tracer
+
+_MISSING = object()
+
+def _changed_keys(prev: Dict[Any, Any], new: Dict[Any, Any]) -> Set[Any]:
+    # Keys added, removed or whose values are not equal (== returns at once for shared subtrees)
+    changed = {k for k in prev if k not in new}
+    changed.update(k for k, v in new.items() if prev.get(k, _MISSING) != v)
+    return changed
+
+def _changed_components(prev: Dict[str, Any], new: Dict[str, Any]) -> Set[Tuple[str, str]]:
+    changed = set()
+    for comp_type in prev.keys() | new.keys():
+        prev_items, new_items = prev.get(comp_type), new.get(comp_type)
+        if isinstance(prev_items, dict) or isinstance(new_items, dict):
+            prev_items = prev_items if isinstance(prev_items, dict) else {}
+            new_items = new_items if isinstance(new_items, dict) else {}
+            changed.update((comp_type, name) for name in _changed_keys(prev_items, new_items))
+    return changed
@@ -0,0 +1,128 @@
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from comparator import (DiffResult, _compare_info, _compare_path_item, _compare_servers, _compare_tags,
+                        _component_comparators, _detect_renamed_components)
+from fingerprints import SpecFingerprints, spec_fingerprints
+
+class LazyDiffMapping(MutableMapping):
+    """
+    A modified_paths / modified_components[type] mapping whose entries are diffed on first access.
+
+    candidates are the keys whose fingerprints differ between the specs, in spec order: a
+    superset of the keys, known without diffing anything. A candidate whose diff turns out
+    empty (e.g. whitespace-only or reordered content) is not a key. Lookups and membership
+    tests compute only the entry asked for; iteration and len() compute every candidate.
+    """
+    def __init__(self, candidates: Iterable, compute: Callable[[Any], Dict]):
+        self.candidates = list(candidates)
+        self._candidate_set = set(self.candidates)
+        self._compute = compute
+        self._entries = {} # key -> diff ({} when computed and found equal)
+
+    def _entry(self, key):
+        if key not in self._entries:
+            if key not in self._candidate_set:
+                return None
+            self._entries[key] = self._compute(key)
+        return self._entries[key]
+
+    def __getitem__(self, key):
+        entry = self._entry(key)
+        if not entry:
+            raise KeyError(key)
+        return entry
+
+    def __setitem__(self, key, value):
+        if key not in self._candidate_set:
+            self.candidates.append(key)
+            self._candidate_set.add(key)
+        self._entries[key] = value
+
+    def __delitem__(self, key):
+        self[key]
+        self.candidates.remove(key)
+        self._candidate_set.discard(key)
+        del self._entries[key]
+
+    def __contains__(self, key):
+        return bool(self._entry(key))
+
+    def __iter__(self):
+        for key in list(self.candidates):
+            if self._entry(key):
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def is_computed(self, key) -> bool:
+        return key in self._entries
+
+    def __repr__(self):
+        computed = sum(1 for k in self.candidates if k in self._entries)
+        return f"<LazyDiffMapping {computed}/{len(self.candidates)} candidates computed>"
+
+    def __reduce__(self):
+        # Pickles (e.g. to report worker processes) as the plain dict it stands for
+        return (dict, (dict(self.items()),))
+
+def lazy_compare_specs(old_spec: Dict[str, Any], new_spec: Dict[str, Any], compact: bool = False,
+                       old_fps: Optional[SpecFingerprints] = None, new_fps: Optional[SpecFingerprints] = None) -> DiffResult:
+    """
+    compare_specs(lazy=True): info, tags, servers and the added/removed key lists are computed
+    up front; modified_paths and each modified_components[type] are LazyDiffMappings.
+    Rename detection runs up front too, but only diffs the entries it needs.
+    Fingerprints already computed for either spec can be passed in to skip hashing it again.
+    """
+    if compact:
+        from change_nodes import _compact
+        wrap = _compact
+    else:
+        wrap = lambda diff: diff
+
+    result = DiffResult()
+    _compare_info(old_spec.get('info', {}), new_spec.get('info', {}), result)
+    _compare_tags(old_spec.get('tags', []), new_spec.get('tags', []), result)
+    _compare_servers(old_spec.get('servers', []), new_spec.get('servers', []), result)
+
+    if old_fps is None:
+        old_fps = spec_fingerprints(old_spec)
+    if new_fps is None:
+        new_fps = spec_fingerprints(new_spec)
+
+    old_paths = old_spec.get('paths', {})
+    new_paths = new_spec.get('paths', {})
+    result.new_paths = [p for p in new_paths if p not in old_paths]
+    result.removed_paths = [p for p in old_paths if p not in new_paths]
+    result.modified_paths = LazyDiffMapping(
+        [p for p in new_paths if p in old_paths and old_fps.paths[p] != new_fps.paths[p]],
+        lambda p: wrap(_compare_path_item(old_paths[p], new_paths[p])))
+
+    old_comps = old_spec.get('components', {})
+    new_comps = new_spec.get('components', {})
+    for comp_type, comparator in _component_comparators().items():
+        old_items = old_comps.get(comp_type, {})
+        new_items = new_comps.get(comp_type, {})
+        old_type_fps = old_fps.components.get(comp_type, {})
+        new_type_fps = new_fps.components.get(comp_type, {})
+        new_list = [n for n in new_items if n not in old_items]
+        removed_list = [n for n in old_items if n not in new_items]
+        candidates = [n for n in new_items if n in old_items and old_type_fps[n] != new_type_fps[n]]
+        # Same shape as _compare_components: a touched type has all three entries
+        if new_list or removed_list or candidates:
+            result.new_components[comp_type] = new_list
+            result.removed_components[comp_type] = removed_list
+            result.modified_components[comp_type] = LazyDiffMapping(
+                candidates,
+                lambda n, comparator=comparator, old_items=old_items, new_items=new_items:
+                    wrap(comparator(old_items[n], new_items[n])))
+
+    _detect_renamed_components(result, old_spec, new_spec)
+    if compact:
+        # Rename detection stores plain diffs for the components it pairs up
+        for comp_type, renames in result.renamed_components.items():
+            modified = result.modified_components[comp_type]
+            for old in renames:
+                modified[old] = wrap(modified[old])
+    return result
@@ -1,33 +1,338 @@
 import argparse
 import sys
 import os
-from comparator import compare_specs, load_yaml
+import re
+import time
+import yaml
+from comparator import compare_specs
 from report_generator import ReportGenerator
+from incremental import IncrementalComparator
+from scope import ScopeFilter, scope_specs
+from spec_source import load_spec, spec_display_name, split_git_ref, uncompressed_name
 
 def main():
     parser = argparse.ArgumentParser(description="OpenAPI Diff Tool")
-    parser.add_argument("old_spec", help="Path to the old OpenAPI spec")
-    parser.add_argument("new_spec", help="Path to the new OpenAPI spec")
-    parser.add_argument("--format", choices=['markdown', 'docx'], default='markdown', help="Output format")
+    parser.add_argument("old_spec", nargs='?', help="Path to the old OpenAPI spec, or a git rev:path reference (e.g. v1.2:specs/api.yaml), or a manifest written with --write-manifest")
+    parser.add_argument("new_spec", nargs='?', help="Path to the new OpenAPI spec (YAML or JSON, optionally .gz/.bz2/.xz compressed), or a git rev:path reference")
+    parser.add_argument("--format", choices=['markdown', 'docx'], help="Output format (default: markdown)")
     parser.add_argument("--detail", choices=['synthetic', 'verbose'], default='synthetic', help="Level of detail")
     parser.add_argument("--output", help="Output file path")
     parser.add_argument("--style", choices=['enterprise', 'impact', 'analytic'], default='enterprise', help="Visual style (docx only)")
+    parser.add_argument("--reports", nargs='+', choices=['synthesis', 'analytical', 'impact'], help="Generate these DOCX reports in parallel (overrides --format/--style)")
+    parser.add_argument("--output-dir", default='.', help="Directory for the reports generated with --reports")
+    parser.add_argument("--streaming", action='store_true', help="Write DOCX reports section by section to bound memory use")
+    parser.add_argument("--group-affected-endpoints", action='store_true', help="Analytical report: render each distinct Affected Endpoints set once in an appendix")
+    parser.add_argument("--section-workers", type=int, help="Render the Analytical report sections in this many worker processes")
+    parser.add_argument("--save-diff", help="Save the diff (with the spec excerpts reports need) to this file; .gz compresses it")
+    parser.add_argument("--from-diff", help="Render from a diff saved with --save-diff instead of comparing specs")
+    parser.add_argument("--watch", action='store_true', help="Keep running and re-diff incrementally whenever new_spec is saved")
+    parser.add_argument("--summary", action='store_true', help="Print only the Change Matrix counts as JSON (no nested diff, no report)")
+    parser.add_argument("--history", nargs='+', metavar='SPEC', help="Diff each consecutive pair of these spec files (oldest first) in parallel; outputs go to one folder per pair under --output-dir")
+    parser.add_argument("--fleet", nargs='+', metavar='SPEC', help="Compare old_spec (the baseline) with each of these service specs in parallel and print a per-service summary as JSON; --reports/--format also write per-service reports under --output-dir")
+    parser.add_argument("--write-manifest", metavar='PATH', help="Write the fingerprint manifest of new_spec (or of old_spec when it is the only spec) to PATH and exit; a later run can pass it as old_spec instead of the spec; .gz compresses it")
+    parser.add_argument("--scope-path", action='append', default=[], metavar='GLOB', help="Only compare paths matching this glob, e.g. '/payments/**' (repeatable)")
+    parser.add_argument("--scope-tag", action='append', default=[], metavar='TAG', help="Only compare operations with this tag (repeatable)")
+    parser.add_argument("--scope-operation-id", action='append', default=[], metavar='PATTERN', help="Only compare operations whose operationId matches (repeatable)")
+    parser.add_argument("--scope-component", action='append', default=[], metavar='PATTERN', help="Also compare components matching this name pattern, e.g. 'Payment*' or 'schemas/Payment*' (repeatable)")
 
     args = parser.parse_args()
+    comparator = None
+    scope = ScopeFilter(paths=args.scope_path, tags=args.scope_tag,
+                        operation_ids=args.scope_operation_id, components=args.scope_component)
+    if scope and args.from_diff:
+        parser.error("scope filters apply when comparing specs, not to --from-diff")
 
-    # Load specs
+    if args.history:
+        if args.old_spec or args.from_diff or args.watch or args.summary or scope:
+            parser.error("--history takes the spec files itself and cannot be combined with old_spec/new_spec, --from-diff, --watch, --summary or scope filters")
+        if len(args.history) < 2:
+            parser.error("--history needs at least two spec files")
+        _write_history(args)
+        return
+
+    if args.fleet:
+        if not args.old_spec or args.new_spec or args.from_diff or args.watch or args.summary:
+            parser.error("--fleet takes the baseline as old_spec and cannot be combined with new_spec, --from-diff, --watch or --summary")
+        _write_fleet(args, scope)
+        return
+
+    if args.write_manifest:
+        if not args.old_spec or args.from_diff or args.watch or args.summary:
+            parser.error("--write-manifest needs a spec and cannot be combined with --from-diff, --watch or --summary")
+        _write_manifest(args)
+        return
+
+    if args.summary:
+        _write_summary(args, parser, scope)
+        return
+
+    if args.watch and args.new_spec and split_git_ref(args.new_spec):
+        parser.error("--watch needs new_spec to be a file, not a git rev:path reference")
+
+    if args.from_diff:
+        if args.watch:
+            parser.error("--watch needs old_spec and new_spec, not --from-diff")
+        from diff_store import load_diff
+        try:
+            saved = load_diff(args.from_diff)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        spec1, spec2, diff = saved.spec1, saved.spec2, saved.diff
+        old_path, new_path = saved.old_path, saved.new_path
+    else:
+        if not args.old_spec or not args.new_spec:
+            parser.error("old_spec and new_spec are required unless --from-diff is given")
+
+        # Load specs
+        try:
+            spec1 = _load_old_spec(args.old_spec)
+            old_path = args.old_spec
+            if not isinstance(spec1, dict):
+                # Reports need the old spec itself
+                old_path = spec1.source
+                spec1 = spec1.load_spec()
+            spec2 = load_spec(args.new_spec)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+
+        # Restrict both specs before comparing, so reports only see the scope too
+        full_spec1 = spec1
+        spec1, spec2 = scope_specs(spec1, spec2, scope)
+
+        # Compare
+        if args.watch:
+            # Keeps per-entry state so each save only re-diffs what changed
+            comparator = IncrementalComparator(spec1)
+            diff = comparator.compare(spec2)
+        else:
+            diff = compare_specs(spec1, spec2)
+        new_path = args.new_spec
+
+    if not _write_outputs(args, spec1, spec2, diff, old_path, new_path, comparator):
+        if not args.watch:
+            sys.exit(1)
+
+    if args.watch:
+        _watch(args, full_spec1, comparator, scope, old_path)
+
+def _write_summary(args, parser, scope):
+    """--summary: Change Matrix counts from the specs (or exact ones from a saved diff), as JSON."""
+    import json
+    from summary import change_matrix, summary_document
+
+    if args.from_diff:
+        from diff_store import load_diff
+        try:
+            saved = load_diff(args.from_diff)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        document = summary_document(change_matrix(saved.diff), saved.spec1, saved.spec2,
+                                    info_changed=bool(saved.diff.info_changes))
+    else:
+        if not args.old_spec or not args.new_spec:
+            parser.error("old_spec and new_spec are required unless --from-diff is given")
+        try:
+            spec1 = _load_old_spec(args.old_spec)
+            spec2 = load_spec(args.new_spec)
+            document = compare_specs(spec1, spec2, summary=True, scope=scope)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+
+    text = json.dumps(document, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"Summary written to {args.output}")
+    else:
+        print(text)
+
+def _write_manifest(args):
+    """--write-manifest: fingerprints of one spec, to compare later releases against without parsing it."""
+    from manifest import save_manifest, spec_manifest
+    source = args.new_spec or args.old_spec
     try:
-        spec1 = load_yaml(args.old_spec)
-        spec2 = load_yaml(args.new_spec)
-    except FileNotFoundError as e:
+        spec = load_spec(source)
+    except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}")
-        return
+        sys.exit(1)
+    save_manifest(args.write_manifest, spec_manifest(spec, source))
+    print(f"Manifest written to {args.write_manifest}")
+
+def _load_old_spec(source):
+    # A manifest stands in for the old spec (see manifest.compare_manifest)
+    from manifest import is_manifest_path, load_manifest
+    if is_manifest_path(source):
+        return load_manifest(source)
+    return load_spec(source)
+
+def _write_history(args):
+    """--history: the outputs of each consecutive pair, in one folder per pair under --output-dir."""
+    from functools import partial
+    from history import compare_history
+
+    # Resolved tracers are computed once per version only for the reports that read them
+    with_tracers = bool(set(args.reports or []) & {'analytical', 'impact'}) or \
+                   (not args.reports and args.format == 'docx' and args.style in ('impact', 'analytic'))
+
+    def on_progress(result):
+        label = f"{result.old_path} -> {result.new_path}"
+        if result.ok:
+            print(f"{label}: {result.output} ({result.elapsed:.1f}s)")
+        else:
+            print(f"{label}: FAILED\n{result.error}")
+
+    try:
+        results = compare_history(args.history, render=partial(_write_history_step, args),
+                                  with_tracers=with_tracers, on_progress=on_progress)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not all(r.ok for r in results):
+        sys.exit(1)
 
-    # Compare
-    diff = compare_specs(spec1, spec2)
+def _write_history_step(args, pair):
+    return _write_pair_outputs(args, f"{pair.index + 1:02d}_{_spec_stem(pair.old.path)}_to_{_spec_stem(pair.new.path)}", pair)
+
+def _write_fleet(args, scope):
+    """
+    --fleet: a JSON summary per service (to --output, or stdout) and, with --reports or --format,
+    the service's outputs in one folder per service under --output-dir. Progress goes to stderr.
+    """
+    import json
+    from functools import partial
+    from fleet import compare_fleet
+    from history import load_version
+
+    render = None
+    with_tracers = False
+    if args.reports or args.format or args.save_diff:
+        names = _service_names(args.fleet)
+        render = partial(_write_fleet_service, args, names)
+        with_tracers = bool(set(args.reports or []) & {'analytical', 'impact'}) or \
+                       (not args.reports and args.format == 'docx' and args.style in ('impact', 'analytic'))
+    else:
+        names = _service_names(args.fleet)
+
+    try:
+        # The baseline tracer describes the unscoped spec, so scoped reports build their own
+        baseline = load_version(args.old_spec, with_tracer=with_tracers and not scope)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    def on_progress(result):
+        if result.ok:
+            totals = result.summary['totals']
+            print(f"{names[result.index]}: {totals['new']} new, {totals['removed']} removed, "
+                  f"{totals['modified']} modified, {totals['renamed']} renamed ({result.elapsed:.1f}s)", file=sys.stderr)
+        else:
+            print(f"{names[result.index]}: FAILED\n{result.error}", file=sys.stderr)
+
+    results = compare_fleet(baseline, args.fleet, render=render, scope=scope, with_tracers=with_tracers, on_progress=on_progress)
+
+    services = []
+    for result in results:
+        entry = {'service': names[result.index], 'path': result.path, 'ok': result.ok}
+        if result.ok:
+            entry.update(result.summary)
+        else:
+            entry['error'] = result.error.strip().splitlines()[-1]
+        services.append(entry)
+    text = json.dumps({'baseline': args.old_spec, 'services': services}, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"Fleet summary written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    if not all(r.ok for r in results):
+        sys.exit(1)
+
+def _write_fleet_service(args, names, pair):
+    return _write_pair_outputs(args, names[pair.index], pair)
+
+def _service_names(paths):
+    # File stems, qualified by the parent folder when services share a file name (svc/openapi.yaml)
+    names = [_spec_stem(p) for p in paths]
+    if len(set(names)) < len(names):
+        parent = lambda p: os.path.basename(os.path.dirname((split_git_ref(p) or (None, os.path.abspath(p)))[1]))
+        names = [re.sub(r'[^\w.-]+', '_', f"{parent(p)}_{name}") for p, name in zip(paths, names)]
+    if len(set(names)) < len(names):
+        names = [f"{i + 1:03d}_{name}" for i, name in enumerate(names)]
+    return names
+
+def _spec_stem(source):
+    # 'api' for api.yaml (or api.yaml.gz), 'v1.2_api' for v1.2:specs/api.yaml; safe as a folder name
+    return re.sub(r'[^\w.-]+', '_', os.path.splitext(uncompressed_name(spec_display_name(source)))[0])
+
+def _write_pair_outputs(args, folder, pair):
+    # Runs in a history or fleet worker: the pairs already run in parallel, so reports render in-process
+    pair_dir = os.path.join(args.output_dir, folder)
+    os.makedirs(pair_dir, exist_ok=True)
+
+    pair_args = argparse.Namespace(**vars(args))
+    pair_args.output_dir = pair_dir
+    if args.save_diff:
+        pair_args.save_diff = os.path.join(pair_dir, os.path.basename(args.save_diff))
+    if not args.reports:
+        if args.format == 'docx':
+            name = 'report.docx' if args.style == 'enterprise' else f"report_{args.style}.docx"
+        else:
+            name = 'report.md'
+        pair_args.output = os.path.join(pair_dir, name)
+
+    if not _write_outputs(pair_args, pair.old.spec, pair.new.spec, pair.diff, pair.old.path, pair.new.path,
+                          comparator=pair, report_workers=1):
+        raise RuntimeError(f"A report failed for {pair.old.path} -> {pair.new.path}")
+    return pair_dir
+
+def _write_outputs(args, spec1, spec2, diff, old_path, new_path, comparator=None, report_workers=None):
+    """
+    Saves the diff and writes the requested report(s). Returns False if a report failed.
+    With an IncrementalComparator (or a history/fleet SpecPair), DOCX reports reuse its dependency tracers.
+    report_workers caps the processes --reports renders in.
+    """
+    if args.save_diff:
+        from diff_store import save_diff
+        save_diff(args.save_diff, diff, spec1, spec2, old_path=old_path, new_path=new_path)
+        print(f"Diff saved at {args.save_diff}")
+        if not args.reports and not args.format:
+            return True
+
+    fmt = args.format or 'markdown'
 
     # Generate Report
-    if args.format == 'markdown':
+    if args.reports:
+        from report_scheduler import ReportJob, render_reports
+        os.makedirs(args.output_dir, exist_ok=True)
+        jobs = [ReportJob(name, os.path.join(args.output_dir, f"report_{name}.docx")) for name in dict.fromkeys(args.reports)]
+        for job in jobs:
+            if args.streaming:
+                job.options['streaming'] = True
+            if job.name == 'analytical' and args.section_workers:
+                job.options['section_workers'] = args.section_workers
+            if job.name == 'analytical' and args.group_affected_endpoints:
+                job.options['group_affected_endpoints'] = True
+            if comparator and job.name in ('analytical', 'impact'):
+                job.options['tracer'] = comparator.tracer()
+                if job.name == 'impact':
+                    job.options['old_tracer'] = comparator.old_tracer()
+
+        def on_progress(name, status, result):
+            if status == 'done':
+                print(f"{name}: {result.output_path} ({result.elapsed:.1f}s)")
+            elif status == 'failed':
+                print(f"{name}: FAILED\n{result.error}")
+
+        results = render_reports(spec1, spec2, diff, jobs, old_path=old_path, new_path=new_path,
+                                 max_workers=report_workers, on_progress=on_progress)
+        return all(r.ok for r in results)
+
+    elif fmt == 'markdown':
         generator = ReportGenerator()
         report = generator.generate(diff, format='markdown', detail=args.detail, output_file=args.output)
         
@@ -36,14 +341,18 @@ def main():
         else:
             print(report)
             
-    elif args.format == 'docx':
+    elif fmt == 'docx':
         if args.style == 'impact':
             from impact_generator import ImpactDocxGenerator
-            generator = ImpactDocxGenerator(spec1, spec2, diff)
+            generator = ImpactDocxGenerator(spec1, spec2, diff, old_path=old_path, new_path=new_path, streaming=args.streaming,
+                                            tracer=comparator and comparator.tracer(), old_tracer=comparator and comparator.old_tracer())
             generator.generate(args.output or 'report_impact.docx')
         elif args.style == 'analytic':
             from analytic_generator import AnalyticDocxGenerator
-            generator = AnalyticDocxGenerator(spec1, spec2, diff)
+            generator = AnalyticDocxGenerator(spec1, spec2, diff, old_path=old_path, new_path=new_path,
+                                              section_workers=args.section_workers, streaming=args.streaming,
+                                              group_affected_endpoints=args.group_affected_endpoints,
+                                              tracer=comparator and comparator.tracer())
             generator.generate(args.output or 'report_analytic.docx')
         else:
             # Fallback or Enterprise (Legacy)
@@ -51,5 +360,43 @@ def main():
             generator = DocxReportGenerator(spec1, spec2, diff)
             generator.generate(args.output or 'report.docx')
 
+    return True
+
+def _watch(args, full_spec1, comparator, scope, old_path):
+    """Re-diffs and rewrites the outputs each time the new spec file changes, until interrupted."""
+    last_mtime = os.path.getmtime(args.new_spec)
+    print(f"Watching {args.new_spec} for changes (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+            try:
+                mtime = os.path.getmtime(args.new_spec)
+                if mtime == last_mtime:
+                    continue
+                last_mtime = mtime
+                spec2 = load_spec(args.new_spec)
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                # The file may be half-written; the next save triggers another attempt
+                print(f"Error: {e}")
+                continue
+            if not isinstance(spec2, dict):
+                continue
+
+            start = time.perf_counter()
+            spec1, spec2 = scope_specs(full_spec1, spec2, scope)
+            if spec1 is not comparator.old_spec and _scope_keys(spec1) != _scope_keys(comparator.old_spec):
+                # The edit changed which old components are in scope: new baseline
+                comparator = IncrementalComparator(spec1)
+            diff = comparator.compare(spec2)
+            print(f"Re-diffed {len(comparator.changed)} changed entries in {(time.perf_counter() - start) * 1000:.0f} ms")
+            _write_outputs(args, spec1, spec2, diff, old_path, args.new_spec, comparator)
+    except KeyboardInterrupt:
+        pass
+
+def _scope_keys(spec):
+    # The path and component names a scoped view keeps
+    components = spec.get('components') or {}
+    return list(spec.get('paths') or {}), {t: list(items) for t, items in components.items() if isinstance(items, dict)}
+
 if __name__ == "__main__":
     main()
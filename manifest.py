@@ -0,0 +1,279 @@
+import gzip
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from comparator import (DiffResult, RENAME_COMPONENT_TYPES, _component_comparators, json_pointer,
+                        split_json_pointer)
+from fingerprints import SpecFingerprints, fingerprint, spec_fingerprints
+from ref_index import spec_ref_index
+from scope import HTTP_METHODS
+from spec_source import load_spec, source_sha, split_git_ref
+
+# Bump when the layout (or the fingerprint function) changes
+MANIFEST_FORMAT = "openapi-manifest"
+MANIFEST_FORMAT_VERSION = 1
+
+# File names that main.py and the GUI read as manifests rather than specs
+MANIFEST_SUFFIXES = ('.manifest.json', '.manifest.json.gz')
+
+@dataclass
+class SpecManifest:
+    """
+    What a comparison needs to know about a spec without parsing it: the fingerprints of
+    its entries (spec_fingerprints), one per operation, the fingerprints of each tag and
+    server, the ref graph and the info title / version.
+
+    refs maps the JSON pointer of each path and component holding local component refs
+    to the pointers of the components it refers to ('/paths/~1pets' -> ['/components/schemas/Pet']).
+    source locates the full spec (a path, or a git rev:path) and source_sha its content,
+    for the comparisons that have to diff entries whose fingerprints differ.
+    """
+    fingerprints: SpecFingerprints
+    operations: Dict[str, Dict[str, bytes]] = field(default_factory=dict)
+    tags: Dict[str, bytes] = field(default_factory=dict)
+    servers: Dict[str, bytes] = field(default_factory=dict)
+    refs: Dict[str, List[str]] = field(default_factory=dict)
+    info: Dict[str, Any] = field(default_factory=dict)
+    source: Optional[str] = None
+    source_sha: Optional[str] = None
+
+    def load_spec(self) -> Dict[str, Any]:
+        """
+        The full spec the manifest was written for; raises when it is gone or has changed since,
+        including a change in a file it $refs (the bundled spec must give the same fingerprints).
+        """
+        if not self.source:
+            raise FileNotFoundError("The manifest does not say where its spec is")
+        if self.source_sha and source_sha(self.source) != self.source_sha:
+            raise ValueError(f"{self.source} has changed since its manifest was written")
+        spec = load_spec(self.source)
+        if spec_fingerprints(spec) != self.fingerprints:
+            raise ValueError(f"{self.source} (or a file it references) has changed since its manifest was written")
+        return spec
+
+def spec_manifest(spec: Dict[str, Any], source: Optional[str] = None,
+                  fps: Optional[SpecFingerprints] = None) -> SpecManifest:
+    """Builds the manifest of a parsed spec; fps skips hashing it again when already computed."""
+    manifest = SpecManifest(
+        fingerprints=fps or spec_fingerprints(spec),
+        info={k: (spec.get('info') or {}).get(k) for k in ('title', 'version')},
+        source=source,
+        source_sha=source_sha(source) if source else None,
+    )
+    for path, item in (spec.get('paths') or {}).items():
+        if isinstance(item, dict):
+            manifest.operations[path] = {m: fingerprint(item[m]) for m in HTTP_METHODS if m in item}
+    manifest.tags = {t['name']: fingerprint(t) for t in spec.get('tags', []) if isinstance(t, dict) and 'name' in t}
+    manifest.servers = {s['url']: fingerprint(s) for s in spec.get('servers', []) if isinstance(s, dict) and 'url' in s}
+
+    # Ref graph between entries: paths and components -> the components they refer to
+    for ref, pointers in spec_ref_index(spec).uses.items():
+        target = _entry_pointer(ref[1:]) if ref.startswith('#/components/') else None
+        if target is None:
+            continue
+        for pointer in pointers:
+            holder = _entry_pointer(pointer)
+            if holder is not None:
+                targets = manifest.refs.setdefault(holder, [])
+                if target not in targets:
+                    targets.append(target)
+    return manifest
+
+def save_manifest(path: str, manifest: SpecManifest):
+    """
+    Writes a manifest as compact JSON; a path ending in .gz is gzip-compressed.
+    A source path is stored relative to the manifest, so the two can be moved together.
+    """
+    source = manifest.source
+    if source and not split_git_ref(source):
+        source = os.path.relpath(os.path.abspath(source), os.path.dirname(os.path.abspath(path))).replace(os.sep, '/')
+    fps = manifest.fingerprints
+    document = {
+        'format': MANIFEST_FORMAT,
+        'version': MANIFEST_FORMAT_VERSION,
+        'source': source,
+        'source_sha': manifest.source_sha,
+        'info': manifest.info,
+        'fingerprints': {
+            'info': fps.info.hex(), 'tags': fps.tags.hex(), 'servers': fps.servers.hex(),
+            'paths': _hex(fps.paths),
+            'components': {comp_type: _hex(items) for comp_type, items in fps.components.items()},
+        },
+        'operations': {path: _hex(ops) for path, ops in manifest.operations.items()},
+        'tags': _hex(manifest.tags),
+        'servers': _hex(manifest.servers),
+        'refs': manifest.refs,
+    }
+    data = json.dumps(document, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+    if path.endswith('.gz'):
+        with gzip.open(path, 'wb') as f:
+            f.write(data)
+    else:
+        with open(path, 'wb') as f:
+            f.write(data)
+
+def load_manifest(path: str) -> SpecManifest:
+    """Reads a manifest written by save_manifest (gzip is detected from the content)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    document = json.loads(data.decode('utf-8'))
+
+    if not isinstance(document, dict) or document.get('format') != MANIFEST_FORMAT:
+        raise ValueError(f"{path} is not an OpenAPI spec manifest")
+    version = document.get('version')
+    if version != MANIFEST_FORMAT_VERSION:
+        raise ValueError(f"Unsupported manifest format version {version} in {path} (expected {MANIFEST_FORMAT_VERSION})")
+
+    source = document.get('source')
+    if source and not split_git_ref(source) and not os.path.isabs(source):
+        source = os.path.normpath(os.path.join(os.path.dirname(path), source))
+    fps = document['fingerprints']
+    return SpecManifest(
+        fingerprints=SpecFingerprints(
+            info=bytes.fromhex(fps['info']), tags=bytes.fromhex(fps['tags']), servers=bytes.fromhex(fps['servers']),
+            paths=_unhex(fps['paths']),
+            components={comp_type: _unhex(items) for comp_type, items in fps['components'].items()},
+        ),
+        operations={p: _unhex(ops) for p, ops in document.get('operations', {}).items()},
+        tags=_unhex(document.get('tags', {})),
+        servers=_unhex(document.get('servers', {})),
+        refs=document.get('refs', {}),
+        info=document.get('info', {}),
+        source=source,
+        source_sha=document.get('source_sha'),
+    )
+
+def is_manifest_path(path: Optional[str]) -> bool:
+    return bool(path) and path.endswith(MANIFEST_SUFFIXES)
+
+def compare_manifest(manifest: SpecManifest, new_spec: Dict[str, Any], summary: bool = False,
+                     lazy: bool = False, compact: bool = False) -> Union[DiffResult, Dict[str, Any]]:
+    """
+    compare_specs with the old side given by its manifest.
+
+    Added and removed paths and components come from the manifest's key sets, and nothing
+    else is needed when no entry's fingerprint differs and no component type has both
+    removals and additions (a possible rename). Otherwise the full old spec is loaded
+    (SpecManifest.load_spec) and only the entries whose fingerprints differ are diffed.
+
+    With summary=True the old spec is never required: modified entries are counted from
+    fingerprint mismatches, and when the old spec cannot be loaded renames are paired by
+    identical fingerprints (ties broken by the ref graph), which misses renamed schemas
+    whose descriptions changed too.
+    """
+    new_fps = spec_fingerprints(new_spec)
+    old_fps = manifest.fingerprints
+    renames_possible = any(
+        old_fps.components.get(t, {}).keys() - new_fps.components.get(t, {}).keys()
+        and new_fps.components.get(t, {}).keys() - old_fps.components.get(t, {}).keys()
+        for t in RENAME_COMPONENT_TYPES)
+
+    if summary:
+        from summary import summarize_specs
+        if renames_possible and manifest.source:
+            try:
+                old_spec = manifest.load_spec()
+            except (OSError, ValueError):
+                old_spec = None
+            if old_spec is not None:
+                return summarize_specs(old_spec, new_spec)
+        return _summarize_manifest(manifest, new_spec, new_fps)
+
+    modified = (old_fps.info != new_fps.info or old_fps.tags != new_fps.tags or old_fps.servers != new_fps.servers
+                or any(p in old_fps.paths and old_fps.paths[p] != fp for p, fp in new_fps.paths.items())
+                or any(n in old_fps.components.get(t, {}) and old_fps.components[t][n] != fp
+                       for t, items in new_fps.components.items() for n, fp in items.items()))
+    if modified or renames_possible:
+        from lazy_diff import lazy_compare_specs
+        result = lazy_compare_specs(manifest.load_spec(), new_spec, compact=compact and lazy, old_fps=old_fps, new_fps=new_fps)
+        if lazy:
+            return result
+        result.modified_paths = dict(result.modified_paths)
+        result.modified_components = {t: dict(items) for t, items in result.modified_components.items()}
+    else:
+        # Only additions and removals: the key sets say it all
+        result = DiffResult()
+        result.new_paths = [p for p in new_fps.paths if p not in old_fps.paths]
+        result.removed_paths = [p for p in old_fps.paths if p not in new_fps.paths]
+        for comp_type in _component_comparators():
+            old_items = old_fps.components.get(comp_type, {})
+            new_items = new_fps.components.get(comp_type, {})
+            new_list = [n for n in new_items if n not in old_items]
+            removed_list = [n for n in old_items if n not in new_items]
+            if new_list or removed_list:
+                result.new_components[comp_type] = new_list
+                result.removed_components[comp_type] = removed_list
+                result.modified_components[comp_type] = {}
+    if compact:
+        from change_nodes import compact_diff
+        result = compact_diff(result)
+    return result
+
+def _summarize_manifest(manifest: SpecManifest, new_spec: Dict[str, Any], new_fps: SpecFingerprints) -> Dict[str, Any]:
+    # summarize_specs from fingerprints alone
+    from summary import MATRIX_CATEGORIES, summary_document
+    old_fps = manifest.fingerprints
+    new_manifest = spec_manifest(new_spec, fps=new_fps)
+    matrix = {}
+    for label, section in MATRIX_CATEGORIES:
+        if section == 'paths':
+            old_items, new_items = old_fps.paths, new_fps.paths
+        elif section == 'tags':
+            old_items, new_items = manifest.tags, new_manifest.tags
+        elif section == 'servers':
+            old_items, new_items = manifest.servers, new_manifest.servers
+        else:
+            old_items, new_items = old_fps.components.get(section, {}), new_fps.components.get(section, {})
+        new = [n for n in new_items if n not in old_items]
+        removed = [n for n in old_items if n not in new_items]
+        modified = sum(1 for n in new_items if n in old_items and old_items[n] != new_items[n])
+        renamed = 0
+        if section in RENAME_COMPONENT_TYPES and new and removed:
+            paired = len(_fingerprint_renames(section, removed, new, old_items, new_items, manifest.refs, new_manifest.refs))
+            if section != 'schemas' and len(removed) - paired == 1 and len(new) - paired == 1:
+                paired += 1 # As the comparator: a single removal and addition left are one entry, modified
+            if section == 'schemas':
+                renamed = paired
+            else:
+                modified += paired
+            new, removed = new[paired:], removed[paired:]
+        matrix[label] = {'new': len(new), 'removed': len(removed), 'modified': modified, 'renamed': renamed}
+    return summary_document(matrix, {'info': manifest.info}, new_spec, info_changed=old_fps.info != new_fps.info)
+
+def _fingerprint_renames(comp_type, removed, new, old_items, new_items, old_refs, new_refs) -> Dict[str, str]:
+    # Removed entries paired with added ones of identical content; among several, the one
+    # referenced from the most of the same places wins, then the first by name
+    def holders(refs, name):
+        target = json_pointer('components', comp_type, name)
+        return {holder for holder, targets in refs.items() if target in targets}
+
+    renames = {}
+    taken = set()
+    for old_name in sorted(removed):
+        matches = [n for n in sorted(new) if n not in taken and new_items[n] == old_items[old_name]]
+        if len(matches) > 1:
+            old_holders = holders(old_refs, old_name)
+            matches.sort(key=lambda n: -len(old_holders & holders(new_refs, n)))
+        if matches:
+            renames[old_name] = matches[0]
+            taken.add(matches[0])
+    return renames
+
+def _entry_pointer(pointer: str) -> Optional[str]:
+    # '/paths/~1pets/get/...' -> '/paths/~1pets', '/components/schemas/Pet/...' -> '/components/schemas/Pet'
+    segments = split_json_pointer(pointer)
+    if len(segments) >= 2 and segments[0] == 'paths':
+        return json_pointer(*segments[:2])
+    if len(segments) >= 3 and segments[0] == 'components':
+        return json_pointer(*segments[:3])
+    return None
+
+def _hex(fps: Dict[Any, bytes]) -> Dict[Any, str]:
+    return {k: v.hex() for k, v in fps.items()}
+
+def _unhex(fps: Dict[Any, str]) -> Dict[Any, bytes]:
+    return {k: bytes.fromhex(v) for k, v in fps.items()}
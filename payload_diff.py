@@ -0,0 +1,154 @@
+import difflib
+import json
+from collections.abc import Mapping
+from typing import Any, Dict, List, Tuple
+
+from fingerprints import fingerprint
+
+# Renderers list at most this many changes per payload, each value cut to this many characters
+MAX_POINTERS_SHOWN = 20
+MAX_VALUE_CHARS = 120
+
+def diff_payload(old: Any, new: Any) -> Dict[str, Any]:
+    """
+    Structural diff of two example payloads (example / examples.value / encoding).
+
+    Returns {} when they are equal, {'changes': [...]} when both are mappings or both are
+    lists, and {'old': old, 'new': new} otherwise. Changes come in document order, shaped
+    like JSON Patch operations that also carry the values they replace:
+    {'op': 'replace', 'path', 'old', 'new'}, {'op': 'add', 'path', 'new'} and
+    {'op': 'remove', 'path', 'old'}. Paths are JSON Pointers (RFC 6901) into the new
+    payload, except those of removals, which point into the old one.
+
+    Equal subtrees are skipped without walking them: mapping values by ==, list items by
+    fingerprint. The list fingerprints also align the items, so an item inserted at the
+    front shows as one addition instead of a change at every later index.
+    """
+    if _equal(old, new):
+        return {}
+    if _kind(old) is None or _kind(old) != _kind(new):
+        return {'old': old, 'new': new}
+
+    changes = []
+    stack = [('diff', '', '', old, new)]
+    while stack:
+        task, old_path, new_path, old_value, new_value = stack.pop()
+        if task == 'add':
+            changes.append({'op': 'add', 'path': new_path, 'new': new_value})
+        elif task == 'remove':
+            changes.append({'op': 'remove', 'path': old_path, 'old': old_value})
+        elif _equal(old_value, new_value):
+            continue
+        elif _kind(old_value) is None or _kind(old_value) != _kind(new_value):
+            changes.append({'op': 'replace', 'path': new_path, 'old': old_value, 'new': new_value})
+        elif _kind(old_value) == 'mapping':
+            stack.extend(reversed(_mapping_tasks(old_path, new_path, old_value, new_value)))
+        else:
+            stack.extend(reversed(_list_tasks(old_path, new_path, old_value, new_value)))
+    return {'changes': changes}
+
+def is_payload_diff(change: Any) -> bool:
+    return isinstance(change, Mapping) and 'changes' in change
+
+def pointer_change_lines(change: Mapping, limit: int = MAX_POINTERS_SHOWN) -> List[str]:
+    """'path: old -> new' lines for a payload diff, at most limit of them plus a line counting the rest."""
+    lines = []
+    changes = change['changes']
+    for item in changes[:limit]:
+        path = item['path'] or '(root)'
+        if item['op'] == 'add':
+            lines.append(f"{path}: added {_preview(item['new'])}")
+        elif item['op'] == 'remove':
+            lines.append(f"{path}: removed {_preview(item['old'])}")
+        else:
+            lines.append(f"{path}: {_preview(item['old'])} -> {_preview(item['new'])}")
+    if len(changes) > limit:
+        lines.append(f"... {len(changes) - limit} more changed pointers")
+    return lines
+
+def pointer_change_sides(change: Mapping, limit: int = MAX_POINTERS_SHOWN) -> Tuple[List[str], List[str]]:
+    """The same changes split into old-side and new-side lines, for Old / New table cells."""
+    old_lines, new_lines = [], []
+    changes = change['changes']
+    for item in changes[:limit]:
+        path = item['path'] or '(root)'
+        if 'old' in item:
+            old_lines.append(f"{path}: {_preview(item['old'])}")
+        if 'new' in item:
+            new_lines.append(f"{path}: {_preview(item['new'])}")
+    if len(changes) > limit:
+        old_lines.append(f"... {len(changes) - limit} more changed pointers")
+        new_lines.append(old_lines[-1])
+    return old_lines, new_lines
+
+def _mapping_tasks(old_path, new_path, old_map, new_map):
+    tasks = []
+    for key, new_value in new_map.items():
+        token = _escape(key)
+        if key in old_map:
+            tasks.append(('diff', f"{old_path}/{token}", f"{new_path}/{token}", old_map[key], new_value))
+        else:
+            tasks.append(('add', None, f"{new_path}/{token}", None, new_value))
+    for key, old_value in old_map.items():
+        if key not in new_map:
+            tasks.append(('remove', f"{old_path}/{_escape(key)}", None, old_value, None))
+    return tasks
+
+def _list_tasks(old_path, new_path, old_list, new_list):
+    # Only the items between the common head and tail need aligning
+    start = 0
+    limit = min(len(old_list), len(new_list))
+    while start < limit and _equal(old_list[start], new_list[start]):
+        start += 1
+    old_end, new_end = len(old_list), len(new_list)
+    while old_end > start and new_end > start and _equal(old_list[old_end - 1], new_list[new_end - 1]):
+        old_end -= 1
+        new_end -= 1
+
+    try:
+        matcher = difflib.SequenceMatcher(None, [fingerprint(v) for v in old_list[start:old_end]],
+                                          [fingerprint(v) for v in new_list[start:new_end]])
+        opcodes = [(tag, i1 + start, i2 + start, j1 + start, j2 + start) for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
+    except RecursionError:
+        # Too deep to fingerprint: pair the items by position
+        opcodes = [('replace', start, old_end, start, new_end)]
+
+    tasks = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            continue
+        paired = min(i2 - i1, j2 - j1)
+        for k in range(paired):
+            tasks.append(('diff', f"{old_path}/{i1 + k}", f"{new_path}/{j1 + k}", old_list[i1 + k], new_list[j1 + k]))
+        for j in range(j1 + paired, j2):
+            tasks.append(('add', None, f"{new_path}/{j}", None, new_list[j]))
+        for i in range(i1 + paired, i2):
+            tasks.append(('remove', f"{old_path}/{i}", None, old_list[i], None))
+    return tasks
+
+def _kind(value):
+    if isinstance(value, Mapping):
+        return 'mapping'
+    if isinstance(value, list):
+        return 'list'
+    return None
+
+def _equal(v1, v2):
+    if v1 is v2:
+        return True
+    try:
+        return v1 == v2
+    except RecursionError:
+        return False
+
+def _escape(key):
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+def _preview(value):
+    try:
+        text = json.dumps(value, default=str, ensure_ascii=False)
+    except (TypeError, ValueError, RecursionError):
+        text = '(unprintable value)'
+    if len(text) > MAX_VALUE_CHARS:
+        text = text[:MAX_VALUE_CHARS - 3] + '...'
+    return text
@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+# Specs whose indexes are kept (the index holds its spec, so this also bounds the memory kept alive)
+REF_INDEX_CACHE_SIZE = 4
+
+_MISSING = object()
+
+class RefIndex:
+    """
+    Every $ref of a spec, resolved once.
+
+    targets maps each ref string found in the spec to the node it points to (None when it
+    does not resolve, e.g. a ref into another file); uses maps it to the JSON pointers of the
+    objects holding it, in document order. pointer(node) gives the JSON pointer of any object
+    or array of the spec. Only local refs ('#/components/schemas/Pet') resolve.
+    The spec must not be modified while the index is in use.
+    """
+    def __init__(self, spec: Any):
+        self.spec = spec
+        self.targets: Dict[str, Any] = {}
+        self.uses: Dict[str, List[str]] = {}
+        self._pointers: Dict[int, str] = {}
+
+        # Children are pushed in reverse so nodes are visited in document order
+        stack = [(spec, '')]
+        while stack:
+            node, pointer = stack.pop()
+            if id(node) in self._pointers:
+                continue # YAML aliases share nodes; the first occurrence names it
+            if isinstance(node, dict):
+                self._pointers[id(node)] = pointer
+                ref = node.get('$ref')
+                if isinstance(ref, str):
+                    self.uses.setdefault(ref, []).append(pointer)
+                children = [(v, f"{pointer}/{_escape(k)}") for k, v in node.items() if isinstance(v, (dict, list))]
+            elif isinstance(node, list):
+                self._pointers[id(node)] = pointer
+                children = [(v, f"{pointer}/{i}") for i, v in enumerate(node) if isinstance(v, (dict, list))]
+            else:
+                continue
+            stack.extend(reversed(children))
+
+        for ref in self.uses:
+            self.targets[ref] = self._lookup(ref)
+
+    def resolve(self, ref: Any) -> Any:
+        """The node a local ref points to, or None."""
+        target = self.targets.get(ref, _MISSING)
+        if target is _MISSING:
+            target = self._lookup(ref) if isinstance(ref, str) else None
+        return target
+
+    def pointer(self, node: Any) -> Optional[str]:
+        """JSON pointer of an object or array of the spec ('' for the spec itself), or None."""
+        return self._pointers.get(id(node))
+
+    def _lookup(self, ref: str) -> Any:
+        if not ref.startswith('#'):
+            return None
+        node = self.spec
+        for segment in split_pointer(ref[1:]):
+            if isinstance(node, dict):
+                node = node.get(segment, _MISSING)
+            elif isinstance(node, list) and segment.isdigit() and int(segment) < len(node):
+                node = node[int(segment)]
+            else:
+                return None
+            if node is _MISSING:
+                return None
+        return node
+
+_INDEXES: 'OrderedDict[int, RefIndex]' = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+
+def spec_ref_index(spec: Any) -> RefIndex:
+    """
+    The RefIndex of a spec, built on first use and shared by every caller that gets it for the
+    same spec object (comparator, DependencyTracer, generators).
+    """
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(id(spec))
+        if index is not None and index.spec is spec:
+            _INDEXES.move_to_end(id(spec))
+            return index
+    index = RefIndex(spec)
+    with _INDEXES_LOCK:
+        _INDEXES[id(spec)] = index
+        while len(_INDEXES) > REF_INDEX_CACHE_SIZE:
+            _INDEXES.popitem(last=False)
+    return index
+
+@lru_cache(maxsize=16384)
+def ref_name(ref: str) -> str:
+    """Name a ref points to: its last pointer segment ('Pet' for '#/components/schemas/Pet')."""
+    return ref.rpartition('/')[2].replace('~1', '/').replace('~0', '~')
+
+def split_pointer(pointer: str) -> List[str]:
+    return [s.replace('~1', '/').replace('~0', '~') for s in pointer.split('/')[1:]] if pointer else []
+
+def _escape(key: Any) -> str:
+    return str(key).replace('~', '~0').replace('/', '~1')
@@ -0,0 +1,130 @@
+import importlib
+import os
+import pickle
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Report name -> (module, generator class, default template file)
+REPORT_TYPES = {
+    'synthesis': ('synthetic_generator', 'SyntheticDocxGenerator', 'template_synthesis.docx'),
+    'analytical': ('analytic_generator', 'AnalyticDocxGenerator', 'template_analytical.docx'),
+    'impact': ('impact_generator', 'ImpactDocxGenerator', 'template_impact.docx'),
+}
+
+@dataclass
+class ReportJob:
+    name: str # 'synthesis', 'analytical' or 'impact'
+    output_path: str
+    template_path: Optional[str] = None # Defaults to templates/<default template>
+    options: Dict[str, Any] = field(default_factory=dict) # Extra generator keyword arguments
+
+@dataclass
+class ReportResult:
+    name: str
+    output_path: str
+    ok: bool
+    elapsed: float = 0.0
+    error: Optional[str] = None # Formatted traceback when ok is False
+
+def pack_payload(spec1: Dict[str, Any], spec2: Dict[str, Any], diff: Any, old_path: Optional[str] = None,
+                 new_path: Optional[str] = None, variables: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Serializes the shared inputs once into a compact picklable blob.
+    Specs and diff go into a single pickle so that sub-objects the diff shares
+    with the specs (old/new values, combinator items) are stored only once.
+    """
+    return pickle.dumps({
+        'spec1': spec1,
+        'spec2': spec2,
+        'diff': diff,
+        'old_path': old_path,
+        'new_path': new_path,
+        'variables': variables or {},
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+# Per-process payload, unpickled once by the pool initializer
+_WORKER_PAYLOAD: Optional[Dict[str, Any]] = None
+
+def _init_worker(payload: bytes):
+    global _WORKER_PAYLOAD
+    _WORKER_PAYLOAD = pickle.loads(payload)
+
+def _render_report(job: ReportJob) -> ReportResult:
+    start = time.perf_counter()
+    try:
+        module_name, class_name, default_template = REPORT_TYPES[job.name]
+        generator_cls = getattr(importlib.import_module(module_name), class_name)
+        data = _WORKER_PAYLOAD
+        template_path = job.template_path or os.path.join("templates", default_template)
+        gen = generator_cls(
+            data['spec1'],
+            data['spec2'],
+            data['diff'],
+            old_path=data['old_path'],
+            new_path=data['new_path'],
+            variables=data['variables'],
+            template_path=template_path,
+            **job.options
+        )
+        gen.generate(job.output_path)
+        return ReportResult(job.name, job.output_path, True, time.perf_counter() - start)
+    except Exception:
+        return ReportResult(job.name, job.output_path, False, time.perf_counter() - start, traceback.format_exc())
+
+def render_reports(spec1: Dict[str, Any], spec2: Dict[str, Any], diff: Any, jobs: List[ReportJob],
+                   old_path: Optional[str] = None, new_path: Optional[str] = None,
+                   variables: Optional[Dict[str, str]] = None, max_workers: Optional[int] = None,
+                   on_progress: Optional[Callable[[str, str, Optional[ReportResult]], None]] = None) -> List[ReportResult]:
+    """
+    Renders the requested DOCX reports concurrently in a process pool, all from one shared diff.
+    Wall time approaches that of the slowest report instead of the sum of all of them.
+
+    on_progress(name, status, result) is called in the calling process with status
+    'started' when a report is submitted and 'done' or 'failed' when it finishes.
+    A failing report never prevents the others from completing.
+    Results are returned in the order of the jobs.
+    """
+    def notify(name, status, result=None):
+        if on_progress:
+            on_progress(name, status, result)
+
+    for job in jobs:
+        if job.name not in REPORT_TYPES:
+            raise ValueError(f"Unknown report type: {job.name}")
+
+    payload = pack_payload(spec1, spec2, diff, old_path, new_path, variables)
+    results: Dict[int, ReportResult] = {}
+
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+
+    if len(jobs) <= 1 or max_workers <= 1:
+        # Nothing to overlap: render in this process
+        _init_worker(payload)
+        for i, job in enumerate(jobs):
+            notify(job.name, 'started')
+            results[i] = _render_report(job)
+            notify(job.name, 'done' if results[i].ok else 'failed', results[i])
+        return [results[i] for i in range(len(jobs))]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(payload,)) as pool:
+        futures = {}
+        for i, job in enumerate(jobs):
+            futures[pool.submit(_render_report, job)] = i
+            notify(job.name, 'started')
+
+        for future in as_completed(futures):
+            i = futures[future]
+            job = jobs[i]
+            try:
+                result = future.result()
+            except Exception:
+                # Worker crashed or the result could not be transferred
+                result = ReportResult(job.name, job.output_path, False, 0.0, traceback.format_exc())
+            results[i] = result
+            notify(job.name, 'done' if result.ok else 'failed', result)
+
+    return [results[i] for i in range(len(jobs))]
@@ -0,0 +1,196 @@
+import fnmatch
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+HTTP_METHODS = ['get', 'post', 'put', 'delete', 'patch', 'options', 'head', 'trace']
+COMPONENT_REF_PREFIX = '#/components/'
+
+@dataclass
+class ScopeFilter:
+    """
+    Restricts a comparison to one domain of the API.
+
+    paths: path globs; '*' matches within one segment, '**' across segments,
+           and a trailing '/**' also matches the prefix itself ('/payments/**' covers '/payments').
+    tags, operation_ids: fnmatch patterns on the operation's tags / operationId.
+    components: fnmatch patterns on component names, or on 'type/name' when they contain a '/'
+           (e.g. 'Payment*', 'schemas/Payment*').
+
+    An operation is in scope when it matches every endpoint filter given (any pattern of each).
+    Components are in scope when they are reachable through $refs from in-scope operations,
+    or match a component pattern. Without endpoint filters every path stays in scope, and
+    without any component pattern or endpoint filter every component does.
+    """
+    paths: List[str] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    operation_ids: List[str] = field(default_factory=list)
+    components: List[str] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.paths or self.tags or self.operation_ids or self.components)
+
+    def has_endpoint_filters(self) -> bool:
+        return bool(self.paths or self.tags or self.operation_ids)
+
+    def matches_path(self, path: str) -> bool:
+        return not self.paths or any(_glob_regex(p).fullmatch(path) for p in self.paths)
+
+    def matches_operation(self, operation: Dict[str, Any]) -> bool:
+        if self.tags:
+            op_tags = operation.get('tags') or []
+            if not any(fnmatch.fnmatchcase(str(t), p) for t in op_tags for p in self.tags):
+                return False
+        if self.operation_ids:
+            op_id = operation.get('operationId')
+            if op_id is None or not any(fnmatch.fnmatchcase(str(op_id), p) for p in self.operation_ids):
+                return False
+        return True
+
+    def matches_component(self, comp_type: str, name: str) -> bool:
+        for pattern in self.components:
+            target = f"{comp_type}/{name}" if '/' in pattern else name
+            if fnmatch.fnmatchcase(target, pattern):
+                return True
+        return False
+
+def parse_patterns(text: str) -> List[str]:
+    """Splits a comma- or whitespace-separated list of patterns (GUI fields, config values)."""
+    return [p for p in re.split(r'[,\s]+', text or '') if p]
+
+_GLOB_CACHE: Dict[str, Any] = {}
+
+def _glob_regex(pattern: str):
+    regex = _GLOB_CACHE.get(pattern)
+    if regex is None:
+        parts = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('/**', i) and i + 3 == len(pattern):
+                parts.append('(?:/.*)?')
+                i += 3
+            elif pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+            elif pattern[i] == '*':
+                parts.append('[^/]*')
+                i += 1
+            elif pattern[i] == '?':
+                parts.append('[^/]')
+                i += 1
+            else:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+        regex = _GLOB_CACHE[pattern] = re.compile(''.join(parts))
+    return regex
+
+def scope_specs(old_spec: Dict[str, Any], new_spec: Dict[str, Any], scope: ScopeFilter) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Returns views of both specs restricted to the scope, for compare_specs and the reports.
+    The component set is the union over both specs, so a component that only one side
+    still reaches is reported as added or removed rather than silently dropped.
+    Only in-scope operations and the components they reach are walked; the views share
+    every value with the original specs (nothing is copied below the path items).
+    """
+    if not scope:
+        return old_spec, new_spec
+
+    old_endpoints = _endpoint_scope(old_spec, scope)
+    new_endpoints = _endpoint_scope(new_spec, scope)
+
+    components = None
+    if scope.has_endpoint_filters() or scope.components:
+        components = set()
+        for spec, endpoints in ((old_spec, old_endpoints), (new_spec, new_endpoints)):
+            components |= _reachable_components(spec, endpoints, scope)
+
+    return _scoped_view(old_spec, old_endpoints, components, scope), _scoped_view(new_spec, new_endpoints, components, scope)
+
+def _endpoint_scope(spec: Dict[str, Any], scope: ScopeFilter) -> Dict[str, List[str]]:
+    # path -> in-scope methods
+    endpoints = {}
+    for path, item in (spec.get('paths') or {}).items():
+        if not isinstance(item, dict) or not scope.matches_path(path):
+            continue
+        methods = [m for m in HTTP_METHODS if isinstance(item.get(m), dict) and scope.matches_operation(item[m])]
+        if methods or not (scope.tags or scope.operation_ids):
+            endpoints[path] = methods
+    return endpoints
+
+def _reachable_components(spec: Dict[str, Any], endpoints: Dict[str, List[str]], scope: ScopeFilter) -> Set[Tuple[str, str]]:
+    comps = spec.get('components') or {}
+    roots = []
+    security_names = set()
+    if scope.has_endpoint_filters():
+        paths = spec.get('paths') or {}
+        global_security = spec.get('security') or []
+        for path, methods in endpoints.items():
+            item = paths[path]
+            roots.append(item.get('parameters'))
+            for method in methods:
+                operation = item[method]
+                roots.append(operation)
+                for requirement in operation.get('security', global_security) or []:
+                    if isinstance(requirement, dict):
+                        security_names.update(requirement)
+
+    reached = {('securitySchemes', name) for name in security_names}
+    if scope.components:
+        for comp_type, items in comps.items():
+            if isinstance(items, dict):
+                reached.update((comp_type, name) for name in items if scope.matches_component(comp_type, name))
+
+    # Follow refs through the component graph
+    stack = roots + [_get_component(comps, key) for key in reached]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        if isinstance(node, dict):
+            seen.add(id(node))
+            for key in _refs_in(node):
+                if key not in reached:
+                    reached.add(key)
+                    stack.append(_get_component(comps, key))
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            seen.add(id(node))
+            stack.extend(node)
+    return reached
+
+def _refs_in(node: Dict[str, Any]) -> Iterable[Tuple[str, str]]:
+    ref = node.get('$ref')
+    targets = [ref] if isinstance(ref, str) else []
+    # Discriminator mappings name schemas by ref too
+    mapping = node.get('mapping')
+    if isinstance(mapping, dict) and 'propertyName' in node:
+        targets.extend(v for v in mapping.values() if isinstance(v, str))
+    for target in targets:
+        if target.startswith(COMPONENT_REF_PREFIX):
+            parts = target[len(COMPONENT_REF_PREFIX):].split('/')
+            if len(parts) >= 2:
+                yield parts[0], parts[1].replace('~1', '/').replace('~0', '~')
+
+def _get_component(comps: Dict[str, Any], key: Tuple[str, str]):
+    items = comps.get(key[0])
+    return items.get(key[1]) if isinstance(items, dict) else None
+
+def _scoped_view(spec: Dict[str, Any], endpoints: Dict[str, List[str]], components, scope: ScopeFilter) -> Dict[str, Any]:
+    view = dict(spec)
+    if scope.has_endpoint_filters():
+        paths = spec.get('paths') or {}
+        view['paths'] = {
+            path: {k: v for k, v in paths[path].items() if k not in HTTP_METHODS or k in methods}
+            for path, methods in endpoints.items()
+        }
+    if components is not None:
+        view['components'] = {
+            comp_type: {name: item for name, item in items.items() if (comp_type, name) in components}
+            if isinstance(items, dict) else items
+            for comp_type, items in (spec.get('components') or {}).items()
+        }
+    if scope.tags and isinstance(spec.get('tags'), list):
+        view['tags'] = [t for t in spec['tags']
+                        if isinstance(t, dict) and any(fnmatch.fnmatchcase(str(t.get('name')), p) for p in scope.tags)]
+    return view
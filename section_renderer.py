@@ -0,0 +1,182 @@
+import importlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn
+from lxml import etree
+
+STYLE_REF_TAGS = (qn('w:pStyle'), qn('w:rStyle'), qn('w:tblStyle'))
+
+@dataclass
+class Fragment:
+    """
+    One rendered section, as WordprocessingML ready to be stitched into another document.
+    styles holds the definitions of styles the section created (id -> w:style XML),
+    numbering those of list instances it created (numId -> (w:num XML, w:abstractNum XML)).
+    """
+    xml: bytes
+    styles: Dict[str, bytes] = field(default_factory=dict)
+    numbering: Dict[str, Tuple[bytes, bytes]] = field(default_factory=dict)
+
+# Per-process generator and the style/numbering ids its template already defines
+_WORKER_GENERATOR = None
+_WORKER_BASE_STYLES: set = set()
+_WORKER_BASE_NUMS: set = set()
+
+def _init_worker(payload: bytes):
+    global _WORKER_GENERATOR, _WORKER_BASE_STYLES, _WORKER_BASE_NUMS
+    data = pickle.loads(payload)
+    module_name, class_name = data.pop('generator')
+    generator_cls = getattr(importlib.import_module(module_name), class_name)
+    _WORKER_GENERATOR = generator_cls(**data)
+    _WORKER_BASE_STYLES = _style_ids(_WORKER_GENERATOR.doc)
+    _WORKER_BASE_NUMS = set(_num_elements(_WORKER_GENERATOR.doc))
+
+def _render_section(section: Tuple) -> Fragment:
+    gen = _WORKER_GENERATOR
+    body = gen.doc.element.body
+    sect_pr = body.sectPr
+    before = len(body)
+    start = body.index(sect_pr) if sect_pr is not None else before
+
+    method_name, args = section[0], section[1:]
+    getattr(gen, method_name)(*args)
+
+    # Move the new elements out of the body, leaving the document as it was for the next section
+    wrapper = OxmlElement('w:body')
+    for el in list(body)[start:start + len(body) - before]:
+        wrapper.append(el)
+
+    fragment = Fragment(etree.tostring(wrapper))
+
+    used_styles = {el.get(qn('w:val')) for el in wrapper.iter(*STYLE_REF_TAGS)}
+    new_styles = used_styles - _WORKER_BASE_STYLES
+    if new_styles:
+        for style in gen.doc.styles.element.iterchildren(qn('w:style')):
+            if style.get(qn('w:styleId')) in new_styles:
+                fragment.styles[style.get(qn('w:styleId'))] = etree.tostring(style)
+
+    used_nums = {el.get(qn('w:val')) for el in wrapper.iter(qn('w:numId'))} - _WORKER_BASE_NUMS - {'0'}
+    if used_nums:
+        nums = _num_elements(gen.doc)
+        abstracts = _abstract_num_elements(gen.doc)
+        for num_id in used_nums:
+            num = nums.get(num_id)
+            if num is None:
+                continue
+            abstract = abstracts[num.find(qn('w:abstractNumId')).get(qn('w:val'))]
+            fragment.numbering[num_id] = (etree.tostring(num), etree.tostring(abstract))
+
+    return fragment
+
+def render_sections(generator, sections: List[Tuple], max_workers: Optional[int] = None):
+    """
+    Starts rendering the given sections of an AnalyticDocxGenerator (or subclass) in worker processes.
+    A section is (method_name, *args), e.g. ('_add_endpoints',) or ('_add_component_type', 'schemas').
+
+    Each worker builds its own generator from the same inputs once, then renders sections into
+    its own copy of the template and ships them back as Fragments.
+    Returns an iterator of Fragments in the order of the sections; the caller stitches them
+    with stitch_fragment while it keeps rendering its own parts.
+    """
+    payload = pickle.dumps({
+        'generator': (type(generator).__module__, type(generator).__name__),
+        'spec1': generator.spec1,
+        'spec2': generator.spec2,
+        'diff': generator.diff,
+        'old_path': generator.old_path,
+        'new_path': generator.new_path,
+        'variables': generator.variables,
+        'template_path': generator.template_path,
+        'group_affected_endpoints': generator.group_affected_endpoints,
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    if max_workers is None:
+        max_workers = min(len(sections), os.cpu_count() or 1)
+
+    pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(payload,))
+    try:
+        futures = [pool.submit(_render_section, section) for section in sections]
+    except Exception:
+        pool.shutdown(cancel_futures=True)
+        raise
+
+    def results():
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    return results()
+
+def stitch_fragment(doc, fragment: Fragment):
+    """
+    Appends a rendered section to the end of the document body (before the final sectPr).
+    Styles the section created are imported when missing, and list instances it created
+    get fresh numbering ids so that fragments from different workers never collide.
+    """
+    wrapper = parse_xml(fragment.xml)
+
+    if fragment.styles:
+        existing = _style_ids(doc)
+        styles_el = doc.styles.element
+        for style_id, style_xml in fragment.styles.items():
+            if style_id not in existing:
+                styles_el.append(parse_xml(style_xml))
+
+    if fragment.numbering:
+        numbering_el = doc.part.numbering_part.element
+        remap = {}
+        for num_id, (num_xml, abstract_xml) in fragment.numbering.items():
+            abstract = parse_xml(abstract_xml)
+            abstract_id = str(_next_id(numbering_el, 'w:abstractNum', 'w:abstractNumId'))
+            abstract.set(qn('w:abstractNumId'), abstract_id)
+            # abstractNum definitions must precede all num elements
+            first_num = numbering_el.find(qn('w:num'))
+            if first_num is not None:
+                first_num.addprevious(abstract)
+            else:
+                numbering_el.append(abstract)
+
+            num = parse_xml(num_xml)
+            new_num_id = str(_next_id(numbering_el, 'w:num', 'w:numId'))
+            num.set(qn('w:numId'), new_num_id)
+            num.find(qn('w:abstractNumId')).set(qn('w:val'), abstract_id)
+            numbering_el.append(num)
+            remap[num_id] = new_num_id
+
+        for el in wrapper.iter(qn('w:numId')):
+            val = el.get(qn('w:val'))
+            if val in remap:
+                el.set(qn('w:val'), remap[val])
+
+    body = doc.element.body
+    sect_pr = body.sectPr
+    for el in list(wrapper):
+        if sect_pr is not None:
+            sect_pr.addprevious(el)
+        else:
+            body.append(el)
+
+def _style_ids(doc) -> set:
+    return {s.get(qn('w:styleId')) for s in doc.styles.element.iterchildren(qn('w:style'))}
+
+def _num_elements(doc) -> Dict[str, Any]:
+    try:
+        numbering_el = doc.part.numbering_part.element
+    except NotImplementedError:
+        return {}
+    return {n.get(qn('w:numId')): n for n in numbering_el.iterchildren(qn('w:num'))}
+
+def _abstract_num_elements(doc) -> Dict[str, Any]:
+    numbering_el = doc.part.numbering_part.element
+    return {a.get(qn('w:abstractNumId')): a for a in numbering_el.iterchildren(qn('w:abstractNum'))}
+
+def _next_id(numbering_el, tag, attr) -> int:
+    ids = [int(el.get(qn(attr))) for el in numbering_el.iterchildren(qn(tag))]
+    return max(ids, default=0) + 1
@@ -0,0 +1,279 @@
+import atexit
+import bz2
+import gzip
+import hashlib
+import json
+import lzma
+import mmap
+import os
+import posixpath
+import re
+import subprocess
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
+
+# Source bytes of the parsed documents kept; parsed YAML takes about ten times as much memory
+SPEC_CACHE_BYTES = 32 * 1024 * 1024
+
+# A $ref whose value does not start with '#' (YAML or JSON), i.e. one into another file
+_EXTERNAL_REF = re.compile(rb'\$ref[\'"]?\s*:\s*[\'"]?[^\'"#\s]')
+
+# JSON numbers YAML reads as floats; other exponent forms ('1e5', '1.0e5') are strings to YAML
+_YAML_FLOAT = re.compile(r'-?[0-9]+\.[0-9]*(?:[eE][-+][0-9]+)?$')
+
+# Maps digits and signs to '0' (and 'E' to 'e'), to find exponents and long integers with substring searches
+_DIGITS = bytes.maketrans(b'123456789+-E', b'00000000000e')
+_SCAN_CHUNK = 1024 * 1024
+
+# Compressed inputs, told apart by their magic bytes: (magic, module with open() / decompress())
+_COMPRESSIONS = ((b'\x1f\x8b', gzip), (b'BZh', bz2), (b'\xfd7zXZ\x00', lzma))
+COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.xz')
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class GitBlobReader:
+    """
+    Reads files out of git history through one long-lived `git cat-file --batch` process,
+    so any number of rev:path lookups cost a single fork and never need a checkout.
+    Object names are resolved by git itself, relative to the repository containing repo_dir
+    (the current directory by default): 'v1.2:specs/api.yaml', 'HEAD~3:./api.yaml'.
+    """
+    def __init__(self, repo_dir: Optional[str] = None):
+        self.repo_dir = repo_dir
+        self._process = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def read(self, name: str) -> Tuple[str, bytes]:
+        """(blob SHA, content) of the file an object name points to."""
+        if '\n' in name:
+            raise ValueError(f"Invalid git object name: {name!r}")
+        with self._lock:
+            process = self._start()
+            process.stdin.write(name.encode('utf-8') + b'\n')
+            process.stdin.flush()
+            header = process.stdout.readline()
+            if not header:
+                self._process = None
+                error = process.stderr.read().decode('utf-8', 'replace').strip()
+                raise FileNotFoundError(f"Cannot read {name} from git: {error or 'git cat-file exited'}")
+            fields = header.split()
+            if fields[-1] in (b'missing', b'ambiguous'):
+                raise FileNotFoundError(f"No such file in git: {name} ({fields[-1].decode()})")
+            sha, kind, size = fields
+            content = process.stdout.read(int(size))
+            process.stdout.read(1) # Newline after the content
+        if kind != b'blob':
+            raise FileNotFoundError(f"{name} is a git {kind.decode()}, not a file")
+        return sha.decode('ascii'), content
+
+    def close(self):
+        with self._lock:
+            if self._process is not None and self._pid == os.getpid():
+                self._process.stdin.close()
+                self._process.wait()
+            self._process = None
+
+    def _start(self):
+        # A forked worker inherits the parent's pipes, which it must not share
+        if self._process is None or self._pid != os.getpid() or self._process.poll() is not None:
+            try:
+                self._process = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=self.repo_dir,
+                                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            except FileNotFoundError:
+                raise FileNotFoundError("git is needed to read rev:path specs but was not found on PATH") from None
+            self._pid = os.getpid()
+        return self._process
+
+class SpecCache:
+    """
+    Parsed documents (specs and the files they $ref) keyed by content: git blob SHAs, which
+    identify a file's content wherever it is read from, so a document shared by several
+    revisions (or by a revision and the working tree) is parsed once. Keeps the most recently
+    used documents, up to SPEC_CACHE_BYTES of source.
+    Callers share the cached objects and must not modify them.
+    """
+    def __init__(self, max_bytes: int = SPEC_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, data: bytes, source: Optional[str] = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+        document = parse_document(data, source)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (document, len(data))
+                self._size += len(data)
+            # The newest entry stays even when it alone exceeds the budget
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                self._size -= self._entries.popitem(last=False)[1][1]
+        return document
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+# Process-wide, shared by the CLI, history and fleet modes and the GUI
+GIT_READER = GitBlobReader()
+SPEC_CACHE = SpecCache()
+atexit.register(GIT_READER.close)
+
+def split_git_ref(source: str) -> Optional[Tuple[str, str]]:
+    """(rev, path) when source is a rev:path reference rather than a file on disk."""
+    if os.path.exists(source):
+        return None
+    rev, sep, path = source.partition(':')
+    # 'C:\specs\api.yaml' is a Windows path, not revision C
+    if not sep or not rev or (os.name == 'nt' and len(rev) == 1):
+        return None
+    return rev, path
+
+def load_spec(source: str) -> Dict[str, Any]:
+    """
+    Parses a spec from a file path or a git rev:path reference ('v1.2:specs/api.yaml'),
+    through the shared SPEC_CACHE. A spec with $refs into other files is bundled
+    (see document_loader), so the result only holds local refs.
+    """
+    key, data = _read(source)
+    spec = SPEC_CACHE.get(key, data, source)
+    if not _EXTERNAL_REF.search(data):
+        return spec
+    from document_loader import DocumentLoader
+    return DocumentLoader().load(source, spec)
+
+def load_document(source: str) -> Any:
+    """One parsed file, as is (no $ref handling), through the shared SPEC_CACHE."""
+    return SPEC_CACHE.get(*_read(source), source)
+
+def parse_document(data: bytes, source: Optional[str] = None) -> Any:
+    """
+    Parses a YAML or JSON document. JSON (a .json source, or content starting with '{' or
+    '[') goes through orjson when installed, or the json module, which are many times faster
+    than the YAML parser; the result is the same as YAML's, and anything the JSON parsers
+    reject or would read differently is left to the YAML parser.
+    """
+    if data[:3] == b'\xef\xbb\xbf':
+        data = data[3:]
+    # YAML keeps escaped surrogate pairs as two characters and folds a raw NEL (U+0085) in a
+    # string to a space, which no JSON parser does
+    if (_is_json(data, source) and data.find(b'\\ud') < 0 and data.find(b'\\uD') < 0
+            and data.find(b'\xc2\x85') < 0):
+        try:
+            if orjson is not None and _orjson_safe(data):
+                return orjson.loads(memoryview(data))
+            return json.loads(str(data, 'utf-8'), parse_float=_yaml_float, parse_constant=_reject_constant)
+        except ValueError:
+            pass
+    return yaml.safe_load(str(data, 'utf-8'))
+
+def read_file(path: str) -> bytes:
+    """
+    A file's content, memory-mapped rather than copied (empty files give b''). A gzip, bz2 or
+    xz file is decompressed as it is read, straight into memory.
+    """
+    with open(path, 'rb') as f:
+        compression = _compression(f.read(6))
+        if compression is not None:
+            f.seek(0)
+            try:
+                with compression.open(f) as stream:
+                    return stream.read()
+            except (OSError, EOFError, lzma.LZMAError, zlib.error) as e:
+                raise ValueError(f"Cannot decompress {path}: {e}") from None
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def uncompressed_name(path: str) -> str:
+    """'api.yaml' for 'api.yaml.gz' (and .bz2 / .xz); other names as they are."""
+    root, ext = os.path.splitext(path)
+    return root if ext.lower() in COMPRESSED_SUFFIXES else path
+
+def source_sha(source: str) -> str:
+    """Blob SHA of a source's current content (the key it is cached under)."""
+    return _read(source)[0]
+
+def resolve_source(base: str, relative: str) -> str:
+    """The source a path relative to the file base names: a file path, or a rev:path in the same revision."""
+    ref = split_git_ref(base)
+    if ref is None:
+        return os.path.normpath(os.path.join(os.path.dirname(base), relative))
+    rev, path = ref
+    resolved = posixpath.normpath(posixpath.join(posixpath.dirname(path), relative))
+    # 'rev:./path' is relative to the current directory, 'rev:path' to the repository root
+    if path.startswith(('./', '../')) and not resolved.startswith('../'):
+        resolved = './' + resolved
+    return f"{rev}:{resolved}"
+
+def _read(source: str) -> Tuple[str, bytes]:
+    # (cache key, content): the blob SHA git reports, or the one it would give the file;
+    # for compressed input, the SHA of the decompressed content
+    if split_git_ref(source):
+        sha, data = GIT_READER.read(source)
+        compression = _compression(data)
+        if compression is None:
+            return sha, data
+        try:
+            data = compression.decompress(data)
+        except (OSError, EOFError, lzma.LZMAError, zlib.error) as e:
+            raise ValueError(f"Cannot decompress {source}: {e}") from None
+    else:
+        data = read_file(source)
+    return git_blob_sha(data), data
+
+def _compression(data: bytes):
+    for magic, module in _COMPRESSIONS:
+        if data[:len(magic)] == magic:
+            return module
+    return None
+
+def git_blob_sha(data: bytes) -> str:
+    """The SHA git gives a blob with this content (as `git hash-object` does)."""
+    h = hashlib.sha1(b'blob %d\0' % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+def spec_display_name(source: Optional[str]) -> str:
+    """File name for reports: 'api.yaml', or 'v1.2:api.yaml' for a git reference."""
+    if not source:
+        return "N/A"
+    ref = split_git_ref(source)
+    if ref:
+        return f"{ref[0]}:{os.path.basename(ref[1])}"
+    return os.path.basename(source)
+
+def _is_json(data: bytes, source: Optional[str]) -> bool:
+    if source and uncompressed_name(source).lower().endswith('.json'):
+        return True
+    match = re.match(rb'\s*([\[{])', data[:64])
+    return match is not None
+
+def _orjson_safe(data: bytes) -> bool:
+    # orjson reads exponents the JSON way and integers past 64 bits as floats. Scanned in
+    # chunks (overlapping by the longest pattern) so a mapped file is never copied whole
+    for start in range(0, len(data), _SCAN_CHUNK):
+        digits = data[max(start - 18, 0):start + _SCAN_CHUNK].translate(_DIGITS)
+        if b'0e0' in digits or b'0' * 19 in digits:
+            return False
+    return True
+
+def _yaml_float(literal: str) -> Any:
+    return float(literal) if _YAML_FLOAT.match(literal) else literal
+
+def _reject_constant(name: str):
+    # NaN / Infinity are strings to YAML
+    raise ValueError(f"Unsupported JSON constant {name}")
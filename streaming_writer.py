@@ -0,0 +1,112 @@
+import re
+import zipfile
+from typing import Callable, List, Optional
+
+from docx.opc.pkgwriter import _ContentTypesItem
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.oxml.ns import qn
+from lxml import etree
+
+# A namespace declaration in a serialized start tag: (prefix or b'', uri)
+_XMLNS = re.compile(rb'\s+xmlns(?::([\w.-]+))?="([^"]*)"')
+
+class StreamingDocxWriter:
+    """
+    Writes a python-docx Document to disk section by section instead of all at once.
+
+    The main document part (word/document.xml) is streamed into the zip archive: every
+    flush() serializes the body elements added since the previous flush and removes them
+    from the in-memory tree, so peak memory is bounded by the largest section rather than
+    the whole report. All other parts (styles, numbering, headers, footers, relationships)
+    are small and are written by close(), so they may still change until then.
+
+    Flushed content is final: anything that edits it (e.g. {{ variable }} substitution)
+    must happen before the flush or through before_write(elements).
+    """
+    def __init__(self, doc, output_path: str, before_write: Optional[Callable[[List], None]] = None):
+        self.doc = doc
+        self.before_write = before_write
+        self._zip = zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED)
+        self._stream = None
+        try:
+            self._stream = self._zip.open(doc.part.partname.membername, 'w', force_zip64=True)
+            head, self._tail = self._document_shell()
+            self._declared = {((prefix or '').encode(), uri.encode()) for prefix, uri in doc.element.nsmap.items()}
+            self._stream.write(head)
+        except Exception:
+            self.abort()
+            raise
+
+    def _document_shell(self):
+        # Serialize w:document with an empty body and split it around the body
+        body = self.doc.element.body
+        children = list(body)
+        for el in children:
+            body.remove(el)
+        try:
+            xml = etree.tostring(self.doc.element, encoding='UTF-8', standalone=True)
+        finally:
+            for el in children:
+                body.append(el)
+        marker = xml.rindex(b'<w:body/>')
+        return xml[:marker] + b'<w:body>', b'</w:body>' + xml[marker + len(b'<w:body/>'):]
+
+    def flush(self):
+        """Writes and releases every body element added since the last flush (the final sectPr stays)."""
+        body = self.doc.element.body
+        elements = [el for el in body if el.tag != qn('w:sectPr')]
+        self._write(elements)
+
+    def _write(self, elements):
+        if not elements:
+            return
+        if self.before_write:
+            self.before_write(elements)
+        # One compressed write per section instead of one per element
+        self._stream.write(b''.join(self._serialize(el) for el in elements))
+        parent = elements[0].getparent()
+        for el in elements:
+            parent.remove(el)
+
+    def _serialize(self, element) -> bytes:
+        # lxml repeats every in-scope namespace on each element it serializes alone;
+        # the ones w:document already declares are dropped from its start tag
+        xml = etree.tostring(element, encoding='UTF-8', xml_declaration=False)
+        end = xml.index(b'>')
+        start_tag = _XMLNS.sub(lambda m: b'' if (m.group(1) or b'', m.group(2)) in self._declared else m.group(0), xml[:end])
+        return start_tag + xml[end:]
+
+    def close(self):
+        """Writes the remaining body (including sectPr) and every other part of the package."""
+        try:
+            self._write(list(self.doc.element.body))
+            self._stream.write(self._tail)
+            self._stream.close()
+            self._stream = None
+
+            package = self.doc.part.package
+            parts = list(package.iter_parts())
+            for part in parts:
+                part.before_marshal()
+
+            self._zip.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+            self._zip.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+            for part in parts:
+                if part is not self.doc.part:
+                    self._zip.writestr(part.partname.membername, part.blob)
+                if len(part.rels):
+                    self._zip.writestr(part.partname.rels_uri.membername, part.rels.xml)
+            self._zip.close()
+        except Exception:
+            self.abort()
+            raise
+
+    def abort(self):
+        """Closes the archive without completing it (the output file is not a valid document)."""
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+        self._zip.close()
@@ -0,0 +1,184 @@
+import copy
+from typing import Any, Dict
+
+from comparator import (DiffResult, _compare_info, _compare_servers, _compare_tags,
+                        _component_comparators, _detect_renamed_components)
+
+# Rows of the Change Matrix (AnalyticDocxGenerator._add_dashboard): label -> diff section
+MATRIX_CATEGORIES = [
+    ("Endpoints", 'paths'),
+    ("Schemas", 'schemas'),
+    ("Parameters", 'parameters'),
+    ("Responses", 'responses'),
+    ("Headers", 'headers'),
+    ("Security Schemes", 'securitySchemes'),
+    ("Tags", 'tags'),
+    ("Servers", 'servers'),
+    ("Links", 'links'),
+    ("Callbacks", 'callbacks'),
+    ("Examples", 'examples'),
+]
+
+def is_substantial_modification(changes, renamed_map, c_type='schemas') -> bool:
+    """
+    Determines if a modification is 'substantial' or just a rename-induced ref change.
+    Returns True if substantial, False otherwise.
+    """
+    filtered_changes = copy.deepcopy(changes)
+
+    if c_type == 'schemas' and 'properties' in filtered_changes and 'modified' in filtered_changes['properties']:
+        props_mod = filtered_changes['properties']['modified']
+        props_to_remove = []
+
+        for prop, p_diff in props_mod.items():
+            # Check for $ref change
+            ref_change = None
+            if '$ref' in p_diff:
+                ref_change = p_diff['$ref']
+            elif 'items' in p_diff and '$ref' in p_diff['items']: # Array of refs
+                    ref_change = p_diff['items']['$ref']
+
+            if ref_change:
+                old_ref = str(ref_change.get('old') or '')
+                new_ref = str(ref_change.get('new') or '')
+                old_simple = old_ref.split('/')[-1]
+                new_simple = new_ref.split('/')[-1]
+
+                # Check if this is a known rename
+                if old_simple in renamed_map and renamed_map[old_simple] == new_simple:
+                    props_to_remove.append(prop)
+
+        for p in props_to_remove:
+            del props_mod[p]
+
+        if not props_mod:
+            del filtered_changes['properties']['modified']
+            # The comparator keeps empty 'new'/'removed' lists
+            if not any(filtered_changes['properties'].values()):
+                del filtered_changes['properties']
+
+    # Check if anything else remains (ignoring __rename_info__)
+    keys = [k for k in filtered_changes.keys() if k != '__rename_info__']
+    return len(keys) > 0
+
+def change_matrix(diff: DiffResult) -> Dict[str, Dict[str, int]]:
+    """
+    New/removed/modified/renamed counts per Change Matrix category, from a full diff.
+    Schemas whose only changes are refs to renamed schemas count as neither modified nor
+    renamed; renamed schemas with other changes count as modified.
+    """
+    matrix = {}
+    for label, section in MATRIX_CATEGORIES:
+        renamed = 0
+        if section == 'paths':
+            new, removed, modified = len(diff.new_paths), len(diff.removed_paths), len(diff.modified_paths)
+        elif section in ('tags', 'servers'):
+            changes = diff.tags_changes if section == 'tags' else diff.servers_changes
+            new, removed, modified = len(changes.get('new', [])), len(changes.get('removed', [])), len(changes.get('modified', {}))
+        else:
+            new = len(diff.new_components.get(section, []))
+            removed = len(diff.removed_components.get(section, []))
+            mod_items = diff.modified_components.get(section, {})
+            if section == 'schemas':
+                ren_items = diff.renamed_components.get('schemas', {})
+                # Partition: substantial changes are modified, pure (or ref-only) renames are renamed
+                modified = sum(1 for name, changes in mod_items.items() if is_substantial_modification(changes, ren_items))
+                renamed = sum(1 for old in ren_items
+                              if old not in mod_items or not is_substantial_modification(mod_items[old], ren_items))
+            else:
+                modified = len(mod_items)
+        matrix[label] = {'new': new, 'removed': removed, 'modified': modified, 'renamed': renamed}
+    return matrix
+
+def summarize_specs(old_spec: Dict[str, Any], new_spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    compare_specs(summary=True): the Change Matrix counts without building the nested diffs.
+
+    Added and removed entries come from key sets, modified ones from entries that are not
+    equal (==, which returns at once for the many subtrees old and new share or that match),
+    and renames from the comparator's rename detection (which only diffs the renamed pairs).
+    An entry whose content differs only in ways the comparator ignores (e.g. whitespace)
+    counts as modified here, so modified counts can exceed those of change_matrix().
+    """
+    # Skeleton diff: everything but the modified entries
+    result = DiffResult()
+    _compare_info(old_spec.get('info', {}), new_spec.get('info', {}), result)
+    _compare_tags(old_spec.get('tags', []), new_spec.get('tags', []), result)
+    _compare_servers(old_spec.get('servers', []), new_spec.get('servers', []), result)
+
+    old_paths = old_spec.get('paths', {})
+    new_paths = new_spec.get('paths', {})
+    result.new_paths = [p for p in new_paths if p not in old_paths]
+    result.removed_paths = [p for p in old_paths if p not in new_paths]
+    modified_paths = sum(1 for p, item in new_paths.items() if p in old_paths and old_paths[p] != item)
+
+    old_comps = old_spec.get('components', {})
+    new_comps = new_spec.get('components', {})
+    candidates = {}
+    for comp_type in _component_comparators():
+        old_items = old_comps.get(comp_type, {})
+        new_items = new_comps.get(comp_type, {})
+        result.new_components[comp_type] = [n for n in new_items if n not in old_items]
+        result.removed_components[comp_type] = [n for n in old_items if n not in new_items]
+        candidates[comp_type] = [n for n, item in new_items.items() if n in old_items and old_items[n] != item]
+
+    _detect_renamed_components(result, old_spec, new_spec)
+
+    matrix = change_matrix(result)
+    matrix['Endpoints']['modified'] = modified_paths
+    schema_renames = result.renamed_components.get('schemas', {})
+    for label, section in MATRIX_CATEGORIES:
+        if section not in candidates:
+            continue
+        if section == 'schemas' and schema_renames:
+            # Same partition as change_matrix: refs switched to a renamed schema are not a modification
+            old_items = old_comps.get('schemas', {})
+            new_items = new_comps.get('schemas', {})
+            modified = sum(1 for n in candidates['schemas']
+                           if _restore_renamed_refs(new_items[n], schema_renames) != old_items[n])
+        else:
+            modified = len(candidates[section])
+        matrix[label]['modified'] += modified
+
+    return summary_document(matrix, old_spec, new_spec, info_changed=bool(result.info_changes))
+
+def summary_document(matrix: Dict[str, Dict[str, int]], old_spec: Dict[str, Any], new_spec: Dict[str, Any],
+                     info_changed: bool) -> Dict[str, Any]:
+    """The JSON document --summary prints."""
+    totals = {'new': 0, 'removed': 0, 'modified': 0, 'renamed': 0}
+    for counts in matrix.values():
+        for k in totals:
+            totals[k] += counts[k]
+    return {
+        'old': {k: (old_spec.get('info') or {}).get(k) for k in ('title', 'version')},
+        'new': {k: (new_spec.get('info') or {}).get(k) for k in ('title', 'version')},
+        'info_changed': info_changed,
+        'categories': matrix,
+        'totals': totals,
+    }
+
+def _restore_renamed_refs(schema, renames: Dict[str, str]):
+    # Copy of the schema whose property refs (and array item refs) to renamed schemas use the old names
+    props = schema.get('properties') if isinstance(schema, dict) else None
+    if not isinstance(props, dict):
+        return schema
+    old_names = {new: old for old, new in renames.items()}
+
+    def restore(node):
+        ref = node.get('$ref') if isinstance(node, dict) else None
+        if isinstance(ref, str):
+            name = ref.split('/')[-1]
+            if name in old_names:
+                return {**node, '$ref': ref[:len(ref) - len(name)] + old_names[name]}
+        return node
+
+    restored = {}
+    for prop, prop_schema in props.items():
+        new_prop = restore(prop_schema)
+        if new_prop is prop_schema and isinstance(prop_schema, dict) and '$ref' not in prop_schema:
+            items = prop_schema.get('items')
+            new_items = restore(items)
+            if new_items is not items:
+                new_prop = {**prop_schema, 'items': new_items}
+        restored[prop] = new_prop
+    return {**schema, 'properties': restored}
@@ -9,19 +9,21 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 class SyntheticDocxGenerator(AnalyticDocxGenerator):
     def generate(self, output_path):
+        self._begin_output(output_path)
+
         # Always add title to body
         self.doc.add_heading('OpenAPI Comparison - Synthesis Report', 0)
         
         self._add_spec_metadata()
         self._add_dashboard() # Change Matrix
+        self._flush_section()
         self._add_general_info_synthetic()
+        self._flush_section()
         self._add_endpoints_synthetic()
+        self._flush_section()
         self._add_schemas_synthetic()
         
-        # Variable Substitution (Final Step)
-        self._process_template_variables()
-        
-        self.doc.save(output_path)
+        self._finish_output(output_path)
         print(f"Synthetic Report generated at {output_path}")
 
     def _add_general_info_synthetic(self):
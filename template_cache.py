@@ -0,0 +1,88 @@
+import copy
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from docx import Document
+
+
+class _CacheEntry:
+    __slots__ = ('mtime_ns', 'size', 'digest', 'document')
+
+    def __init__(self, mtime_ns, size, digest, document):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.document = document
+
+
+class TemplateCache:
+    """
+    Parses each DOCX template once, applies the generator's style setup once,
+    and hands every report its own deep copy of the prepared document.
+
+    Entries are keyed by (template path, prepare key). An entry is revalidated
+    on every lookup: if the file's mtime or size changed, its content hash is
+    recomputed and the template is reparsed only when the hash differs too.
+    """
+    def __init__(self):
+        self._entries: Dict[Tuple[Optional[str], Optional[str]], _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, template_path: Optional[str], prepare: Optional[Callable] = None, prepare_key: Optional[str] = None):
+        """
+        Returns a fresh Document for the template (None = python-docx default template).
+        prepare(doc) is applied once to the cached prototype; prepare_key identifies it,
+        so generators with different style setups never share a prototype.
+        """
+        path = os.path.abspath(template_path) if template_path else None
+        key = (path, prepare_key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if path is None:
+                if entry is None:
+                    entry = self._load(None, prepare, None, None, None)
+                    self._entries[key] = entry
+            else:
+                st = os.stat(path)
+                if entry is None or entry.mtime_ns != st.st_mtime_ns or entry.size != st.st_size:
+                    digest = _file_digest(path)
+                    if entry is not None and entry.digest == digest:
+                        # Touched but unchanged: keep the parsed prototype
+                        entry.mtime_ns = st.st_mtime_ns
+                        entry.size = st.st_size
+                    else:
+                        entry = self._load(path, prepare, st.st_mtime_ns, st.st_size, digest)
+                        self._entries[key] = entry
+            prototype = entry.document
+
+        # Deep copy clones the whole package (parts, rels, XML trees) without reparsing
+        return copy.deepcopy(prototype)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, path, prepare, mtime_ns, size, digest):
+        doc = Document(path) if path else Document()
+        if prepare:
+            prepare(doc)
+        return _CacheEntry(mtime_ns, size, digest, doc)
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Process-wide cache shared by all generators
+TEMPLATE_CACHE = TemplateCache()
+
+
+def load_template_document(template_path: Optional[str], prepare: Optional[Callable] = None, prepare_key: Optional[str] = None):
+    return TEMPLATE_CACHE.get(template_path, prepare, prepare_key)
@@ -0,0 +1,142 @@
+import datetime
+import getpass
+import os
+import re
+import sys
+from typing import Any, Dict, List, Optional
+
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+from spec_source import spec_display_name
+
+
+def build_template_context(variables: Dict[str, Any], old_path: Optional[str], new_path: Optional[str]) -> Dict[str, Any]:
+    """
+    Builds the substitution context for {{ variable }} placeholders.
+    Prioritizes:
+    1. Dynamic Variables (date, time, filenames)
+    2. User Static Variables (from Preferences)
+    """
+    context = dict(variables or {})
+
+    # Dynamic Defaults
+    now = datetime.datetime.now()
+    context['date'] = now.strftime('%Y-%m-%d')
+    context['time'] = now.strftime('%H:%M')
+    context['datetime'] = now.strftime('%Y-%m-%d %H:%M:%S')
+    context['original_spec'] = spec_display_name(old_path)
+    context['new_spec'] = spec_display_name(new_path)
+
+    # Enriched Variables
+    try:
+        context['user'] = getpass.getuser()
+    except Exception:
+        context['user'] = "Unknown"
+
+    context['platform'] = sys.platform
+    context['tool_version'] = "1.0.0"
+
+    def get_size(path):
+        if path and os.path.exists(path):
+            size_bytes = os.path.getsize(path)
+            if size_bytes < 1024: return f"{size_bytes} B"
+            elif size_bytes < 1024*1024: return f"{size_bytes/1024:.1f} KB"
+            else: return f"{size_bytes/(1024*1024):.1f} MB"
+        return "N/A"
+
+    context['file_size_old'] = get_size(old_path)
+    context['file_size_new'] = get_size(new_path)
+    return context
+
+
+def compile_placeholder_pattern(context: Dict[str, Any]):
+    """
+    Compiles a single regex matching '{{ key }}' and '{{key}}' for every key in the context.
+    Longer keys come first so that a key never shadows another key it is a prefix of.
+    """
+    if not context:
+        return None
+    keys = sorted((str(k) for k in context.keys()), key=len, reverse=True)
+    return re.compile(r'\{\{ ?(' + '|'.join(re.escape(k) for k in keys) + r') ?\}\}')
+
+
+def record_template_front_matter(doc) -> List[Any]:
+    """
+    Returns the body elements that the template itself owns (cover page, front-matter),
+    i.e. everything already in the body before generation starts.
+    Must be called right after the template is opened.
+    """
+    body = doc.element.body
+    return [el for el in body.iterchildren() if el.tag != qn('w:sectPr')]
+
+
+def substitute_template_variables(doc, context: Dict[str, Any], front_matter: List[Any], scan_full_body: bool = False):
+    """
+    Replaces {{ variable }} placeholders in a single pass per paragraph.
+
+    Only the template-owned parts are scanned: headers and footers of every section
+    and the recorded front-matter. Generated content can be thousands of pages long and
+    never contains placeholders, so it is skipped unless scan_full_body is set.
+    """
+    pattern = compile_placeholder_pattern(context)
+    if pattern is None:
+        return
+
+    values = {str(k): str(v) for k, v in context.items()}
+
+    def replace(match):
+        return values[match.group(1)]
+
+    seen = set()
+    for section in doc.sections:
+        for story in (section.header, section.footer,
+                      section.first_page_header, section.first_page_footer,
+                      section.even_page_header, section.even_page_footer):
+            # A linked header has no definition of its own (nothing to scan)
+            if story.is_linked_to_previous:
+                continue
+            element = story._element
+            if id(element) in seen:
+                continue
+            seen.add(id(element))
+            _substitute_in_element(element, story, pattern, replace)
+
+    if scan_full_body:
+        _substitute_in_element(doc.element.body, doc._body, pattern, replace)
+    else:
+        for element in front_matter:
+            _substitute_in_element(element, doc._body, pattern, replace)
+
+
+def substitute_in_elements(doc, context: Dict[str, Any], elements: List[Any]):
+    """
+    Replaces {{ variable }} placeholders in the given body elements only.
+    Used by the streaming writer to cover generated content section by section.
+    """
+    pattern = compile_placeholder_pattern(context)
+    if pattern is None:
+        return
+
+    values = {str(k): str(v) for k, v in context.items()}
+
+    def replace(match):
+        return values[match.group(1)]
+
+    for element in elements:
+        _substitute_in_element(element, doc._body, pattern, replace)
+
+
+def _substitute_in_element(element, parent, pattern, replace):
+    # iter() also walks nested tables and content controls
+    for p in element.iter(qn('w:p')):
+        paragraph = Paragraph(p, parent)
+        if '{{' not in paragraph.text:
+            continue
+        # Replacement is per run (placeholders split across runs are not supported)
+        for run in paragraph.runs:
+            text = run.text
+            if '{{' in text:
+                new_text = pattern.sub(replace, text)
+                if new_text != text:
+                    run.text = new_text